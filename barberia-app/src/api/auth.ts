@@ -177,7 +177,9 @@ export interface NegocioPublico {
 
 export interface ListarNegociosSuccess {
   success: true;
-  count: number;
+  count: number | null; // Total solo en la primera página
+  next: string | null;
+  previous: string | null;
   negocios: NegocioPublico[];
 }
 
@@ -188,6 +190,20 @@ export interface ListarNegociosError {
 
 export type ListarNegociosResult = ListarNegociosSuccess | ListarNegociosError;
 
+export interface ListarNegociosParams {
+  q?: string; // Búsqueda por nombre o dirección (en el servidor)
+  next?: string | null; // URL "next" de la página anterior
+}
+
+// El cursor viaja dentro de la URL "next" que arma el servidor
+function paramsListarNegocios({ q, next }: ListarNegociosParams) {
+  const cursor = next?.match(/[?&]cursor=([^&]+)/)?.[1];
+  return {
+    ...(q ? { q } : {}),
+    ...(cursor ? { cursor: decodeURIComponent(cursor) } : {}),
+  };
+}
+
 
 export async function login(username: string, password: string): Promise<LoginResult> {
   try {
@@ -389,13 +405,15 @@ export async function unirseNegocio(
 // =============================================================================
 
 export async function negociosDisponibles(
-  accessToken: string
+  accessToken: string,
+  params: ListarNegociosParams = {}
 ): Promise<ListarNegociosResult> {
   try {
     const response = await axios.get(`${API_URL}/auth/negocios-disponibles/`, {
       headers: {
         Authorization: `Bearer ${accessToken}`,
       },
+      params: paramsListarNegocios(params),
     });
     return response.data;
   } catch (error: any) {
@@ -416,9 +434,13 @@ export async function negociosDisponibles(
 // FUNCIÓN PARA LISTAR TODOS LOS NEGOCIOS (público, para registro)
 // =============================================================================
 
-export async function listarNegocios(): Promise<ListarNegociosResult> {
+export async function listarNegocios(
+  params: ListarNegociosParams = {}
+): Promise<ListarNegociosResult> {
   try {
-    const response = await axios.get(`${API_URL}/negocios/`);
+    const response = await axios.get(`${API_URL}/negocios/`, {
+      params: paramsListarNegocios(params),
+    });
     return response.data;
   } catch (error: any) {
     if (error.response && error.response.data) {
@@ -65,3 +65,37 @@ export async function cancelarTurno(tokens: Tokens, turnoId: number, negocioId:
     throw error; // Re-throw the error to be caught by the caller
   }
 }
+
+// =============================================================================
+// DELTA-SYNC: solo cambios desde el último cursor guardado
+// =============================================================================
+
+export interface TurnoEliminado {
+  id: number;
+  status: 'cancelado';
+  updated_at: string;
+}
+
+export interface SyncTurnosResponse {
+  success: boolean;
+  vista: 'cliente' | 'profesional';
+  turnos: any[];               // upsert en el cache local
+  eliminados: TurnoEliminado[]; // borrar del cache local
+  cursor: string | null;       // guardar y enviar en la próxima llamada
+  has_more: boolean;           // si es true, volver a llamar con el nuevo cursor
+}
+
+export async function sincronizarTurnos(
+  tokens: Tokens,
+  negocioId: number,
+  cursor: string | null,
+  vista: 'cliente' | 'profesional' = 'cliente'
+): Promise<SyncTurnosResponse> {
+  const response = await axios.get<SyncTurnosResponse>(`${API_URL}/reservas/sync/`, {
+    params: { negocio_id: negocioId, vista, ...(cursor ? { cursor } : {}) },
+    headers: {
+      Authorization: `Bearer ${tokens.access}`,
+    },
+  });
+  return response.data;
+}
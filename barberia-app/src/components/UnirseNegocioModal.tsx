@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useRef } from 'react';
+import React, { useState, useEffect, useRef, useCallback } from 'react';
 import {
   View,
   Text,
@@ -17,7 +17,8 @@ import {
 } from 'react-native';
 import { Ionicons } from '@expo/vector-icons';
 import { useTheme } from '../context/ThemeContext';
-import { negociosDisponibles, unirseNegocio, NegocioPublico } from '../api/auth';
+import { negociosDisponibles, unirseNegocio, NegocioPublico, ListarNegociosParams } from '../api/auth';
+import { useDirectorioNegocios } from '../hooks/useDirectorioNegocios';
 
 const SCREEN_HEIGHT = Dimensions.get('window').height;
 
@@ -37,13 +38,26 @@ const UnirseNegocioModal: React.FC<UnirseNegocioModalProps> = ({
   const { colors } = useTheme();
   
   // Estados
-  const [negocios, setNegocios] = useState<NegocioPublico[]>([]);
-  const [busqueda, setBusqueda] = useState('');
   const [negocioSeleccionado, setNegocioSeleccionado] = useState<NegocioPublico | null>(null);
   const [loading, setLoading] = useState(false);
-  const [loadingNegocios, setLoadingNegocios] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
+  // Directorio paginado; se carga (y se vuelve a cargar) al abrir el modal
+  const listarDisponibles = useCallback(
+    (params: ListarNegociosParams) => negociosDisponibles(accessToken, params),
+    [accessToken]
+  );
+  const {
+    busqueda,
+    setBusqueda,
+    negocios,
+    hayMas,
+    cargando: loadingNegocios,
+    cargandoMas,
+    cargarMas,
+    error: errorNegocios,
+  } = useDirectorioNegocios(listarDisponibles, visible);
+
   // Animación para el gesto de deslizar
   const pan = useRef(new Animated.ValueXY()).current;
 
@@ -78,39 +92,16 @@ const UnirseNegocioModal: React.FC<UnirseNegocioModalProps> = ({
     });
   };
 
-  // Cargar negocios cuando se abre el modal
+  // Reiniciar el modal cuando se abre
   useEffect(() => {
     if (visible) {
       pan.setValue({ x: 0, y: 0 });
       setNegocioSeleccionado(null);
       setBusqueda('');
       setError(null);
-      cargarNegocios();
     }
   }, [visible]);
 
-  const cargarNegocios = async () => {
-    setLoadingNegocios(true);
-    setError(null);
-    try {
-      const resultado = await negociosDisponibles(accessToken);
-      if (resultado.success) {
-        setNegocios(resultado.negocios);
-      } else {
-        setError(resultado.message);
-      }
-    } catch (err) {
-      setError('Error al cargar los negocios disponibles');
-    } finally {
-      setLoadingNegocios(false);
-    }
-  };
-
-  // Filtrar negocios por búsqueda
-  const negociosFiltrados = negocios.filter((negocio) =>
-    negocio.nombre.toLowerCase().includes(busqueda.toLowerCase())
-  );
-
   // Unirse al negocio seleccionado
   const handleUnirse = async () => {
     if (!negocioSeleccionado) return;
@@ -203,7 +194,7 @@ const UnirseNegocioModal: React.FC<UnirseNegocioModalProps> = ({
                 Cargando negocios disponibles...
               </Text>
             </View>
-          ) : negocios.length === 0 ? (
+          ) : negocios.length === 0 && !busqueda.trim() && !errorNegocios ? (
             <View style={styles.emptyContainer}>
               <Ionicons name="checkmark-circle-outline" size={64} color={colors.success} />
               <Text style={[styles.emptyTitle, { color: colors.text }]}>
@@ -220,7 +211,7 @@ const UnirseNegocioModal: React.FC<UnirseNegocioModalProps> = ({
               showsVerticalScrollIndicator={false}
               keyboardShouldPersistTaps="handled"
             >
-              {negociosFiltrados.length === 0 ? (
+              {negocios.length === 0 ? (
                 <View style={styles.noResultsContainer}>
                   <Ionicons name="search-outline" size={48} color={colors.textSecondary} />
                   <Text style={[styles.noResultsText, { color: colors.textSecondary }]}>
@@ -228,7 +219,7 @@ const UnirseNegocioModal: React.FC<UnirseNegocioModalProps> = ({
                   </Text>
                 </View>
               ) : (
-                negociosFiltrados.map((negocio) => (
+                negocios.map((negocio) => (
                   <TouchableOpacity
                     key={negocio.id}
                     style={[
@@ -273,14 +264,31 @@ const UnirseNegocioModal: React.FC<UnirseNegocioModalProps> = ({
                   </TouchableOpacity>
                 ))
               )}
+
+              {/* Página siguiente del directorio */}
+              {hayMas && (
+                <TouchableOpacity
+                  style={[styles.cargarMasButton, { borderColor: colors.dark3 }]}
+                  onPress={cargarMas}
+                  disabled={cargandoMas}
+                >
+                  {cargandoMas ? (
+                    <ActivityIndicator color={colors.primary} />
+                  ) : (
+                    <Text style={[styles.cargarMasText, { color: colors.primary }]}>
+                      Cargar más negocios
+                    </Text>
+                  )}
+                </TouchableOpacity>
+              )}
             </ScrollView>
           )}
 
           {/* Error */}
-          {error && (
+          {(error || errorNegocios) && (
             <View style={[styles.errorContainer, { backgroundColor: `${colors.error}20` }]}>
               <Ionicons name="alert-circle" size={20} color={colors.error} />
-              <Text style={[styles.errorText, { color: colors.error }]}>{error}</Text>
+              <Text style={[styles.errorText, { color: colors.error }]}>{error || errorNegocios}</Text>
             </View>
           )}
 
@@ -417,6 +425,18 @@ const styles = StyleSheet.create({
     fontSize: 14,
     textAlign: 'center',
   },
+  cargarMasButton: {
+    alignItems: 'center',
+    justifyContent: 'center',
+    paddingVertical: 14,
+    borderRadius: 12,
+    borderWidth: 1,
+    marginBottom: 12,
+  },
+  cargarMasText: {
+    fontSize: 15,
+    fontWeight: '600',
+  },
   negocioItem: {
     flexDirection: 'row',
     alignItems: 'center',
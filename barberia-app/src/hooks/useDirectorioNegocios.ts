@@ -0,0 +1,89 @@
+import { useCallback, useEffect, useRef, useState } from 'react';
+import { ListarNegociosParams, ListarNegociosResult, NegocioPublico } from '../api/auth';
+
+// Espera después de la última tecla antes de buscar en el servidor
+const DEMORA_BUSQUEDA_MS = 300;
+
+/**
+ * Directorio de negocios paginado por cursor (20 por página).
+ * La búsqueda se hace en el servidor (?q=) y las páginas siguientes se piden
+ * con la URL "next" de la respuesta anterior.
+ */
+export const useDirectorioNegocios = (
+  listar: (params: ListarNegociosParams) => Promise<ListarNegociosResult>,
+  activo: boolean = true
+) => {
+  const [busqueda, setBusqueda] = useState('');
+  const [negocios, setNegocios] = useState<NegocioPublico[]>([]);
+  const [next, setNext] = useState<string | null>(null);
+  const [cargando, setCargando] = useState(false);
+  const [cargandoMas, setCargandoMas] = useState(false);
+  const [error, setError] = useState<string | null>(null);
+
+  // Cada búsqueda nueva invalida las respuestas pendientes de la anterior
+  const consulta = useRef(0);
+
+  const buscar = useCallback(
+    async (q: string) => {
+      const id = ++consulta.current;
+      setCargando(true);
+      setCargandoMas(false);
+      setError(null);
+      try {
+        const resultado = await listar({ q });
+        if (id !== consulta.current) return;
+        if (resultado.success) {
+          setNegocios(resultado.negocios);
+          setNext(resultado.next);
+        } else {
+          setNegocios([]);
+          setNext(null);
+          setError(resultado.message);
+        }
+      } catch (err) {
+        if (id === consulta.current) setError('Error de conexión al cargar negocios');
+      } finally {
+        if (id === consulta.current) setCargando(false);
+      }
+    },
+    [listar]
+  );
+
+  useEffect(() => {
+    if (!activo) return;
+    const q = busqueda.trim();
+    const timer = setTimeout(() => buscar(q), q ? DEMORA_BUSQUEDA_MS : 0);
+    return () => clearTimeout(timer);
+  }, [activo, busqueda, buscar]);
+
+  const cargarMas = useCallback(async () => {
+    if (!next || cargando || cargandoMas) return;
+    const id = consulta.current;
+    setCargandoMas(true);
+    try {
+      const resultado = await listar({ q: busqueda.trim(), next });
+      if (id !== consulta.current) return;
+      if (resultado.success) {
+        setNegocios((anteriores) => [...anteriores, ...resultado.negocios]);
+        setNext(resultado.next);
+      } else {
+        setError(resultado.message);
+      }
+    } catch (err) {
+      if (id === consulta.current) setError('Error de conexión al cargar negocios');
+    } finally {
+      if (id === consulta.current) setCargandoMas(false);
+    }
+  }, [listar, busqueda, next, cargando, cargandoMas]);
+
+  return {
+    busqueda,
+    setBusqueda,
+    negocios,
+    hayMas: next !== null,
+    cargando,
+    cargandoMas,
+    cargarMas,
+    error,
+  };
+};
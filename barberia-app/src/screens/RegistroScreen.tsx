@@ -20,6 +20,7 @@ import { useNotification } from '../context/NotificationContext';
 import { useNavigation, NavigationProp } from '@react-navigation/native';
 import { RootStackParamList } from '../navigation/AppNavigator';
 import AsyncStorage from '@react-native-async-storage/async-storage';
+import { useDirectorioNegocios } from '../hooks/useDirectorioNegocios';
 import {
   registro,
   listarNegocios,
@@ -62,41 +63,28 @@ const RegistroScreen: React.FC = () => {
     passwordConfirm: false,
   });
 
-  // Estados de negocios
-  const [negocios, setNegocios] = useState<NegocioPublico[]>([]);
+  // Estados de negocios (búsqueda y páginas en el servidor)
   const [negocioSeleccionado, setNegocioSeleccionado] = useState<NegocioPublico | null>(null);
-  const [busquedaNegocio, setBusquedaNegocio] = useState('');
-  const [loadingNegocios, setLoadingNegocios] = useState(false);
+  const {
+    busqueda: busquedaNegocio,
+    setBusqueda: setBusquedaNegocio,
+    negocios,
+    hayMas: hayMasNegocios,
+    cargando: loadingNegocios,
+    cargandoMas: loadingMasNegocios,
+    cargarMas: cargarMasNegocios,
+    error: errorNegocios,
+  } = useDirectorioNegocios(listarNegocios);
 
   // Estados generales
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
-  // Cargar negocios al inicio
   useEffect(() => {
-    cargarNegocios();
-  }, []);
-
-  const cargarNegocios = async () => {
-    setLoadingNegocios(true);
-    try {
-      const resultado = await listarNegocios();
-      if (resultado.success) {
-        setNegocios(resultado.negocios);
-      } else {
-        showBanner('error', 'Error', 'No se pudieron cargar los negocios disponibles');
-      }
-    } catch (err) {
-      showBanner('error', 'Error', 'Error de conexión al cargar negocios');
-    } finally {
-      setLoadingNegocios(false);
+    if (errorNegocios) {
+      showBanner('error', 'Error', 'No se pudieron cargar los negocios disponibles');
     }
-  };
-
-  // Filtrar negocios por búsqueda
-  const negociosFiltrados = negocios.filter((negocio) =>
-    negocio.nombre.toLowerCase().includes(busquedaNegocio.toLowerCase())
-  );
+  }, [errorNegocios]);
 
   // Validaciones
   const validarEmail = (email: string) => {
@@ -521,7 +509,7 @@ const RegistroScreen: React.FC = () => {
           contentContainerStyle={styles.negociosContent}
           showsVerticalScrollIndicator={false}
         >
-          {negociosFiltrados.length === 0 ? (
+          {negocios.length === 0 ? (
             <View style={styles.emptyContainer}>
               <Ionicons name="business-outline" size={48} color={colors.textSecondary} />
               <Text style={[styles.emptyText, { color: colors.textSecondary }]}>
@@ -529,7 +517,7 @@ const RegistroScreen: React.FC = () => {
               </Text>
             </View>
           ) : (
-            negociosFiltrados.map((negocio) => (
+            negocios.map((negocio) => (
               <TouchableOpacity
                 key={negocio.id}
                 style={[
@@ -574,6 +562,23 @@ const RegistroScreen: React.FC = () => {
               </TouchableOpacity>
             ))
           )}
+
+          {/* Página siguiente del directorio */}
+          {hayMasNegocios && (
+            <TouchableOpacity
+              style={[styles.cargarMasButton, { borderColor: colors.dark3 }]}
+              onPress={cargarMasNegocios}
+              disabled={loadingMasNegocios}
+            >
+              {loadingMasNegocios ? (
+                <ActivityIndicator color={colors.primary} />
+              ) : (
+                <Text style={[styles.cargarMasText, { color: colors.primary }]}>
+                  Cargar más negocios
+                </Text>
+              )}
+            </TouchableOpacity>
+          )}
         </ScrollView>
       )}
 
@@ -886,6 +891,18 @@ const styles = StyleSheet.create({
     marginTop: 12,
     fontSize: 14,
   },
+  cargarMasButton: {
+    alignItems: 'center',
+    justifyContent: 'center',
+    paddingVertical: 14,
+    borderRadius: 12,
+    borderWidth: 1,
+    marginBottom: 12,
+  },
+  cargarMasText: {
+    fontSize: 15,
+    fontWeight: '600',
+  },
   negocioItem: {
     flexDirection: 'row',
     alignItems: 'center',
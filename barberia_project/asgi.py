@@ -13,4 +13,10 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'barberia_project.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Después de get_asgi_application(): core.services importa modelos
+from core.services.eventos_agenda import DetectorDesconexionASGI  # noqa: E402
+
+# Avisa a los streams SSE cuando el cliente se desconecta (Django 4.2 no lo hace)
+application = DetectorDesconexionASGI(django_application)
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 from decouple import config
 
@@ -57,6 +58,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.SqlLentoMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware', 
@@ -65,18 +67,28 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'core.middleware.NegocioContextMiddleware',
+    'core.middleware.PerfiladoMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'barberia_project.urls'
 
+_TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if not DEBUG:
+    # Templates compilados una sola vez por proceso (emails, admin); con DEBUG
+    # se releen del disco en cada render
+    _TEMPLATE_LOADERS = [('django.template.loaders.cached.Loader', _TEMPLATE_LOADERS)]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / "core" / "templates"],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': _TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
@@ -258,10 +270,49 @@ EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@ordema.app')
+# Mensajes enviados por cada sesión SMTP (worker de emails / envíos masivos)
+EMAIL_BATCH_SIZE = config('EMAIL_BATCH_SIZE', default=50, cast=int)
 
 # =============================================================================
 # CONFIGURACIÓN DE BOT DE WHATSAPP
 # =============================================================================
 
 # Token de autenticación para el bot de WhatsApp
-BOT_TOKEN = config('BOT_TOKEN', default='change-this-token-in-production')
\ No newline at end of file
+BOT_TOKEN = config('BOT_TOKEN', default='change-this-token-in-production')
+
+# =============================================================================
+# PERFILADO DE REQUESTS (?_profile=1, ver core/services/perfilado.py)
+# =============================================================================
+
+# Directorio del buffer circular de capturas (un JSON por captura)
+PERFILADO_DIR = config('PERFILADO_DIR', default=os.path.join(tempfile.gettempdir(), 'ordema_perfilado'))
+PERFILADO_MAX_CAPTURAS = config('PERFILADO_MAX_CAPTURAS', default=50, cast=int)
+# Vigencia (segundos) de los tokens del header X-Perfilado
+PERFILADO_TOKEN_MAX_AGE = config('PERFILADO_TOKEN_MAX_AGE', default=60 * 60 * 24, cast=int)
+
+# =============================================================================
+# LOG DE QUERIES LENTAS (ver core/services/sql_lento.py)
+# =============================================================================
+
+# Queries de esta duración o más se agregan por vista / negocio / SQL (0 = desactivado)
+SQL_LENTO_UMBRAL_MS = config('SQL_LENTO_UMBRAL_MS', default=100, cast=float)
+# Cada cuántos segundos se vuelcan los agregados al log
+SQL_LENTO_INTERVALO_VOLCADO = config('SQL_LENTO_INTERVALO_VOLCADO', default=300, cast=int)
+
+# =============================================================================
+# EVENTOS DE AGENDA EN TIEMPO REAL (SSE, ver core/services/eventos_agenda.py)
+# =============================================================================
+
+# BrokerEnMemoria sirve con un solo proceso ASGI; con varios workers usar BrokerRedis
+AGENDA_EVENTOS_BROKER = config('AGENDA_EVENTOS_BROKER', default='core.services.eventos_agenda.BrokerEnMemoria')
+REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
+# Cada conexión SSE se cierra a los N segundos (el cliente reconecta solo); los
+# clientes que cortan antes los detecta DetectorDesconexionASGI (asgi.py)
+AGENDA_EVENTOS_DURACION_MAXIMA = config('AGENDA_EVENTOS_DURACION_MAXIMA', default=30 * 60, cast=int)
+
+# =============================================================================
+# VISTAS PÚBLICAS ASYNC (ver "APIs PÚBLICAS ASYNC" en core/views.py)
+# =============================================================================
+
+# Servicios, profesionales y disponibilidad con vistas async (solo con servidor ASGI)
+VISTAS_PUBLICAS_ASYNC = config('VISTAS_PUBLICAS_ASYNC', default=False, cast=bool)
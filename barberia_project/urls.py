@@ -22,6 +22,8 @@ from django.conf.urls.static import static
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from core.admin import capturas_perfilado_view, captura_perfilado_view
+from core.views import feed_ical_profesional
 
 schema_view = get_schema_view(
    openapi.Info(
@@ -35,12 +37,19 @@ schema_view = get_schema_view(
 )
 
 urlpatterns = [
+    # Capturas de ?_profile=1 (antes de admin/ para que no las tome el admin)
+    path('admin/perfilado/', admin.site.admin_view(capturas_perfilado_view), name='perfilado_capturas'),
+    path('admin/perfilado/<str:id_captura>/', admin.site.admin_view(captura_perfilado_view), name='perfilado_captura'),
+
     # Panel de Administración Django
     path('admin/', admin.site.urls),
     
     # APIs v1 - Para App Móvil y Panel Admin
     path('api/v1/', include('core.urls')),
     
+    # Feed iCalendar de suscripción del profesional (Google / Apple Calendar)
+    path('ical/<str:token>.ics', feed_ical_profesional, name='ical_profesional'),
+    
     # Navegador de APIs (Django REST Framework)
     path('api-auth/', include('rest_framework.urls')),
     # Swagger/OpenAPI
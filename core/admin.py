@@ -1,10 +1,23 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.contrib.auth.forms import UserChangeForm
+from django.contrib.admin.widgets import AutocompleteSelect
 from django import forms
+from django.contrib import messages
+from django.contrib.admin import helpers
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.urls import path
 from django.utils.html import format_html
-from .models import Usuario, Membership, Negocio, Servicio, Profesional, HorarioDisponibilidad, BloqueoHorario, Turno
+from .models import Usuario, Membership, Negocio, Servicio, Profesional, HorarioDisponibilidad, BloqueoHorario, Turno, EmailOutbox
 import copy
+from core.pagination import PaginadorConteoEstimado
+from core.services.importacion import COLUMNAS_IMPORTACION, importar_csv
 from core.services.memberships import sync_profesional_profile
+from core.services.perfilado import leer_captura, listar_capturas
+from core.services.turnos import cancelar_turnos, completar_turnos, reasignar_turnos
+from core.services.usuarios import telefono_registrado
 
 # =====================================================
 # WIDGET PERSONALIZADO PARA DATETIME CON BOTÓN "AHORA"
@@ -65,6 +78,88 @@ def limit_queryset_by_user_negocios(qs, user):
         return qs  # Superusuario ve todo
     return qs.filter(negocio_id__in=negocio_ids)
 
+
+def profesionales_con_usuario(request):
+    """
+    Profesionales visibles para el usuario, con su `user` ya cargado.
+
+    `Profesional.__str__` usa el nombre del usuario: sin el join, cada opción
+    de un dropdown o filtro dispara una query.
+    """
+    qs = Profesional.objects.select_related('user')
+    if not request.user.is_superuser:
+        qs = qs.filter(negocio=request.negocio)
+    return qs
+
+
+class ProfesionalListFilter(admin.RelatedFieldListFilter):
+    """Filtro por profesional que arma las opciones en una sola query."""
+
+    def field_choices(self, field, request, model_admin):
+        qs = profesionales_con_usuario(request)
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        if ordering:
+            qs = qs.order_by(*ordering)
+        return [(profesional.pk, str(profesional)) for profesional in qs]
+
+# === Importación CSV (alta masiva al dar de alta un negocio) ===
+class ImportarCSVForm(forms.Form):
+    negocio = forms.ModelChoiceField(queryset=Negocio.objects.all())
+    archivo = forms.FileField(label='Archivo CSV')
+    dry_run = forms.BooleanField(required=False, label='Solo validar (no guardar nada)')
+
+    def __init__(self, *args, request=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # El staff importa siempre en su negocio activo
+        if not request.user.is_superuser:
+            del self.fields['negocio']
+
+
+class ImportarCSVMixin:
+    """
+    Agrega el botón "Importar CSV" a la lista del admin.
+    La validación y el bulk_create viven en core/services/importacion.py.
+    """
+    tipo_importacion = None
+    change_list_template = 'admin/core/change_list_importar_csv.html'
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path('importar-csv/', self.admin_site.admin_view(self.importar_csv_view), name='%s_%s_importar_csv' % info),
+        ] + super().get_urls()
+
+    def importar_csv_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        resultado = None
+        form = ImportarCSVForm(request.POST or None, request.FILES or None, request=request)
+        if request.method == 'POST' and form.is_valid():
+            negocio = form.cleaned_data.get('negocio') or getattr(request, 'negocio', None)
+            if negocio is None:
+                form.add_error(None, 'No hay un negocio activo')
+            else:
+                try:
+                    contenido = form.cleaned_data['archivo'].read().decode('utf-8-sig')
+                    resultado = importar_csv(
+                        self.tipo_importacion, negocio, contenido, dry_run=form.cleaned_data['dry_run']
+                    )
+                except UnicodeDecodeError:
+                    form.add_error('archivo', 'El archivo debe estar codificado en UTF-8')
+                except ValueError as e:
+                    form.add_error('archivo', str(e))
+
+        return TemplateResponse(request, 'admin/core/importar_csv.html', {
+            **self.admin_site.each_context(request),
+            'title': f'Importar {self.tipo_importacion} desde CSV',
+            'opts': self.model._meta,
+            'form': form,
+            'resultado': resultado,
+            'columnas': COLUMNAS_IMPORTACION[self.tipo_importacion],
+        })
+
+
 # --- Membership --- 08/10/2025 Odreman.
 @admin.register(Membership)
 class MembershipAdmin(admin.ModelAdmin):
@@ -72,6 +167,7 @@ class MembershipAdmin(admin.ModelAdmin):
     list_filter = ('rol', 'is_active', 'negocio')
     search_fields = ('user__username', 'user__email', 'negocio__nombre')
     readonly_fields = ('created_at', 'updated_at')
+    list_select_related = ('user', 'negocio')
     
     fieldsets = (
         ('Membresía', {
@@ -154,13 +250,46 @@ class MembershipAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         """Filtra membresías por negocios del usuario"""
-        qs = super().get_queryset(request)
+        qs = super().get_queryset(request).select_related('user', 'negocio')
         return limit_queryset_by_user_negocios(qs, request.user)
 
 # --- Usuario ---
-class UsuarioAdmin(UserAdmin):
+class UsuarioChangeForm(UserChangeForm):
+    def clean_phone_number(self):
+        telefono = self.cleaned_data.get('phone_number')
+        # Sin cambios no se valida: los duplicados previos a phone_e164 pueden editar el resto
+        if 'phone_number' not in self.changed_data:
+            return telefono
+        if telefono_registrado(telefono, excluir_usuario_id=self.instance.pk):
+            raise forms.ValidationError('El número de teléfono ya está registrado')
+        return telefono
+
+
+class UsuarioAdmin(ImportarCSVMixin, UserAdmin):
+    form = UsuarioChangeForm
+    tipo_importacion = 'clientes'
     list_display = ('username', 'email', 'first_name', 'last_name', 'phone_number', 'is_staff', 'profile_picture_preview')  # Agregar preview
     search_fields = ('username', 'email', 'first_name', 'last_name', 'phone_number')
+    paginator = PaginadorConteoEstimado
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        En los autocompletes (Turno.cliente, Profesional.user) solo ofrece
+        usuarios con membership en el negocio activo, igual que los dropdowns
+        que reemplazan. El superusuario sin negocio activo ve todos.
+        """
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        negocio = getattr(request, 'negocio', None)
+        origen = (request.GET.get('model_name'), request.GET.get('field_name'))
+        if negocio is None or origen not in (('turno', 'cliente'), ('profesional', 'user')):
+            return queryset, may_have_duplicates
+
+        memberships = Membership.objects.filter(negocio=negocio, is_active=True)
+        if origen == ('turno', 'cliente'):
+            memberships = memberships.filter(rol=Membership.Roles.CLIENTE)
+        # Subquery en lugar de join: no duplica filas y no necesita distinct()
+        return queryset.filter(id__in=memberships.values('user_id')), may_have_duplicates
 
     def profile_picture_preview(self, obj):
         if obj.profile_picture_url:
@@ -252,6 +381,8 @@ class NegocioAdmin(admin.ModelAdmin):
     list_filter = ('fecha_creacion',)
     search_fields = ('nombre', 'propietario__username')
     readonly_fields = ('fecha_creacion',)
+    autocomplete_fields = ('propietario',)
+    list_select_related = ('propietario',)
     
     fieldsets = (
         ('Información General', {
@@ -288,13 +419,15 @@ class NegocioAdmin(admin.ModelAdmin):
 admin.site.register(Negocio, NegocioAdmin)
 
 # --- Servicio ---
-class ServicioAdmin(admin.ModelAdmin):
+class ServicioAdmin(ImportarCSVMixin, admin.ModelAdmin):
+    tipo_importacion = 'servicios'
     list_display = ('id', 'name', 'description_short', 'duration_minutes', 'price', 'is_active', 'icon_name', 'negocio_nombre')
     list_filter = ('is_active', 'negocio')
     search_fields = ('name', 'description')
     list_per_page = 25
     ordering = ('name',)
     readonly_fields = ('created_at', 'updated_at')
+    list_select_related = ('negocio',)
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
@@ -330,8 +463,12 @@ admin.site.register(Servicio, ServicioAdmin)
 class ProfesionalAdmin(admin.ModelAdmin):
     list_display = ('user', 'negocio', 'bio', 'is_available', 'profile_picture_preview', 'created_at')  # Agregar preview
     list_filter = ('is_available', 'negocio', 'created_at')
-    search_fields = ('user__username', 'user__email', 'negocio__nombre')
+    search_fields = ('user__username', 'user__first_name', 'user__last_name', 'user__email', 'negocio__nombre')
     readonly_fields = ('created_at', 'updated_at', 'profile_picture_display')  # Agregar campo readonly
+    autocomplete_fields = ('user',)
+    list_select_related = ('user', 'negocio')
+    # Orden estable para paginar los resultados del autocomplete de Turno.profesional
+    ordering = ('user__first_name', 'user__last_name', 'id')
     
     fieldsets = (
         ('Información Básica', {
@@ -374,7 +511,8 @@ class ProfesionalAdmin(admin.ModelAdmin):
     profile_picture_display.short_description = 'Foto de Perfil Actual'
 
     def get_queryset(self, request):
-        qs = super().get_queryset(request)
+        # user y negocio se usan en la lista, la foto y los mensajes de borrado
+        qs = super().get_queryset(request).select_related('user', 'negocio')
         if request.user.is_superuser:
             return qs
         return qs.filter(negocio=request.negocio)
@@ -472,13 +610,15 @@ class ProfesionalAdmin(admin.ModelAdmin):
 admin.site.register(Profesional, ProfesionalAdmin)
 
 # --- HorarioDisponibilidad ---
-class HorarioDisponibilidadAdmin(admin.ModelAdmin):
+class HorarioDisponibilidadAdmin(ImportarCSVMixin, admin.ModelAdmin):
+    tipo_importacion = 'horarios'
     list_display = ('id', 'profesional_nombre', 'day_of_week_display', 'start_time', 'end_time', 'is_recurring', 'negocio_nombre')
     list_filter = ('day_of_week', 'is_recurring', 'negocio')
     search_fields = ('profesional__user__username', 'profesional__user__first_name', 'profesional__user__last_name')
     list_per_page = 25
     ordering = ('profesional', 'day_of_week', 'start_time')
     readonly_fields = ('created_at', 'updated_at')
+    list_select_related = ('profesional__user', 'negocio')
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
@@ -515,20 +655,20 @@ class HorarioDisponibilidadAdmin(admin.ModelAdmin):
         return fields
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
-        if not request.user.is_superuser:
-            if db_field.name == "profesional":
-                kwargs["queryset"] = Profesional.objects.filter(negocio=request.negocio)
+        if db_field.name == "profesional":
+            kwargs["queryset"] = profesionales_con_usuario(request)
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 admin.site.register(HorarioDisponibilidad, HorarioDisponibilidadAdmin)
 
 # --- BloqueoHorario ---
 class BloqueoHorarioAdmin(admin.ModelAdmin):
     list_display = ('id', 'profesional_nombre', 'start_datetime', 'end_datetime', 'reason', 'negocio_nombre')
-    list_filter = ('start_datetime', 'negocio', 'profesional')
+    list_filter = ('start_datetime', 'negocio', ('profesional', ProfesionalListFilter))
     search_fields = ('profesional__user__username', 'profesional__user__first_name', 'profesional__user__last_name', 'reason')
     list_per_page = 25
     ordering = ('-start_datetime',)
     readonly_fields = ('created_at', 'updated_at')
+    list_select_related = ('profesional__user', 'negocio')
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
@@ -561,20 +701,36 @@ class BloqueoHorarioAdmin(admin.ModelAdmin):
         return fields
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
-        if not request.user.is_superuser:
-            if db_field.name == "profesional":
-                kwargs["queryset"] = Profesional.objects.filter(negocio=request.negocio)
+        if db_field.name == "profesional":
+            kwargs["queryset"] = profesionales_con_usuario(request)
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 admin.site.register(BloqueoHorario, BloqueoHorarioAdmin)
 
 # --- Turno ---
+class ReasignarProfesionalForm(forms.Form):
+    profesional = forms.ModelChoiceField(queryset=Profesional.objects.none(), label='Nuevo profesional')
+
+    def __init__(self, *args, request=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['profesional'].queryset = profesionales_con_usuario(request)
+
+
 class TurnoAdmin(admin.ModelAdmin):
     list_display = ('id', 'cliente_nombre', 'profesional_nombre', 'servicio_nombre', 'start_datetime', 'status', 'negocio_nombre')
-    list_filter = ('status', 'start_datetime', 'negocio', 'profesional')
+    list_filter = ('status', 'start_datetime', 'negocio', ('profesional', ProfesionalListFilter))
     search_fields = ('cliente__username', 'cliente__first_name', 'cliente__last_name', 'cliente__email', 'profesional__user__username')
     list_per_page = 25
     ordering = ('-start_datetime',)
     readonly_fields = ('created_at', 'updated_at', 'end_datetime')
+    list_select_related = ('cliente', 'profesional__user', 'servicio', 'negocio')
+    # Búsqueda por AJAX: el formulario no renderiza un <option> por usuario
+    autocomplete_fields = ('cliente', 'profesional', 'servicio')
+    # Tabla grande: navegar por año/mes/día acota el rango (usa el índice de start_datetime)
+    date_hierarchy = 'start_datetime'
+    paginator = PaginadorConteoEstimado
+    # Evita el segundo COUNT(*) sobre toda la tabla al filtrar ("X de Y en total")
+    show_full_result_count = False
+    actions = ['completar_seleccionados', 'cancelar_seleccionados', 'reasignar_profesional']
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
@@ -626,14 +782,98 @@ class TurnoAdmin(admin.ModelAdmin):
                     memberships__rol=Membership.Roles.CLIENTE,
                     memberships__is_active=True
                 ).distinct()
-            if db_field.name == "profesional":
-                kwargs["queryset"] = Profesional.objects.filter(negocio=request.negocio)
             if db_field.name == "servicio":
                 kwargs["queryset"] = Servicio.objects.filter(negocio=request.negocio)
+        if db_field.name == "profesional":
+            kwargs["queryset"] = profesionales_con_usuario(request)
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
+    # Acciones masivas: un solo UPDATE por acción (ver core/services/turnos.py)
+    @admin.action(description='Marcar como completados los turnos seleccionados')
+    def completar_seleccionados(self, request, queryset):
+        completados = completar_turnos(queryset)
+        self.message_user(request, f"{completados} turno(s) marcado(s) como completado(s).")
+
+    @admin.action(description='Cancelar los turnos seleccionados y avisar a los clientes')
+    def cancelar_seleccionados(self, request, queryset):
+        resultado = cancelar_turnos(queryset)
+        self.message_user(
+            request,
+            f"{resultado['cancelados']} turno(s) cancelado(s). "
+            f"{resultado['emails']} aviso(s) encolado(s)."
+        )
+
+    @admin.action(description='Reasignar los turnos seleccionados a otro profesional')
+    def reasignar_profesional(self, request, queryset):
+        form = ReasignarProfesionalForm(request.POST if 'aplicar' in request.POST else None, request=request)
+        if form.is_valid():
+            profesional = form.cleaned_data['profesional']
+            resultado = reasignar_turnos(queryset, profesional)
+            if resultado['conflictos']:
+                detalle = ', '.join(str(t) for t in resultado['conflictos'][:5])
+                self.message_user(
+                    request,
+                    f"No se reasignó ningún turno: {len(resultado['conflictos'])} se superpone(n) "
+                    f"con la agenda de {profesional} o son de otro negocio. {detalle}",
+                    level=messages.ERROR,
+                )
+            else:
+                self.message_user(
+                    request,
+                    f"{resultado['reasignados']} turno(s) reasignado(s) a {profesional}. "
+                    f"{resultado['emails']} confirmación(es) encolada(s)."
+                )
+            return None
+
+        # Página intermedia para elegir el profesional destino
+        return TemplateResponse(request, 'admin/core/turno/reasignar_profesional.html', {
+            **self.admin_site.each_context(request),
+            'title': 'Reasignar turnos',
+            'opts': self.model._meta,
+            'turnos': queryset,
+            'form': form,
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        })
+
 admin.site.register(Turno, TurnoAdmin)
 
+# --- EmailOutbox ---
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'tipo', 'destinatario', 'status', 'intentos', 'next_attempt_at', 'sent_at', 'negocio')
+    list_filter = ('status', 'tipo', 'negocio')
+    search_fields = ('destinatario',)
+    list_per_page = 50
+    ordering = ('-id',)
+    list_select_related = ('negocio',)
+    paginator = PaginadorConteoEstimado
+    show_full_result_count = False
+    readonly_fields = ('tipo', 'payload_publico', 'destinatario', 'intentos', 'locked_at', 'last_error', 'sent_at', 'created_at', 'updated_at', 'negocio')
+    fields = ('tipo', 'destinatario', 'negocio', 'status', 'intentos', 'max_intentos', 'next_attempt_at', 'locked_at', 'last_error', 'sent_at', 'payload_publico', 'created_at', 'updated_at')
+    actions = ['reintentar_ahora']
+
+    def payload_publico(self, obj):
+        # Nunca mostrar la contraseña temporal de los emails de bienvenida
+        return {k: v for k, v in obj.payload.items() if k != 'password'}
+    payload_publico.short_description = 'Payload'
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return limit_queryset_by_user_negocios(qs, request.user)
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description='Reintentar ahora los emails seleccionados')
+    def reintentar_ahora(self, request, queryset):
+        from django.utils import timezone
+        actualizados = queryset.exclude(status=EmailOutbox.Estados.ENVIADO).update(
+            status=EmailOutbox.Estados.PENDIENTE,
+            next_attempt_at=timezone.now(),
+            locked_at=None,
+        )
+        self.message_user(request, f"{actualizados} email(s) reprogramado(s) para envío inmediato.")
+admin.site.register(EmailOutbox, EmailOutboxAdmin)
+
 # =====================================================
 # FORMULARIO PERSONALIZADO PARA TURNOS
 # =====================================================
@@ -651,6 +891,10 @@ class TurnoForm(forms.ModelForm):
         model = Turno
         fields = '__all__'
         exclude = ['end_datetime']
+        widgets = {
+            'cliente': AutocompleteSelect(Turno._meta.get_field('cliente'), admin.site),
+            'profesional': AutocompleteSelect(Turno._meta.get_field('profesional'), admin.site),
+        }
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -663,6 +907,31 @@ class TurnoForm(forms.ModelForm):
 # =====================================================
 # CONFIGURACIÓN DEL SITIO ADMIN
 # =====================================================
+# === Capturas de perfilado (?_profile=1, ver core/services/perfilado.py) ===
+# No son un modelo: se leen del buffer en disco. El superusuario ve todas; el
+# resto del staff, solo las suyas (pueden traer datos de cualquier negocio).
+def capturas_perfilado_view(request):
+    usuario_id = None if request.user.is_superuser else request.user.id
+    return TemplateResponse(request, 'admin/perfilado/capturas.html', {
+        **admin.site.each_context(request),
+        'title': 'Capturas de perfilado',
+        'capturas': listar_capturas(usuario_id=usuario_id),
+    })
+
+
+def captura_perfilado_view(request, id_captura):
+    captura = leer_captura(id_captura)
+    if captura is None:
+        raise Http404('La captura no existe o ya salió del buffer')
+    if not request.user.is_superuser and captura.get('usuario_id') != request.user.id:
+        raise PermissionDenied
+    return TemplateResponse(request, 'admin/perfilado/captura.html', {
+        **admin.site.each_context(request),
+        'title': f"{captura['metodo']} {captura['path']}",
+        'captura': captura,
+    })
+
+
 admin.site.site_header = "Administración de Negocios"
 admin.site.site_title = "Sistema de Negocios"
 admin.site.index_title = "Panel de Administración"
@@ -0,0 +1,92 @@
+import time
+
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail.backends.locmem import EmailBackend as LocmemEmailBackend
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from core.utils.email_utils import enviar_emails_en_lote
+
+
+class BackendConHandshake(LocmemEmailBackend):
+    """
+    Backend locmem que simula el costo de abrir una sesión SMTP+TLS.
+
+    `open()` duerme `latencia` segundos y cuenta cuántas sesiones se abrieron,
+    así se puede comparar un envío por conexión contra el envío en lote sin
+    depender de un servidor SMTP real.
+    """
+    latencia = 0.0
+    aperturas = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._abierta = False
+
+    def open(self):
+        if self._abierta:
+            return False
+        time.sleep(BackendConHandshake.latencia)
+        BackendConHandshake.aperturas += 1
+        self._abierta = True
+        return True
+
+    def close(self):
+        self._abierta = False
+
+    def send_messages(self, messages):
+        # Igual que el backend SMTP: si nadie abrió la conexión, abrir y cerrar acá
+        nueva = self.open()
+        try:
+            return super().send_messages(messages)
+        finally:
+            if nueva:
+                self.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el throughput de email.send() (una sesión SMTP por mensaje) contra "
+        "enviar_emails_en_lote() (una sesión por lote) con un backend locmem que "
+        "simula la latencia del handshake."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mensajes', type=int, default=300)
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--latencia-handshake-ms', type=float, default=20.0,
+                            help='Costo simulado de abrir una sesión SMTP+TLS (default: 20ms)')
+
+    def handle(self, *args, **options):
+        n = options['mensajes']
+        BackendConHandshake.latencia = options['latencia_handshake_ms'] / 1000
+
+        backend = f'{__name__}.BackendConHandshake'
+        with override_settings(EMAIL_BACKEND=backend):
+            individual = self._medir(n, lambda mensajes: [m.send(fail_silently=False) for m in mensajes])
+            en_lote = self._medir(n, lambda mensajes: enviar_emails_en_lote(mensajes, options['batch_size']))
+
+        self.stdout.write(f"Mensajes: {n} | latencia handshake: {options['latencia_handshake_ms']}ms | batch: {options['batch_size']}")
+        for nombre, (segundos, aperturas) in (('email.send()', individual), ('enviar_emails_en_lote', en_lote)):
+            self.stdout.write(
+                f"  {nombre:<24} {segundos:7.3f}s  {n / segundos:9.1f} msg/s  sesiones abiertas: {aperturas}"
+            )
+
+    def _medir(self, n, enviar):
+        mail.outbox = []
+        BackendConHandshake.aperturas = 0
+        mensajes = [
+            EmailMultiAlternatives(
+                subject=f'Benchmark {i}',
+                body='Cuerpo de prueba',
+                from_email='noreply@ordema.app',
+                to=[f'cliente{i}@example.com'],
+            )
+            for i in range(n)
+        ]
+        inicio = time.perf_counter()
+        enviar(mensajes)
+        segundos = time.perf_counter() - inicio
+        assert len(mail.outbox) == n, f"Se esperaban {n} emails y se enviaron {len(mail.outbox)}"
+        return segundos, BackendConHandshake.aperturas
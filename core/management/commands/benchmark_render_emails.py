@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from django.template.loaders import cached
+
+from core.models import Turno
+from core.utils.email_utils import _construir_template_html_bienvenida, _construir_template_html_turno
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el costo de renderizar el HTML de los emails con el template en frío "
+        "(compilándolo, como en el primer email de un proceso) contra el template ya "
+        "compilado por el cached loader (solo activo con DEBUG=False)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iteraciones', type=int, default=2000)
+        parser.add_argument('--turno-id', type=int, help='Turno a usar (default: el primero)')
+
+    def handle(self, *args, **options):
+        turnos = Turno.objects.select_related('cliente', 'profesional__user', 'servicio', 'negocio')
+        turno = turnos.filter(id=options['turno_id']).first() if options['turno_id'] else turnos.first()
+        if turno is None:
+            raise CommandError('No hay turnos para renderizar')
+
+        n = options['iteraciones']
+        casos = (
+            ('confirmacion_turno', lambda: _construir_template_html_turno(turno)),
+            ('bienvenida_usuario', lambda: _construir_template_html_bienvenida(turno.cliente, 'temporal123', turno.negocio)),
+        )
+
+        self.stdout.write(f"Iteraciones: {n} | turno #{turno.id} ({turno.negocio.nombre})")
+        if not any(isinstance(loader, cached.Loader) for loader in engines['django'].engine.template_loaders):
+            self.stdout.write("Sin cached loader (DEBUG=True): frío y caliente compilan el template igual")
+        for nombre, renderizar in casos:
+            frio = self._medir(n, renderizar, self._enfriar)
+            caliente = self._medir(n, renderizar)
+            self.stdout.write(
+                f"  {nombre:<20} frío: {frio:8.1f} µs/email   caliente: {caliente:8.1f} µs/email   "
+                f"(x{frio / caliente:.1f})"
+            )
+
+    def _enfriar(self):
+        """Descarta los templates compilados, como en el primer email de un proceso."""
+        for loader in engines['django'].engine.template_loaders:
+            if hasattr(loader, 'reset'):
+                loader.reset()
+
+    def _medir(self, n, renderizar, antes=None):
+        renderizar()
+        total = 0.0
+        for _ in range(n):
+            if antes:
+                antes()
+            inicio = time.perf_counter()
+            renderizar()
+            total += time.perf_counter() - inicio
+        return total / n * 1e6
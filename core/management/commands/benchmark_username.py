@@ -0,0 +1,73 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import Usuario
+from core.serializers import BotRegistroSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide la asignación de username del registro por bot con N usuarios que ya "
+        "comparten el mismo nombre. Todo corre en una transacción que se revierte."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--usuarios', type=int, default=10000,
+                            help='Usuarios con el mismo username base a sembrar (default: 10000)')
+        parser.add_argument('--nombre', default='Juan Perez Benchmark')
+        parser.add_argument('--legado', action='store_true',
+                            help='Medir también el loop anterior (una query por colisión)')
+
+    def handle(self, *args, **options):
+        serializer = BotRegistroSerializer()
+        nombre = options['nombre']
+        base = serializer._generar_username(nombre)
+
+        with transaction.atomic():
+            sembrados = 0
+            for objetivo in self._escalones(options['usuarios']):
+                self._sembrar(base, sembrados, objetivo)
+                sembrados = objetivo
+                self._reportar('actual', sembrados, lambda: serializer._generar_username(nombre))
+                if options['legado']:
+                    self._reportar('legado', sembrados, lambda: self._username_legado(base))
+            transaction.set_rollback(True)
+
+    def _escalones(self, total):
+        escalones = [n for n in (0, 10, 100, 1000) if n < total]
+        return escalones + [total]
+
+    def _sembrar(self, base, desde, hasta):
+        nombres = [base if i == 0 else f'{base}{i}' for i in range(desde, hasta)]
+        Usuario.objects.bulk_create(
+            [Usuario(username=username, password='!') for username in nombres],
+            batch_size=1000,
+        )
+
+    def _reportar(self, etiqueta, existentes, asignar):
+        queries = 0
+
+        def contar(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(contar):
+            inicio = time.perf_counter()
+            username = asignar()
+            ms = (time.perf_counter() - inicio) * 1000
+        self.stdout.write(
+            f"  {etiqueta:<7} existentes={existentes:>6}  -> {username:<24} "
+            f"{queries:>6} queries  {ms:9.2f} ms"
+        )
+
+    @staticmethod
+    def _username_legado(base):
+        username = base
+        contador = 1
+        while Usuario.objects.filter(username=username).exists():
+            username = f"{base}{contador}"
+            contador += 1
+        return username
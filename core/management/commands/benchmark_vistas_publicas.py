@@ -0,0 +1,129 @@
+import asyncio
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from urllib.parse import urlencode, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+PASOS = ('servicios', 'profesionales', 'proximos_dias', 'disponibilidad')
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de carga de las consultas públicas del bot contra un servidor ya levantado "
+        "(gunicorn con workers sync, o uvicorn con VISTAS_PUBLICAS_ASYNC=True). Cada "
+        "conversación repite servicios -> profesionales -> próximos días -> disponibilidad "
+        "de una fecha devuelta. Reporta RPS y p50/p90/p99 por endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000',
+                            help='Servidor a probar (default: http://127.0.0.1:8000)')
+        parser.add_argument('--negocio', type=int, required=True, help='ID del negocio (header X-Negocio-ID)')
+        parser.add_argument('--profesional', type=int, required=True)
+        parser.add_argument('--servicio', type=int, required=True)
+        parser.add_argument('--concurrencia', type=int, default=500,
+                            help='Conversaciones simultáneas (default: 500)')
+        parser.add_argument('--duracion', type=float, default=30,
+                            help='Segundos de carga (default: 30)')
+        parser.add_argument('--pausa', type=float, default=0,
+                            help='Milisegundos entre pasos de una conversación (default: 0)')
+        parser.add_argument('--timeout', type=float, default=30,
+                            help='Segundos máximos por request (default: 30)')
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError('--url debe ser http://host[:puerto]')
+
+        self.stdout.write(
+            f"{options['concurrencia']} conversaciones durante {options['duracion']:g}s contra {options['url']}"
+        )
+        muestras, segundos = asyncio.run(self._cargar(url, options))
+        self._reportar(muestras, segundos)
+
+    async def _cargar(self, url, options):
+        muestras = defaultdict(list)  # paso -> [(ms, ok), ...]
+        inicio = time.perf_counter()
+        fin = inicio + options['duracion']
+        await asyncio.gather(*(
+            self._conversacion(url, options, fin, muestras) for _ in range(options['concurrencia'])
+        ))
+        return muestras, time.perf_counter() - inicio
+
+    async def _conversacion(self, url, options, fin, muestras):
+        base = url.path.rstrip('/') + '/api/v1/'
+        ids = {'profesional_id': options['profesional'], 'servicio_id': options['servicio']}
+        pausa = options['pausa'] / 1000
+
+        while time.perf_counter() < fin:
+            fechas = []
+            for paso in PASOS:
+                if paso == 'servicios':
+                    ruta = base + 'servicios-publicos/'
+                elif paso == 'profesionales':
+                    ruta = base + 'profesionales-disponibles/'
+                elif paso == 'proximos_dias':
+                    ruta = base + 'reservas/disponibilidad/proximos-dias/?' + urlencode(ids)
+                else:
+                    fecha = random.choice(fechas) if fechas else (date.today() + timedelta(days=1)).isoformat()
+                    ruta = base + 'reservas/disponibilidad/?' + urlencode({**ids, 'fecha': fecha})
+
+                t0 = time.perf_counter()
+                try:
+                    codigo, cuerpo = await asyncio.wait_for(
+                        self._get(url, ruta, options['negocio']), timeout=options['timeout']
+                    )
+                    ok = 200 <= codigo < 300
+                except (OSError, asyncio.TimeoutError, ValueError):
+                    ok, cuerpo = False, b''
+                muestras[paso].append(((time.perf_counter() - t0) * 1000, ok))
+
+                if paso == 'proximos_dias' and ok:
+                    fechas = [f['fecha'] for f in json.loads(cuerpo).get('fechas', [])]
+                if time.perf_counter() >= fin:
+                    return
+                if pausa:
+                    await asyncio.sleep(pausa)
+
+    @staticmethod
+    async def _get(url, ruta, negocio_id):
+        # HTTP/1.0: una conexión por request y sin chunked, igual para gunicorn y uvicorn
+        reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+        try:
+            writer.write(
+                f"GET {ruta} HTTP/1.0\r\nHost: {url.netloc}\r\nX-Negocio-ID: {negocio_id}\r\n"
+                f"Accept: application/json\r\n\r\n".encode()
+            )
+            await writer.drain()
+            respuesta = await reader.read()
+        finally:
+            writer.close()
+        cabecera, _, cuerpo = respuesta.partition(b'\r\n\r\n')
+        return int(cabecera.split(None, 2)[1]), cuerpo
+
+    def _reportar(self, muestras, segundos):
+        total = sum(len(m) for m in muestras.values())
+        errores = sum(1 for m in muestras.values() for _, ok in m if not ok)
+        self.stdout.write(
+            f"\n{total} requests en {segundos:.1f}s -> {total / segundos:.1f} RPS ({errores} errores)\n"
+        )
+        self.stdout.write(f"  {'endpoint':<15}{'requests':>9}{'errores':>9}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for paso in (*PASOS, 'total'):
+            datos = [m for lista in muestras.values() for m in lista] if paso == 'total' else muestras.get(paso, [])
+            if not datos:
+                continue
+            tiempos = sorted(ms for ms, _ in datos)
+            self.stdout.write(
+                f"  {paso:<15}{len(datos):>9}{sum(1 for _, ok in datos if not ok):>9}"
+                f"{self._percentil(tiempos, 50):>10.1f}{self._percentil(tiempos, 90):>10.1f}"
+                f"{self._percentil(tiempos, 99):>10.1f}{tiempos[-1]:>10.1f}"
+            )
+
+    @staticmethod
+    def _percentil(ordenados, p):
+        return ordenados[max(0, math.ceil(len(ordenados) * p / 100) - 1)]
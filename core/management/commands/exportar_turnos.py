@@ -0,0 +1,46 @@
+from datetime import datetime
+import argparse
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Negocio
+from core.services.exportacion import FORMATOS_EXPORTACION, exportar_turnos, filas_turnos
+
+
+def _fecha(valor):
+    try:
+        return datetime.strptime(valor, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Fecha inválida '{valor}'. Use YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta el historial de turnos de un negocio en CSV o JSON Lines. "
+        "Lee la base por chunks y escribe a medida que avanza (memoria constante)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('negocio_id', type=int, help='ID del negocio')
+        parser.add_argument('--formato', choices=FORMATOS_EXPORTACION, default='csv')
+        parser.add_argument('--desde', type=_fecha, help='Primer día incluido (YYYY-MM-DD)')
+        parser.add_argument('--hasta', type=_fecha, help='Último día incluido (YYYY-MM-DD)')
+        parser.add_argument('--output', '-o', help='Archivo de salida (default: stdout)')
+
+    def handle(self, *args, **options):
+        negocio = Negocio.objects.filter(id=options['negocio_id']).first()
+        if not negocio:
+            raise CommandError(f"No existe el negocio {options['negocio_id']}")
+
+        bloques = exportar_turnos(filas_turnos(negocio, options['desde'], options['hasta']), options['formato'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as salida:
+                self._escribir(bloques, salida)
+            self.stderr.write(f"[EXPORTACIÓN] Turnos de '{negocio.nombre}' exportados a {options['output']}")
+        else:
+            self._escribir(bloques, sys.stdout)
+
+    def _escribir(self, bloques, salida):
+        for bloque in bloques:
+            salida.write(bloque)
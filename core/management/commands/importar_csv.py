@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Negocio
+from core.services.importacion import TIPOS_IMPORTACION, importar_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa servicios, horarios o clientes de un negocio desde un CSV. "
+        "Valida todo el archivo, inserta las filas válidas con bulk_create sobre "
+        "la clave natural (reimportar no duplica) e informa los errores por línea."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('tipo', choices=sorted(TIPOS_IMPORTACION))
+        parser.add_argument('negocio_id', type=int, help='ID del negocio')
+        parser.add_argument('archivo', help='Ruta del CSV (UTF-8, separado por "," o ";")')
+        parser.add_argument('--dry-run', action='store_true', help='Solo validar, sin escribir en la base')
+
+    def handle(self, *args, **options):
+        negocio = Negocio.objects.filter(id=options['negocio_id']).first()
+        if not negocio:
+            raise CommandError(f"No existe el negocio {options['negocio_id']}")
+
+        try:
+            with open(options['archivo'], encoding='utf-8-sig') as archivo:
+                contenido = archivo.read()
+        except (OSError, UnicodeDecodeError) as e:
+            raise CommandError(f"No se pudo leer el archivo: {e}")
+
+        inicio = time.perf_counter()
+        try:
+            resultado = importar_csv(options['tipo'], negocio, contenido, dry_run=options['dry_run'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        segundos = time.perf_counter() - inicio
+
+        for linea, mensaje in resultado.errores:
+            self.stdout.write(f"  línea {linea}: {mensaje}")
+        self.stdout.write(
+            f"[IMPORTACIÓN {options['tipo']}{' (dry-run)' if options['dry_run'] else ''}] "
+            f"filas={resultado.filas} creados={resultado.creados} actualizados={resultado.actualizados} "
+            f"sin_cambios={resultado.sin_cambios} errores={len(resultado.errores)} ({segundos:.2f}s)"
+        )
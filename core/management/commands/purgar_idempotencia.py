@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.services.idempotencia import purgar_claves_vencidas
+
+
+class Command(BaseCommand):
+    help = "Borra las respuestas guardadas de Idempotency-Key ya vencidas (correr periódicamente, ej: cron diario)."
+
+    def handle(self, *args, **options):
+        borradas = purgar_claves_vencidas()
+        self.stdout.write(f"[IDEMPOTENCIA] {borradas} claves vencidas borradas")
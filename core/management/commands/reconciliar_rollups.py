@@ -0,0 +1,42 @@
+from datetime import date, datetime, timedelta
+import argparse
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Negocio
+from core.services.analiticas import recalcular_rollups
+
+
+def _fecha(valor):
+    try:
+        return datetime.strptime(valor, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Fecha inválida '{valor}'. Use YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula el rollup diario de turnos (TurnoRollupDiario) desde la tabla turno "
+        "y corrige las diferencias. Pensado para correr cada noche; sin fechas revisa "
+        "los últimos 35 días y los próximos 90."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', type=_fecha, help='Primer día incluido (YYYY-MM-DD)')
+        parser.add_argument('--hasta', type=_fecha, help='Último día incluido (YYYY-MM-DD)')
+        parser.add_argument('--negocio', type=int, help='ID del negocio (default: todos)')
+
+    def handle(self, *args, **options):
+        hoy = date.today()
+        desde = options['desde'] or hoy - timedelta(days=35)
+        hasta = options['hasta'] or hoy + timedelta(days=90)
+        if hasta < desde:
+            raise CommandError("--hasta no puede ser anterior a --desde")
+        if options['negocio'] and not Negocio.objects.filter(id=options['negocio']).exists():
+            raise CommandError(f"No existe el negocio {options['negocio']}")
+
+        resultado = recalcular_rollups(desde, hasta, negocio_id=options['negocio'])
+        self.stdout.write(
+            f"[ROLLUP] {desde} a {hasta}: {resultado['filas']} filas, "
+            f"{resultado['corregidas']} corregidas, {resultado['borradas']} borradas"
+        )
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from core.services.usuarios import resolver_telefonos_duplicados
+
+
+class Command(BaseCommand):
+    help = (
+        "Resuelve los usuarios sin phone_e164 por número duplicado (migración 0025): "
+        "les asigna el número si ya quedó libre o, si sigue siendo de otra cuenta, "
+        "se lo quita para que lo conserve la cuenta más antigua."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Solo informar, sin escribir en la base')
+
+    def handle(self, *args, **options):
+        resultado = resolver_telefonos_duplicados(dry_run=options['dry_run'])
+        for usuario_id, e164 in resultado['asignados']:
+            self.stdout.write(f"  Usuario {usuario_id}: se asigna {e164}")
+        for usuario_id, phone_number in resultado['quitados']:
+            self.stdout.write(f"  Usuario {usuario_id}: '{phone_number}' pertenece a otra cuenta, se quita")
+        self.stdout.write(
+            f"[TELÉFONOS{' (dry-run)' if options['dry_run'] else ''}] "
+            f"{len(resultado['asignados'])} asignados, {len(resultado['quitados'])} quitados"
+        )
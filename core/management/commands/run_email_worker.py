@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.services.outbox import procesar_lote
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker de la cola de emails (EmailOutbox): reclama emails pendientes con "
+        "SELECT ... FOR UPDATE SKIP LOCKED, los envía y reintenta con backoff."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=getattr(settings, 'EMAIL_BATCH_SIZE', 50),
+                            help='Emails a reclamar y enviar por conexión SMTP (default: settings.EMAIL_BATCH_SIZE)')
+        parser.add_argument('--sleep', type=float, default=5.0,
+                            help='Segundos de espera cuando la cola está vacía (default: 5)')
+        parser.add_argument('--once', action='store_true',
+                            help='Procesar un único lote y salir (útil para cron o pruebas)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        sleep = options['sleep']
+
+        self.stdout.write(f"[EMAIL WORKER] Iniciado (batch={batch_size}, sleep={sleep}s)")
+        try:
+            while True:
+                close_old_connections()
+                resultado = procesar_lote(batch_size)
+
+                if resultado['reclamados']:
+                    self.stdout.write(
+                        f"[EMAIL WORKER] reclamados={resultado['reclamados']} "
+                        f"enviados={resultado['enviados']} "
+                        f"reintentos={resultado['reintentos']} "
+                        f"fallidos={resultado['fallidos']}"
+                    )
+
+                if options['once']:
+                    break
+
+                # Lote lleno => probablemente hay más esperando; seguir sin dormir
+                if resultado['reclamados'] < batch_size:
+                    time.sleep(sleep)
+        except KeyboardInterrupt:
+            self.stdout.write("[EMAIL WORKER] Detenido")
@@ -0,0 +1,76 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.services.recordatorios import ETAPAS, procesar_recordatorios
+
+
+class Command(BaseCommand):
+    help = (
+        "Scheduler de recordatorios de turnos (24h y 2h antes): reclama turnos por "
+        "ventana con SELECT ... FOR UPDATE SKIP LOCKED, los envía en lote y reporta "
+        "throughput y lag."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=getattr(settings, 'EMAIL_BATCH_SIZE', 50),
+                            help='Turnos a reclamar y enviar por conexión SMTP (default: settings.EMAIL_BATCH_SIZE)')
+        parser.add_argument('--sleep', type=float, default=60.0,
+                            help='Segundos entre ciclos cuando no hay recordatorios pendientes (default: 60)')
+        parser.add_argument('--once', action='store_true',
+                            help='Vaciar las ventanas una vez y salir (útil para cron o pruebas)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        sleep = options['sleep']
+
+        self.stdout.write(
+            f"[RECORDATORIOS] Iniciado (etapas={','.join(e.nombre for e in ETAPAS)}, "
+            f"batch={batch_size}, sleep={sleep}s)"
+        )
+        try:
+            while True:
+                for etapa in ETAPAS:
+                    self._vaciar_etapa(etapa, batch_size)
+
+                if options['once']:
+                    break
+                time.sleep(sleep)
+        except KeyboardInterrupt:
+            self.stdout.write("[RECORDATORIOS] Detenido")
+
+    def _vaciar_etapa(self, etapa, batch_size):
+        """Procesa lotes de la etapa hasta que la ventana quede vacía."""
+        totales = {'reclamados': 0, 'enviados': 0, 'sin_email': 0, 'fallidos': 0}
+        lag_max = 0.0
+        lag_acumulado = 0.0
+        inicio = time.perf_counter()
+
+        while True:
+            close_old_connections()
+            resultado = procesar_recordatorios(etapa, batch_size)
+            for clave in totales:
+                totales[clave] += resultado[clave]
+            lag_max = max(lag_max, resultado['lag_max'])
+            lag_acumulado += resultado['lag_promedio'] * resultado['enviados']
+
+            # Lote incompleto => la ventana quedó vacía. Si hubo fallidos (ya
+            # liberados) se cortan los lotes: se reintentan en el próximo ciclo,
+            # no en un loop contra un SMTP caído.
+            if resultado['reclamados'] < batch_size or resultado['fallidos']:
+                break
+
+        if not totales['reclamados']:
+            return
+
+        segundos = time.perf_counter() - inicio
+        lag_promedio = lag_acumulado / totales['enviados'] if totales['enviados'] else 0.0
+        self.stdout.write(
+            f"[RECORDATORIOS {etapa.nombre}] reclamados={totales['reclamados']} "
+            f"enviados={totales['enviados']} sin_email={totales['sin_email']} "
+            f"fallidos={totales['fallidos']} "
+            f"throughput={totales['enviados'] / segundos if segundos else 0:.1f}/s "
+            f"lag_promedio={lag_promedio:.0f}s lag_max={lag_max:.0f}s"
+        )
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.services.perfilado import HEADER_PERFILADO, generar_token_perfilado
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera un token para perfilar requests sin usuario staff: enviarlo en el "
+        "header X-Perfilado junto con ?_profile=1."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--nota', default='', help='Para quién o para qué es el token (queda firmado en el token)')
+
+    def handle(self, *args, **options):
+        token = generar_token_perfilado(options['nota'])
+        horas = settings.PERFILADO_TOKEN_MAX_AGE / 3600
+        self.stdout.write(f"{HEADER_PERFILADO}: {token}")
+        self.stderr.write(f"[PERFILADO] Válido por {horas:g} horas")
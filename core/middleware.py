@@ -1,6 +1,14 @@
+import asyncio
 import logging
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.urls import reverse
 from django.utils.deprecation import MiddlewareMixin
 from core.models import Membership, Negocio
+from core.services.perfilado import PARAM_PERFILADO, perfilar_vista, puede_perfilar
+from core.services.sql_lento import RegistroSQLLento
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 logger = logging.getLogger(__name__)
@@ -61,3 +69,62 @@ class NegocioContextMiddleware(MiddlewareMixin):
                 request.negocio = Negocio.objects.filter(id=mid).first()
 
         print(f"[DEBUG] Resultado final request.negocio = {getattr(request.negocio, 'id', None)}")
+
+
+class PerfiladoMiddleware(MiddlewareMixin):
+    """
+    `?_profile=1` en cualquier vista de core: la ejecuta con cProfile y registro
+    de SQL y guarda la captura (ver core/services/perfilado.py).
+
+    Va después de NegocioContextMiddleware (necesita request.user ya resuelto
+    desde el JWT). Sin el parámetro solo se busca un substring en el query string.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if PARAM_PERFILADO not in request.META.get('QUERY_STRING', ''):
+            return None
+        if request.GET.get(PARAM_PERFILADO) != '1' or not getattr(view_func, '__module__', '').startswith('core.'):
+            return None
+        # Las vistas async (SSE) no se pueden ejecutar desde acá
+        if asyncio.iscoroutinefunction(view_func) or not puede_perfilar(request):
+            return None
+
+        response, id_captura = perfilar_vista(request, lambda: view_func(request, *view_args, **view_kwargs))
+        response['X-Perfilado-Id'] = id_captura
+        response['X-Perfilado-Url'] = request.build_absolute_uri(reverse('perfilado_captura', args=[id_captura]))
+        return response
+
+
+class SqlLentoMiddleware:
+    """
+    Registra las queries de la request que superan SQL_LENTO_UMBRAL_MS, con la
+    vista y el negocio que las hicieron (ver core/services/sql_lento.py).
+
+    Va primero para cubrir también las queries de los otros middlewares.
+    Con SQL_LENTO_UMBRAL_MS = 0 se desactiva y no queda en la cadena.
+
+    Sync y async: bajo ASGI no obliga a la cadena (SSE, vistas públicas async)
+    a pasar por sync_to_async. Las queries de la request async corren en
+    sync_to_async con la misma conexión, así que el wrapper las ve igual.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.SQL_LENTO_UMBRAL_MS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.umbral_ms = settings.SQL_LENTO_UMBRAL_MS
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with connection.execute_wrapper(RegistroSQLLento(request, self.umbral_ms)):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with connection.execute_wrapper(RegistroSQLLento(request, self.umbral_ms)):
+            return await self.get_response(request)
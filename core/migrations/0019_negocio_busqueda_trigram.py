@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# Índices para la búsqueda `q` del directorio de negocios (nombre__icontains /
+# address__icontains). En PostgreSQL, icontains compila a
+# UPPER(col::text) LIKE UPPER('%q%'), así que indexamos exactamente esa expresión
+# con gin_trgm_ops. En otros motores no hay equivalente: la búsqueda sigue
+# funcionando con LIKE y el orden por nombre ya usa el índice UNIQUE existente.
+
+def crear_indices_trigram(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Negocio = apps.get_model("core", "Negocio")
+    table = Negocio._meta.db_table
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS negocio_nombre_trgm_idx
+                ON {table} USING gin (UPPER(nombre::text) gin_trgm_ops)
+        """)
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS negocio_address_trgm_idx
+                ON {table} USING gin (UPPER(address::text) gin_trgm_ops)
+        """)
+
+def eliminar_indices_trigram(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DROP INDEX IF EXISTS negocio_nombre_trgm_idx")
+        cursor.execute("DROP INDEX IF EXISTS negocio_address_trgm_idx")
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0018_negocio_address"),
+    ]
+    operations = [
+        migrations.RunPython(crear_indices_trigram, eliminar_indices_trigram),
+    ]
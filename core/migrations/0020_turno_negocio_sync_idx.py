@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_negocio_busqueda_trigram'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='turno',
+            index=models.Index(fields=['negocio', 'updated_at', 'id'], name='turno_negocio_sync_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_email_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profesional',
+            name='ical_token',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+    ]
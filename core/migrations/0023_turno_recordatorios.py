@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_profesional_ical_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='turno',
+            name='reminder_24h_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='turno',
+            name='reminder_2h_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='turno',
+            index=models.Index(condition=models.Q(('reminder_24h_sent_at__isnull', True), ('status__in', ['pendiente', 'confirmado'])), fields=['start_datetime'], name='turno_recordatorio_24h_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='turno',
+            index=models.Index(condition=models.Q(('reminder_2h_sent_at__isnull', True), ('status__in', ['pendiente', 'confirmado'])), fields=['start_datetime'], name='turno_recordatorio_2h_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_turno_recordatorios'),
+    ]
+
+    operations = [
+        # Primero sin UNIQUE: el backfill (0025) resuelve duplicados antes de crear el índice (0026)
+        migrations.AddField(
+            model_name='usuario',
+            name='phone_e164',
+            field=models.CharField(blank=True, editable=False, max_length=15, null=True),
+        ),
+    ]
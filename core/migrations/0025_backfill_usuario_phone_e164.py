@@ -0,0 +1,78 @@
+"""
+Backfill de usuario.phone_e164 en lotes.
+
+Corre fuera de una transacción única (atomic = False): cada lote de
+TAMANO_LOTE usuarios se guarda en su propia transacción, así no se bloquea
+la tabla usuario durante todo el backfill.
+
+Si dos usuarios comparten el mismo número normalizado, lo conserva el de menor
+id; el resto queda con phone_e164 = NULL (se informa por consola) para que el
+índice único de 0026 pueda crearse.
+"""
+
+import re
+
+from django.db import migrations, transaction
+
+TAMANO_LOTE = 1000
+
+
+def _normalizar(valor):
+    # Copia de core.utils.telefonos.normalizar_telefono (las migraciones no
+    # deben depender de código que puede cambiar)
+    if not valor:
+        return None
+    digitos = re.sub(r'\D+', '', str(valor))
+    if digitos.startswith('00'):
+        digitos = digitos[2:]
+    if not 8 <= len(digitos) <= 15:
+        return None
+    return digitos
+
+
+def backfill_phone_e164(apps, schema_editor):
+    Usuario = apps.get_model('core', 'Usuario')
+
+    asignados = set(
+        Usuario.objects.exclude(phone_e164__isnull=True).values_list('phone_e164', flat=True)
+    )
+    duplicados = []
+    ultimo_id = 0
+
+    while True:
+        lote = list(
+            Usuario.objects.filter(id__gt=ultimo_id, phone_e164__isnull=True)
+            .exclude(phone_number__isnull=True).exclude(phone_number='')
+            .order_by('id')
+            .values_list('id', 'phone_number')[:TAMANO_LOTE]
+        )
+        if not lote:
+            break
+        ultimo_id = lote[-1][0]
+
+        with transaction.atomic():
+            for usuario_id, phone_number in lote:
+                e164 = _normalizar(phone_number)
+                if e164 is None:
+                    continue
+                if e164 in asignados:
+                    duplicados.append((usuario_id, phone_number))
+                    continue
+                asignados.add(e164)
+                Usuario.objects.filter(id=usuario_id).update(phone_e164=e164)
+
+    for usuario_id, phone_number in duplicados:
+        print(f"[MIGRACIÓN phone_e164] Usuario {usuario_id}: teléfono duplicado '{phone_number}', queda sin phone_e164")
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0024_usuario_phone_e164'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_phone_e164, migrations.RunPython.noop),
+    ]
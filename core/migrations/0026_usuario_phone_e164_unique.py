@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_backfill_usuario_phone_e164'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usuario',
+            name='phone_e164',
+            field=models.CharField(blank=True, editable=False, max_length=15, null=True, unique=True),
+        ),
+    ]
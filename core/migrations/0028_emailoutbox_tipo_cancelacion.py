@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_clave_idempotencia'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailoutbox',
+            name='tipo',
+            field=models.CharField(choices=[('confirmacion_turno', 'Confirmación de turno'), ('bienvenida_usuario', 'Bienvenida de usuario'), ('cancelacion_turno', 'Cancelación de turno')], max_length=40),
+        ),
+    ]
@@ -0,0 +1,42 @@
+"""
+Borra horarios recurrentes duplicados antes de crear horario_recurrente_uniq (0030).
+
+Un duplicado es otra fila del mismo profesional, día y franja horaria, con
+is_recurring y sin fechas. Se conserva la de menor id.
+"""
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def borrar_duplicados(apps, schema_editor):
+    HorarioDisponibilidad = apps.get_model('core', 'HorarioDisponibilidad')
+    recurrentes = HorarioDisponibilidad.objects.filter(
+        is_recurring=True, start_date__isnull=True, end_date__isnull=True
+    )
+    grupos = (
+        recurrentes.values('profesional_id', 'day_of_week', 'start_time', 'end_time')
+        .annotate(cantidad=Count('id'), conservar=Min('id'))
+        .filter(cantidad__gt=1)
+    )
+    borrados = 0
+    for grupo in grupos:
+        borrados += recurrentes.filter(
+            profesional_id=grupo['profesional_id'],
+            day_of_week=grupo['day_of_week'],
+            start_time=grupo['start_time'],
+            end_time=grupo['end_time'],
+        ).exclude(id=grupo['conservar']).delete()[0]
+    if borrados:
+        print(f"\n  [HORARIOS] {borrados} horarios recurrentes duplicados borrados")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_emailoutbox_tipo_cancelacion'),
+    ]
+
+    operations = [
+        migrations.RunPython(borrar_duplicados, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_dedup_horarios_recurrentes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='horariodisponibilidad',
+            constraint=models.UniqueConstraint(condition=models.Q(('end_date__isnull', True), ('is_recurring', True), ('start_date__isnull', True)), fields=('profesional', 'day_of_week', 'start_time', 'end_time'), name='horario_recurrente_uniq'),
+        ),
+    ]
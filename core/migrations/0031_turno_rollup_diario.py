@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0030_horario_recurrente_uniq'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TurnoRollupDiario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('pendientes', models.PositiveIntegerField(default=0)),
+                ('confirmados', models.PositiveIntegerField(default=0)),
+                ('completados', models.PositiveIntegerField(default=0)),
+                ('cancelados', models.PositiveIntegerField(default=0)),
+                ('minutos_ocupados', models.PositiveIntegerField(default=0)),
+                ('ingresos', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('negocio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.negocio')),
+                ('profesional', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.profesional')),
+                ('servicio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.servicio')),
+            ],
+            options={
+                'verbose_name': 'Rollup diario de turnos',
+                'verbose_name_plural': 'Rollups diarios de turnos',
+                'db_table': 'turno_rollup_diario',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='turnorollupdiario',
+            constraint=models.UniqueConstraint(fields=('negocio', 'fecha', 'profesional', 'servicio'), name='turno_rollup_diario_uniq'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_turno_rollup_diario'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='negocio',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
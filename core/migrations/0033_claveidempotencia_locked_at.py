@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:40
+
+from django.db import migrations, models
+
+
+def inicializar_locked_at(apps, schema_editor):
+    # Las claves que quedaron en curso toman su fecha de creación como inicio
+    ClaveIdempotencia = apps.get_model('core', 'ClaveIdempotencia')
+    ClaveIdempotencia.objects.filter(status_code__isnull=True).update(locked_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_negocio_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='claveidempotencia',
+            name='locked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(inicializar_locked_at, migrations.RunPython.noop),
+    ]
@@ -1,13 +1,17 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser # Para el Custom User Model
 from django.conf import settings # Para referenciar el AUTH_USER_MODEL
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator # Para validaciones de valores mínimos
+from django.db import IntegrityError, transaction
 from datetime import timedelta
+from django.utils import timezone
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .constants import IONIC_ICON_CHOICES
-from django.db.models.signals import post_delete, pre_delete
+from django.db.models.signals import post_delete, post_init, pre_delete
 from django.dispatch import receiver
+from .utils.telefonos import normalizar_telefono
 
 
 # =====================================================
@@ -103,6 +107,7 @@ class Negocio(models.Model):
     )
     theme_colors = models.JSONField(default=get_default_theme)
     fecha_creacion = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'negocio'
@@ -143,6 +148,9 @@ class Usuario(AbstractUser):
     # Ya incluye: username, email, password, first_name, last_name, is_active, date_joined
     # Añadimos los campos que definimos en tu esquema SQL
     phone_number = models.CharField(max_length=20, null=True, blank=True)
+    # phone_number normalizado a E.164 solo dígitos (lo mantiene save()); es la
+    # columna que usan las búsquedas por teléfono del bot
+    phone_e164 = models.CharField(max_length=15, unique=True, null=True, blank=True, editable=False)
     profile_picture_url = models.CharField(max_length=500, null=True, blank=True)
 
     # Añadimos los campos de timestamp que tienes en tu SQL
@@ -166,7 +174,32 @@ class Usuario(AbstractUser):
         # Validar que username existe antes de aplicar .lower()
         if self.username:
             self.username = self.username.lower()
-        super().save(*args, **kwargs)
+        if not self._telefono_modificado():
+            super().save(*args, **kwargs)
+            return
+
+        # Solo al cambiar el teléfono: los usuarios que 0025 dejó sin phone_e164
+        # (número duplicado) tienen que poder seguir guardando el resto del perfil
+        self.phone_e164 = normalizar_telefono(self.phone_number)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'phone_number' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'phone_e164'}
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except IntegrityError:
+            if self.phone_e164 and Usuario.objects.filter(phone_e164=self.phone_e164).exclude(pk=self.pk).exists():
+                raise ValidationError({'phone_number': 'El número de teléfono ya está registrado'})
+            raise
+        self._phone_number_original = self.phone_number
+
+    def _telefono_modificado(self):
+        if self._state.adding:
+            return True
+        # Diferido con .only()/.defer() y sin asignar: no cambió
+        if 'phone_number' not in self.__dict__:
+            return False
+        return self.phone_number != getattr(self, '_phone_number_original', models.DEFERRED)
 
     def get_rol_en_negocio(self, negocio):
         """Helper para obtener el rol del usuario en un negocio específico"""
@@ -232,6 +265,8 @@ class Profesional(models.Model):
     bio = models.TextField(null=True, blank=True)
     # profile_picture_url = models.CharField(max_length=500, null=True, blank=True)
     is_available = models.BooleanField(default=True)
+    # Token secreto del feed /ical/<token>.ics (se genera al pedir el enlace)
+    ical_token = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -289,6 +324,14 @@ class HorarioDisponibilidad(models.Model):
         # Sin embargo, el constraint ya está en tu SQL y se aplicará.
         constraints = [
             models.CheckConstraint(check=models.Q(end_time__gt=models.F('start_time')), name='check_time_valid'),
+            # El unique_together de abajo no frena duplicados de horarios recurrentes:
+            # start_date/end_date son NULL y NULL nunca choca con NULL en un índice
+            # único. Esta es la clave natural que usan la importación CSV y el PUT.
+            models.UniqueConstraint(
+                fields=['profesional', 'day_of_week', 'start_time', 'end_time'],
+                condition=models.Q(is_recurring=True, start_date__isnull=True, end_date__isnull=True),
+                name='horario_recurrente_uniq',
+            ),
         ]
         unique_together = ('profesional', 'day_of_week', 'start_time', 'end_time', 'is_recurring', 'start_date', 'end_date') # Evitar duplicados
 
@@ -350,6 +393,10 @@ class Turno(models.Model):
         default='pendiente'
     )
     notes = models.TextField(null=True, blank=True)
+    # Marcas de recordatorio (manage.py run_reminders): se setean al reclamar el
+    # turno, así varios workers nunca envían el mismo recordatorio dos veces.
+    reminder_24h_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
+    reminder_2h_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -366,6 +413,20 @@ class Turno(models.Model):
         # Puedes añadir índices directamente aquí si no los gestionas en tu SQL,
         # pero ya los tienes en tu script y Django los detectará/usará.
         # Ejemplo: indexes = [models.Index(fields=['profesional', 'start_datetime', 'end_datetime', 'status'])]
+        indexes = [
+            # Delta-sync de la app: cambios posteriores a un cursor (updated_at, id)
+            models.Index(fields=['negocio', 'updated_at', 'id'], name='turno_negocio_sync_idx'),
+            # Recordatorios pendientes por start_datetime. Son parciales: un turno
+            # sale del índice en cuanto se envía su recordatorio.
+            models.Index(
+                fields=['start_datetime'], name='turno_recordatorio_24h_idx',
+                condition=models.Q(reminder_24h_sent_at__isnull=True, status__in=['pendiente', 'confirmado']),
+            ),
+            models.Index(
+                fields=['start_datetime'], name='turno_recordatorio_2h_idx',
+                condition=models.Q(reminder_2h_sent_at__isnull=True, status__in=['pendiente', 'confirmado']),
+            ),
+        ]
     def save(self, *args, **kwargs):
         # Siempre calculamos end_datetime basado en start_datetime + duration del servicio
         if self.start_datetime and self.servicio:
@@ -376,6 +437,132 @@ class Turno(models.Model):
         return f"Turno de {self.cliente.username} con {self.profesional.user.username} para {self.servicio.name} el {self.start_datetime.strftime('%Y-%m-%d %H:%M')}"
 
 
+# =====================================================
+# 8. MODELO EMAIL_OUTBOX (Emails transaccionales en cola)
+# =====================================================
+class EmailOutbox(models.Model):
+    """
+    Cola de emails transaccionales (patrón outbox).
+
+    Las vistas insertan la fila en la misma transacción que el turno/usuario
+    y el worker `manage.py run_email_worker` la envía fuera del request,
+    con reintentos y backoff exponencial.
+    """
+    class Tipos(models.TextChoices):
+        CONFIRMACION_TURNO = 'confirmacion_turno', 'Confirmación de turno'
+        BIENVENIDA_USUARIO = 'bienvenida_usuario', 'Bienvenida de usuario'
+        CANCELACION_TURNO = 'cancelacion_turno', 'Cancelación de turno'
+
+    class Estados(models.TextChoices):
+        PENDIENTE = 'pendiente', 'Pendiente'
+        ENVIANDO = 'enviando', 'Enviando'
+        ENVIADO = 'enviado', 'Enviado'
+        FALLIDO = 'fallido', 'Fallido'
+
+    tipo = models.CharField(max_length=40, choices=Tipos.choices)
+    # Referencias necesarias para construir el email al enviarlo (ej: {"turno_id": 12})
+    payload = models.JSONField(default=dict, blank=True)
+    destinatario = models.EmailField(blank=True)
+    status = models.CharField(max_length=20, choices=Estados.choices, default=Estados.PENDIENTE)
+    intentos = models.PositiveSmallIntegerField(default=0)
+    max_intentos = models.PositiveSmallIntegerField(default=5)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Campo para multi-tenant
+    negocio = models.ForeignKey('Negocio', on_delete=models.CASCADE, null=True, blank=True)
+
+    class Meta:
+        db_table = 'email_outbox'
+        verbose_name = 'Email en Cola'
+        verbose_name_plural = 'Emails en Cola'
+        indexes = [
+            # El worker reclama por (status, next_attempt_at) en orden de llegada
+            models.Index(fields=['status', 'next_attempt_at', 'id'], name='email_outbox_claim_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} → {self.destinatario or '—'} ({self.status})"
+
+
+# =====================================================
+# 9. MODELO IDEMPOTENCY_KEY (Reintentos del bot / app)
+# =====================================================
+class ClaveIdempotencia(models.Model):
+    """
+    Respuesta guardada de una request con header `Idempotency-Key`.
+
+    Un reintento con la misma clave (mismo endpoint y mismo actor) recibe la
+    respuesta original sin volver a ejecutar la vista. `status_code` NULL
+    significa que la primera request todavía está en curso.
+    """
+    clave = models.CharField(max_length=255)
+    # Endpoint + actor (bot o usuario) + negocio: la misma clave de dos actores no colisiona
+    alcance = models.CharField(max_length=150)
+    # sha256 del método, path y body: detecta una clave reutilizada con otro contenido
+    huella = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    respuesta = models.JSONField(null=True, blank=True)
+    # Inicio de la ejecución en curso: pasado RESERVA_EXPIRA sin status_code, la
+    # request se considera abandonada (worker caído) y un reintento la retoma
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'idempotency_key'
+        verbose_name = 'Clave de Idempotencia'
+        verbose_name_plural = 'Claves de Idempotencia'
+        constraints = [
+            models.UniqueConstraint(fields=['alcance', 'clave'], name='idempotency_alcance_clave_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.alcance} {self.clave} ({self.status_code or 'en curso'})"
+
+
+# =====================================================
+# 10. MODELO TURNO_ROLLUP_DIARIO (Analíticas del negocio)
+# =====================================================
+class TurnoRollupDiario(models.Model):
+    """
+    Totales diarios de turnos por profesional y servicio.
+
+    Se recalcula el día de un turno cada vez que el turno cambia (ver señales
+    abajo y core/services/analiticas.py) y `manage.py reconciliar_rollups`
+    lo verifica cada noche. Las analíticas leen de acá, no de `turno`.
+    """
+    negocio = models.ForeignKey(Negocio, on_delete=models.CASCADE)
+    profesional = models.ForeignKey(Profesional, on_delete=models.CASCADE)
+    servicio = models.ForeignKey(Servicio, on_delete=models.CASCADE)
+    fecha = models.DateField()
+    total = models.PositiveIntegerField(default=0)
+    pendientes = models.PositiveIntegerField(default=0)
+    confirmados = models.PositiveIntegerField(default=0)
+    completados = models.PositiveIntegerField(default=0)
+    cancelados = models.PositiveIntegerField(default=0)
+    # Minutos de agenda ocupados (pendientes + confirmados + completados)
+    minutos_ocupados = models.PositiveIntegerField(default=0)
+    # Precio actual del servicio por turno completado (el turno no guarda el precio cobrado)
+    ingresos = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'turno_rollup_diario'
+        verbose_name = 'Rollup diario de turnos'
+        verbose_name_plural = 'Rollups diarios de turnos'
+        constraints = [
+            models.UniqueConstraint(fields=['negocio', 'fecha', 'profesional', 'servicio'], name='turno_rollup_diario_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha} {self.profesional_id}/{self.servicio_id}: {self.total} turnos"
+
+
 @receiver(post_save, sender=Negocio)
 def asignar_negocio_a_propietario(sender, instance, created, **kwargs):
     propietario = getattr(instance, "propietario", None)
@@ -438,4 +625,49 @@ def sync_profesional_on_membership_delete(sender, instance, **kwargs):
     except Profesional.DoesNotExist:
         print(f"[SYNC] No se encontró perfil Profesional para {instance.user.username} en {instance.negocio.nombre}")
     except Exception as e:
-        print(f" [SYNC ERROR] {str(e)}")
\ No newline at end of file
+        print(f" [SYNC ERROR] {str(e)}")
+
+
+# --- Usuario.save() solo renormaliza phone_e164 si cambió el teléfono ---
+@receiver(post_init, sender=Usuario)
+def recordar_telefono_original_usuario(sender, instance, **kwargs):
+    # __dict__ y no el atributo: con .only()/.defer() no dispara una query
+    instance._phone_number_original = instance.__dict__.get('phone_number', models.DEFERRED)
+
+
+# --- Rollup diario y eventos de agenda: comparan contra el turno como se cargó ---
+@receiver(post_init, sender=Turno)
+def recordar_estado_original_turno(sender, instance, **kwargs):
+    # __dict__ y no el atributo: con .only()/.defer() no dispara una query
+    inicio = instance.__dict__.get('start_datetime')
+    instance._rollup_original = (instance.__dict__.get('negocio_id'), inicio.date() if inicio else None)
+    instance._status_original = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=Turno)
+@receiver(post_delete, sender=Turno)
+def actualizar_rollup_turno(sender, instance, **kwargs):
+    from core.services.analiticas import programar_recalculo_rollup
+
+    dias = {(instance.negocio_id, instance.start_datetime.date())}
+    negocio_original, fecha_original = getattr(instance, '_rollup_original', (None, None))
+    if negocio_original and fecha_original:
+        dias.add((negocio_original, fecha_original))
+    programar_recalculo_rollup(dias)
+    instance._rollup_original = (instance.negocio_id, instance.start_datetime.date())
+
+
+@receiver(post_save, sender=Turno)
+def publicar_evento_agenda_turno(sender, instance, created, **kwargs):
+    from core.services.eventos_agenda import (
+        TURNO_CANCELADO, TURNO_COMPLETADO, TURNO_CREADO, evento_turno, programar_eventos
+    )
+
+    tipo = None
+    if created:
+        tipo = TURNO_CREADO
+    elif instance.status != getattr(instance, '_status_original', None):
+        tipo = {'cancelado': TURNO_CANCELADO, 'completado': TURNO_COMPLETADO}.get(instance.status)
+    if tipo:
+        programar_eventos([(instance.profesional_id, evento_turno(tipo, instance))])
+    instance._status_original = instance.status
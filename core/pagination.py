@@ -0,0 +1,133 @@
+"""
+Paginadores reutilizables de la API y del admin.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+import json
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count, Window
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination
+
+
+class NegocioCursorPagination(CursorPagination):
+    """
+    Paginación por cursor para el directorio de negocios, ordenada por nombre.
+
+    `nombre` es único, así que el cursor es estable aunque se creen negocios
+    nuevos entre una página y la siguiente.
+
+    Query Parameters:
+    - cursor (str, opcional): cursor opaco devuelto en `next` / `previous`
+    - page_size (int, opcional): tamaño de página (default: 20, máx: 100)
+    """
+    ordering = 'nombre'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # En la primera página el total viaja en la misma query que la página
+        # (COUNT(*) OVER ()), sin un .count() aparte.
+        self.total_count = None
+        es_primera_pagina = not request.query_params.get(self.cursor_query_param)
+        if es_primera_pagina:
+            queryset = queryset.annotate(total_count=Window(expression=Count('id')))
+
+        page = super().paginate_queryset(queryset, request, view)
+
+        if es_primera_pagina:
+            self.total_count = page[0].total_count if page else 0
+        return page
+
+
+class PaginadorConteoEstimado(Paginator):
+    """
+    Paginador del admin que, en PostgreSQL, usa la estimación del planner en
+    lugar de un COUNT(*) exacto cuando la tabla completa es grande.
+
+    Solo estima el queryset sin WHERE: con filtros, búsqueda, date_hierarchy o
+    el recorte por negocio la estimación puede errar por órdenes de magnitud
+    (y el total de la lista filtrada es justo el que el usuario mira), así que
+    ahí hace el COUNT(*) exacto. Por debajo de `umbral_estimado` filas
+    estimadas también cuenta exacto. En otros motores siempre cuenta exacto.
+    """
+    umbral_estimado = 10000
+
+    @cached_property
+    def count(self):
+        if not es_queryset_sin_filtros(self.object_list):
+            return super().count
+        estimado = conteo_estimado(self.object_list)
+        if estimado is not None and estimado >= self.umbral_estimado:
+            return estimado
+        return super().count
+
+
+def es_queryset_sin_filtros(queryset):
+    """
+    True si el queryset recorre la tabla entera (sin WHERE, LIMIT ni DISTINCT).
+    """
+    if not hasattr(queryset, 'query'):
+        return False
+    query = queryset.query
+    return not query.where and not query.is_sliced and not query.distinct
+
+
+def conteo_estimado(queryset):
+    """
+    Filas que el planner de PostgreSQL estima para el queryset (EXPLAIN, sin ejecutarlo).
+
+    Returns:
+        int | None: la estimación, o None si no es un queryset sobre PostgreSQL
+    """
+    if not hasattr(queryset, 'query'):
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    # Sin ORDER BY: la cantidad estimada es la misma y el plan es más barato
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+
+# =============================================================================
+# CURSOR DE SINCRONIZACIÓN INCREMENTAL (delta-sync)
+# =============================================================================
+
+def codificar_cursor_sync(updated_at, pk):
+    """
+    Codifica la posición (updated_at, id) del último cambio entregado
+    en un cursor opaco para el cliente.
+    """
+    crudo = f"{updated_at.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(crudo.encode()).decode()
+
+
+def decodificar_cursor_sync(cursor):
+    """
+    Decodifica un cursor de sincronización.
+
+    Returns:
+        tuple: (updated_at: datetime, id: int)
+
+    Raises:
+        ValueError: si el cursor no es válido
+    """
+    try:
+        crudo = base64.urlsafe_b64decode(cursor.encode()).decode()
+        updated_at, pk = crudo.split('|')
+        return datetime.fromisoformat(updated_at), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError('Cursor de sincronización inválido') from e
@@ -1,20 +1,97 @@
+import re
+
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError
 from django.utils import timezone
 from datetime import timedelta
 from .models import Usuario, Servicio, Profesional, HorarioDisponibilidad, BloqueoHorario, Turno, Negocio, Membership
+from .services.usuarios import telefono_registrado
+from .utils.telefonos import normalizar_telefono
+
+
+# =============================================================================
+# SPARSE FIELDSETS (?fields=)
+# =============================================================================
+
+class CamposDinamicosMixin:
+    """
+    Permite que el cliente pida solo algunos campos (?fields=id,fecha,hora_inicio).
+
+    - `fields=[...]` en el constructor recorta los campos serializados.
+    - `Meta.campos_modelo` declara qué columnas del modelo (rutas ORM) necesita
+      cada campo, para que la vista acote la query con `optimizar_queryset`
+      (`select_related` + `.only()`).
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for nombre in set(self.fields) - set(fields):
+                self.fields.pop(nombre)
+
+    @classmethod
+    def parsear_fields(cls, valor):
+        """
+        Convierte el query param `fields` en lista de campos.
+
+        Returns:
+            list | None: None si no se pidió un subconjunto (todos los campos)
+
+        Raises:
+            serializers.ValidationError: si se piden campos inexistentes
+        """
+        if not valor:
+            return None
+        fields = [f.strip() for f in valor.split(',') if f.strip()]
+        invalidos = [f for f in fields if f not in cls.Meta.fields]
+        if invalidos:
+            raise serializers.ValidationError({
+                'fields': f"Campos inválidos: {', '.join(invalidos)}. Disponibles: {', '.join(cls.Meta.fields)}"
+            })
+        return fields or None
+
+    @classmethod
+    def optimizar_queryset(cls, queryset, fields=None, extra=()):
+        """
+        Aplica `select_related` y `.only()` según los campos pedidos.
+
+        Args:
+            queryset: QuerySet del modelo del serializer
+            fields: Lista de campos pedidos (None = todos)
+            extra: Rutas ORM que la vista necesita además de los campos serializados
+
+        Returns:
+            QuerySet optimizado
+        """
+        nombres = fields if fields is not None else cls.Meta.fields
+        rutas = {'id', *extra}
+        for nombre in nombres:
+            rutas.update(cls.Meta.campos_modelo.get(nombre, [nombre]))
+
+        relaciones = {ruta.rsplit('__', 1)[0] for ruta in rutas if '__' in ruta}
+        if relaciones:
+            queryset = queryset.select_related(*relaciones)
+        if fields is None:
+            return queryset
+        return queryset.only(*rutas)
 
 
 # =============================================================================
 # SERIALIZERS DE AUTENTICACIÓN
 # =============================================================================
 
-class NegocioSerializer(serializers.ModelSerializer):
+class NegocioSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     logo_url = serializers.SerializerMethodField()
     
     class Meta:
         model = Negocio
         fields = ['id', 'nombre', 'address', 'logo_url', 'logo_width', 'logo_height', 'theme_colors']
+        campos_modelo = {
+            'logo_url': ['logo'],
+        }
     
     def get_logo_url(self, obj):
         if obj.logo:
@@ -24,7 +101,20 @@ class NegocioSerializer(serializers.ModelSerializer):
             return obj.logo.url
         return None
 
-class UsuarioSerializer(serializers.ModelSerializer):
+class TelefonoUnicoMixin:
+    """
+    Si otro usuario toma el teléfono entre la validación y el guardado,
+    Usuario.save() lo informa con ValidationError: se responde 400, no 500.
+    """
+
+    def save(self, **kwargs):
+        try:
+            return super().save(**kwargs)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
+
+
+class UsuarioSerializer(TelefonoUnicoMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
     class Meta:
@@ -38,6 +128,15 @@ class UsuarioSerializer(serializers.ModelSerializer):
             'password': {'write_only': True},
         }
 
+    def validate_phone_number(self, value):
+        """Validar que el teléfono no pertenezca a otro usuario (en cualquier formato)"""
+        # Sin cambios no se valida: los duplicados previos a phone_e164 pueden editar el resto del perfil
+        if self.instance is not None and value == self.instance.phone_number:
+            return value
+        if telefono_registrado(value, excluir_usuario_id=getattr(self.instance, 'id', None)):
+            raise serializers.ValidationError('El número de teléfono ya está registrado')
+        return value
+
     def create(self, validated_data):
         password = validated_data.pop('password')
         user = Usuario.objects.create_user(**validated_data)
@@ -71,7 +170,7 @@ class UsuarioLoginSerializer(UsuarioSerializer):
 
 
 
-class RegistroSerializer(serializers.ModelSerializer):
+class RegistroSerializer(TelefonoUnicoMixin, serializers.ModelSerializer):
     """
     Serializer para registro de nuevos clientes.
     Solo permite crear clientes (no administradores ni profesionales).
@@ -96,6 +195,12 @@ class RegistroSerializer(serializers.ModelSerializer):
         """Normalizar username a minúsculas"""
         return value.lower()
     
+    def validate_phone_number(self, value):
+        """Validar que el teléfono no esté registrado (en cualquier formato)"""
+        if telefono_registrado(value):
+            raise serializers.ValidationError('El número de teléfono ya está registrado')
+        return value
+    
     def create(self, validated_data):
         """Crear un nuevo cliente"""
         validated_data.pop('password_confirm')
@@ -155,9 +260,14 @@ class BotRegistroSerializer(serializers.Serializer):
     name = serializers.CharField(max_length=200, required=True)
     negocio_id = serializers.IntegerField(required=True)
     
+    # Reintentos si un registro concurrente gana la carrera por el mismo username
+    INTENTOS_USERNAME = 3
+    
     def validate_phone(self, value):
-        """Validar que el teléfono no esté registrado"""
-        if Usuario.objects.filter(phone_number=value).exists():
+        """Validar que el teléfono sea válido y no esté registrado (en cualquier formato)"""
+        if not normalizar_telefono(value):
+            raise serializers.ValidationError('El número de teléfono no es válido')
+        if telefono_registrado(value):
             raise serializers.ValidationError('El número de teléfono ya está registrado')
         return value
     
@@ -198,24 +308,37 @@ class BotRegistroSerializer(serializers.Serializer):
             if unicodedata.category(c) != 'Mn'
         )
         
-        # Verificar si el username está disponible
-        username = base_username
-        contador = 1
+        return self._siguiente_username_libre(base_username)
+    
+    @staticmethod
+    def _siguiente_username_libre(base_username):
+        """
+        Devuelve `base_username` si está libre o `base_username` + (mayor sufijo + 1).
         
-        while Usuario.objects.filter(username=username).exists():
-            username = f"{base_username}{contador}"
-            contador += 1
+        Una sola query sobre el prefijo (usa el índice único de username), sin
+        importar cuántos "jperez", "jperez1", ... existan.
+        """
+        from django.db.models import Case, Count, IntegerField, Max, Q, When
+        from django.db.models.functions import Cast, Substr
         
-        return username
+        # El CASE garantiza que solo se castean sufijos numéricos ("jperez12", no "jperezz")
+        # y de hasta 9 dígitos: entran en un integer de PostgreSQL (un "juan12345678901"
+        # no puede romper el registro de todos los "juan")
+        ocupados = Usuario.objects.filter(username__startswith=base_username).aggregate(
+            base_tomado=Count('id', filter=Q(username=base_username)),
+            max_sufijo=Max(Case(When(
+                username__regex=rf'^{re.escape(base_username)}[0-9]{{1,9}}$',
+                then=Cast(Substr('username', len(base_username) + 1), IntegerField()),
+            ))),
+        )
+        if not ocupados['base_tomado']:
+            return base_username
+        return f"{base_username}{(ocupados['max_sufijo'] or 0) + 1}"
     
     def create(self, validated_data):
         """
         Crear usuario con username y password generados automáticamente.
         """
-        from django.db import transaction
-        from .models import Membership, Negocio
-        from core.utils.email_utils import enviar_email_bienvenida_usuario
-        
         phone = validated_data['phone']
         email = validated_data['email']
         name = validated_data['name']
@@ -226,49 +349,66 @@ class BotRegistroSerializer(serializers.Serializer):
         first_name = partes_nombre[0] if len(partes_nombre) > 0 else ''
         last_name = ' '.join(partes_nombre[1:]) if len(partes_nombre) > 1 else ''
         
-        # Generar username y password
-        username = self._generar_username(name)
+        # Generar password (el username se asigna al insertar, ver abajo)
         password = Usuario.objects.make_random_password(length=10)
         
         try:
-            with transaction.atomic():
-                # Crear el usuario
-                user = Usuario.objects.create_user(
-                    username=username,
-                    email=email,
-                    first_name=first_name,
-                    last_name=last_name,
-                    phone_number=phone,
-                    password=password
-                )
-                
-                # Obtener el negocio
-                negocio = Negocio.objects.get(id=negocio_id)
-                
-                # Crear membership como cliente
-                Membership.objects.create(
-                    user=user,
-                    negocio=negocio,
-                    rol=Membership.Roles.CLIENTE,
-                    is_active=True
-                )
-                
-                # Enviar email con las credenciales usando email_utils
+            for intento in range(self.INTENTOS_USERNAME):
+                username = self._generar_username(name)
                 try:
-                    enviar_email_bienvenida_usuario(user, password, negocio)
-                except Exception as e:
-                    # Si falla el envío del email, loguear pero no fallar la transacción
-                    print(f"Error al enviar email de bienvenida: {str(e)}")
-                
-                return {
-                    'user_id': user.id,
-                    'username': username,
-                    'first_name': first_name,
-                    'email': email
-                }
-                
+                    return self._crear_usuario(
+                        username, password, email, first_name, last_name, phone, negocio_id
+                    )
+                except IntegrityError:
+                    # Otro registro concurrente tomó el mismo username: recalcular
+                    if intento == self.INTENTOS_USERNAME - 1:
+                        raise
         except Exception as e:
             raise serializers.ValidationError(f'Error al crear el usuario: {str(e)}')
+    
+    def _crear_usuario(self, username, password, email, first_name, last_name, phone, negocio_id):
+        """
+        Crea usuario, membership de cliente y email de bienvenida en una transacción.
+        
+        Raises:
+            IntegrityError: si el username ya fue tomado (el caller reintenta)
+        """
+        from django.db import transaction
+        from .models import Membership, Negocio
+        from core.services.outbox import encolar_email_bienvenida_usuario
+        
+        with transaction.atomic():
+            # Crear el usuario
+            user = Usuario.objects.create_user(
+                username=username,
+                email=email,
+                first_name=first_name,
+                last_name=last_name,
+                phone_number=phone,
+                password=password
+            )
+            
+            # Obtener el negocio
+            negocio = Negocio.objects.get(id=negocio_id)
+            
+            # Crear membership como cliente
+            Membership.objects.create(
+                user=user,
+                negocio=negocio,
+                rol=Membership.Roles.CLIENTE,
+                is_active=True
+            )
+            
+            # Encolar email con las credenciales en la misma transacción;
+            # lo envía el worker (manage.py run_email_worker) fuera del request
+            encolar_email_bienvenida_usuario(user, password, negocio)
+            
+            return {
+                'user_id': user.id,
+                'username': username,
+                'first_name': first_name,
+                'email': email
+            }
 
 
 # =============================================================================
@@ -503,7 +643,7 @@ class DisponibilidadConsultaSerializer(serializers.Serializer):
         return value
 
 
-class MisTurnosSerializer(serializers.ModelSerializer):
+class MisTurnosSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Serializer optimizado para mostrar los turnos del usuario.
     Incluye toda la información necesaria para la app móvil.
@@ -531,6 +671,19 @@ class MisTurnosSerializer(serializers.ModelSerializer):
             'servicio_name', 'servicio_description', 'servicio_price', 'servicio_duration',
             'fecha', 'hora_inicio', 'hora_fin', 'puede_cancelar'
         ]
+        campos_modelo = {
+            'profesional_name': ['profesional__user__first_name', 'profesional__user__last_name'],
+            'profesional_bio': ['profesional__bio'],
+            'profesional_photo': ['profesional__user__profile_picture_url'],
+            'servicio_name': ['servicio__name'],
+            'servicio_description': ['servicio__description'],
+            'servicio_price': ['servicio__price'],
+            'servicio_duration': ['servicio__duration_minutes'],
+            'fecha': ['start_datetime'],
+            'hora_inicio': ['start_datetime'],
+            'hora_fin': ['end_datetime'],
+            'puede_cancelar': ['status', 'start_datetime'],
+        }
     
     def get_fecha(self, obj):
         """Devolver fecha en formato legible"""
@@ -571,6 +724,12 @@ class HorarioDisponibilidadSerializer(serializers.ModelSerializer):
         fields = ['id', 'day_of_week', 'start_time', 'end_time', 'is_recurring', 'profesional']
         read_only_fields = ['profesional']
 
+    def validate(self, data):
+        # Igual que el CheckConstraint check_time_valid, pero como error 400 y no 500
+        if data['end_time'] <= data['start_time']:
+            raise serializers.ValidationError({'end_time': 'La hora de fin debe ser posterior a la de inicio'})
+        return data
+
     def create(self, validated_data):
         profesional = self.context.get('profesional')
         negocio = profesional.negocio  # Asume que el profesional tiene un campo negocio
@@ -1,13 +1,29 @@
+from .analiticas import obtener_analiticas, recalcular_rollups
 from .memberships import (
     sync_profesional_profile,
     add_user_to_negocio,
     get_profesional_profile,
     get_user_negocios
 )
+from .negocios import buscar_negocios
+from .outbox import encolar_email_confirmacion_turno, encolar_email_bienvenida_usuario, encolar_emails_turnos
+from .turnos import completar_turnos, cancelar_turnos, reasignar_turnos
+from .usuarios import resolver_usuario_por_telefono, telefono_registrado
 
 __all__ = [
+    'obtener_analiticas',
+    'recalcular_rollups',
     'sync_profesional_profile',
     'add_user_to_negocio',
     'get_profesional_profile',
-    'get_user_negocios'
+    'get_user_negocios',
+    'buscar_negocios',
+    'encolar_email_confirmacion_turno',
+    'encolar_email_bienvenida_usuario',
+    'encolar_emails_turnos',
+    'completar_turnos',
+    'cancelar_turnos',
+    'reasignar_turnos',
+    'resolver_usuario_por_telefono',
+    'telefono_registrado'
 ]
\ No newline at end of file
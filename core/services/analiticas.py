@@ -0,0 +1,239 @@
+"""
+Analíticas de ingresos, ocupación y cancelaciones de un negocio.
+
+Se leen de `TurnoRollupDiario` (una fila por día, profesional y servicio), no
+de `turno`: un rango de varios meses son unas pocas miles de filas agregadas.
+
+El rollup se mantiene así:
+- cada cambio de un turno recalcula su día al confirmar la transacción
+  (señales en core/models.py; las acciones masivas llaman acá directamente);
+- `manage.py reconciliar_rollups` recalcula cada noche una ventana de días y
+  corrige cualquier diferencia (por ejemplo, un `.update()` que no avisó).
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate, TruncWeek
+
+from core.models import HorarioDisponibilidad, Negocio, Turno, TurnoRollupDiario
+
+AGRUPACIONES_ANALITICAS = ('profesional', 'servicio', 'semana')
+MAX_DIAS_ANALITICAS = 731
+
+CAMPOS_ROLLUP = ('total', 'pendientes', 'confirmados', 'completados', 'cancelados', 'minutos_ocupados', 'ingresos')
+ESTADOS_QUE_OCUPAN = ('pendiente', 'confirmado', 'completado')
+
+
+# =============================================================================
+# MANTENIMIENTO DEL ROLLUP
+# =============================================================================
+
+def programar_recalculo_rollup(dias) -> None:
+    """
+    Recalcula los días (negocio_id, fecha) cuando la transacción actual se confirme.
+
+    Fuera de una transacción, on_commit ejecuta en el momento.
+    """
+    dias = set(dias)
+    transaction.on_commit(lambda: recalcular_dias(dias))
+
+
+def recalcular_dias(dias) -> None:
+    for negocio_id, fecha in sorted(dias):
+        recalcular_rollups(fecha, fecha, negocio_id=negocio_id)
+
+
+def recalcular_rollups(desde: date, hasta: date, negocio_id: int = None) -> dict:
+    """
+    Recalcula el rollup de [desde, hasta] (inclusive) a partir de la tabla turno.
+
+    Una query de agregación por negocio para todo el rango; solo se escriben
+    las filas que cambiaron. Sin negocio_id recorre todos los negocios.
+
+    Returns:
+        dict: {'filas': int, 'corregidas': int, 'borradas': int}
+    """
+    if negocio_id is None:
+        resultado = {'filas': 0, 'corregidas': 0, 'borradas': 0}
+        for id_negocio in Negocio.objects.order_by('id').values_list('id', flat=True):
+            for clave, cantidad in recalcular_rollups(desde, hasta, negocio_id=id_negocio).items():
+                resultado[clave] += cantidad
+        return resultado
+
+    turnos = Turno.objects.filter(
+        negocio_id=negocio_id,
+        start_datetime__gte=datetime.combine(desde, time.min),
+        start_datetime__lt=datetime.combine(hasta + timedelta(days=1), time.min),
+    )
+    rollups = TurnoRollupDiario.objects.filter(negocio_id=negocio_id, fecha__gte=desde, fecha__lte=hasta)
+
+    # Leer, agregar y escribir con los días bloqueados: dos recálculos del mismo
+    # día (turnos confirmados casi a la vez) no pueden pisar uno nuevo con uno viejo
+    with transaction.atomic():
+        _bloquear_dias(negocio_id, desde, hasta)
+
+        calculados = {}
+        for fila in (
+            turnos.annotate(fecha=TruncDate('start_datetime'))
+            .values('negocio_id', 'fecha', 'profesional_id', 'servicio_id')
+            .annotate(
+                total=Count('id'),
+                pendientes=Count('id', filter=Q(status='pendiente')),
+                confirmados=Count('id', filter=Q(status='confirmado')),
+                completados=Count('id', filter=Q(status='completado')),
+                cancelados=Count('id', filter=Q(status='cancelado')),
+                minutos_ocupados=Sum('servicio__duration_minutes', filter=Q(status__in=ESTADOS_QUE_OCUPAN)),
+                ingresos=Sum('servicio__price', filter=Q(status='completado')),
+            )
+            .order_by()
+        ):
+            fila['minutos_ocupados'] = fila['minutos_ocupados'] or 0
+            fila['ingresos'] = fila['ingresos'] or Decimal('0')
+            clave = (fila['negocio_id'], fila['fecha'], fila['profesional_id'], fila['servicio_id'])
+            calculados[clave] = fila
+
+        guardados = {
+            (r['negocio_id'], r['fecha'], r['profesional_id'], r['servicio_id']): r
+            for r in rollups.values('id', 'negocio_id', 'fecha', 'profesional_id', 'servicio_id', *CAMPOS_ROLLUP)
+        }
+        a_borrar = [r['id'] for clave, r in guardados.items() if clave not in calculados]
+        a_escribir = [
+            TurnoRollupDiario(**fila)
+            for clave, fila in calculados.items()
+            if clave not in guardados or any(guardados[clave][c] != fila[c] for c in CAMPOS_ROLLUP)
+        ]
+        if a_borrar:
+            TurnoRollupDiario.objects.filter(id__in=a_borrar).delete()
+        if a_escribir:
+            TurnoRollupDiario.objects.bulk_create(
+                a_escribir,
+                update_conflicts=True,
+                unique_fields=['negocio', 'fecha', 'profesional', 'servicio'],
+                update_fields=[*CAMPOS_ROLLUP, 'updated_at'],
+            )
+
+    return {'filas': len(calculados), 'corregidas': len(a_escribir), 'borradas': len(a_borrar)}
+
+
+def _bloquear_dias(negocio_id: int, desde: date, hasta: date) -> None:
+    """
+    Toma pg_advisory_xact_lock(negocio_id, día) para cada día del rango, en
+    orden (sin deadlocks entre rangos superpuestos); se liberan con la transacción.
+    En otros motores no hace nada.
+    """
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(%s::int, dia) FROM generate_series(%s::int, %s::int) AS dia ORDER BY dia",
+            [negocio_id, desde.toordinal(), hasta.toordinal()],
+        )
+
+
+# =============================================================================
+# CONSULTA
+# =============================================================================
+
+def obtener_analiticas(negocio: Negocio, desde: date, hasta: date, agrupar: str) -> dict:
+    """
+    Ingresos, ocupación y cancelaciones del negocio en [desde, hasta], agrupados.
+
+    Ocupación = minutos ocupados / minutos de agenda según los horarios
+    recurrentes actuales de cada profesional (no descuenta bloqueos). No
+    aplica al agrupar por servicio.
+
+    Returns:
+        dict: {'totales': {...}, 'resultados': [{...}, ...]}
+    """
+    rollups = TurnoRollupDiario.objects.filter(negocio=negocio, fecha__gte=desde, fecha__lte=hasta)
+    sumas = {campo: Sum(campo) for campo in ('total', 'completados', 'cancelados', 'minutos_ocupados', 'ingresos')}
+
+    if agrupar == 'profesional':
+        filas = rollups.values(
+            'profesional_id', 'profesional__user__first_name', 'profesional__user__last_name'
+        ).annotate(**sumas).order_by('profesional__user__first_name', 'profesional_id')
+    elif agrupar == 'servicio':
+        filas = rollups.values('servicio_id', 'servicio__name').annotate(**sumas).order_by('servicio__name')
+    elif agrupar == 'semana':
+        filas = rollups.annotate(semana=TruncWeek('fecha')).values('semana').annotate(**sumas).order_by('semana')
+    else:
+        raise ValueError(f"Agrupación desconocida: {agrupar}")
+
+    minutos_por_dia = _minutos_de_agenda_por_dia(negocio)
+    resultados = []
+    for fila in filas:
+        if agrupar == 'profesional':
+            grupo = {
+                'profesional_id': fila['profesional_id'],
+                'profesional': f"{fila['profesional__user__first_name']} {fila['profesional__user__last_name']}".strip(),
+            }
+            disponibles = _minutos_disponibles(minutos_por_dia, desde, hasta, [fila['profesional_id']])
+        elif agrupar == 'servicio':
+            grupo = {'servicio_id': fila['servicio_id'], 'servicio': fila['servicio__name']}
+            disponibles = None
+        else:
+            inicio_semana = fila['semana'].date() if isinstance(fila['semana'], datetime) else fila['semana']
+            grupo = {'semana': inicio_semana.isoformat()}
+            disponibles = _minutos_disponibles(
+                minutos_por_dia, max(desde, inicio_semana), min(hasta, inicio_semana + timedelta(days=6))
+            )
+        resultados.append({**grupo, **_metricas(fila, disponibles)})
+
+    totales = rollups.aggregate(**sumas)
+    return {
+        'totales': _metricas(totales, _minutos_disponibles(minutos_por_dia, desde, hasta)),
+        'resultados': resultados,
+    }
+
+
+def _metricas(fila: dict, minutos_disponibles) -> dict:
+    total = fila['total'] or 0
+    cancelados = fila['cancelados'] or 0
+    ocupados = fila['minutos_ocupados'] or 0
+    metricas = {
+        'turnos': total,
+        'completados': fila['completados'] or 0,
+        'cancelados': cancelados,
+        'tasa_cancelacion': round(cancelados / total, 4) if total else 0.0,
+        'ingresos': str(Decimal(fila['ingresos'] or 0).quantize(Decimal('0.01'))),
+        'minutos_ocupados': ocupados,
+    }
+    if minutos_disponibles is not None:
+        metricas['minutos_disponibles'] = minutos_disponibles
+        metricas['ocupacion'] = round(ocupados / minutos_disponibles, 4) if minutos_disponibles else None
+    return metricas
+
+
+def _minutos_de_agenda_por_dia(negocio: Negocio) -> dict:
+    """
+    Returns:
+        dict: {profesional_id: {day_of_week: minutos}}
+    """
+    minutos = defaultdict(lambda: defaultdict(int))
+    for horario in HorarioDisponibilidad.objects.filter(
+        negocio=negocio, is_recurring=True
+    ).values('profesional_id', 'day_of_week', 'start_time', 'end_time'):
+        duracion = (
+            datetime.combine(date.min, horario['end_time']) - datetime.combine(date.min, horario['start_time'])
+        )
+        minutos[horario['profesional_id']][horario['day_of_week']] += int(duracion.total_seconds() // 60)
+    return minutos
+
+
+def _minutos_disponibles(minutos_por_dia: dict, desde: date, hasta: date, profesionales=None) -> int:
+    # Cuántas veces cae cada día de la semana en el rango
+    dias = (hasta - desde).days + 1
+    veces = [dias // 7] * 7
+    for i in range(dias % 7):
+        veces[(desde.weekday() + i) % 7] += 1
+
+    ids = minutos_por_dia.keys() if profesionales is None else profesionales
+    return sum(
+        minutos * veces[dia]
+        for profesional_id in ids
+        for dia, minutos in minutos_por_dia.get(profesional_id, {}).items()
+    )
@@ -0,0 +1,260 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import HorarioDisponibilidad, Profesional, Servicio, Turno
+
+# Límite de seguridad: no buscar disponibilidad más allá de esto
+MAX_DIAS_A_REVISAR = 60
+# Los turnos se traen por ventanas de días (una query por ventana, no por día)
+DIAS_POR_VENTANA = 14
+
+
+def proximos_dias_disponibles(profesional: Profesional, servicio: Servicio, fecha_desde: date, limite: int) -> list[dict]:
+    """
+    Busca los próximos `limite` días con al menos un slot libre para el servicio.
+
+    Hace una query para los horarios del profesional y una por cada ventana de
+    DIAS_POR_VENTANA días para los turnos ocupados (en el caso normal, una sola).
+
+    Returns:
+        list: [{'fecha': 'YYYY-MM-DD', 'nombre_dia': 'Tuesday', 'tiene_disponibilidad': True}, ...]
+    """
+    horarios_dict = _horarios_por_dia(_consulta_horarios(profesional))
+    fechas_disponibles = []
+    if not horarios_dict:
+        return fechas_disponibles
+
+    ahora = timezone.now()
+    for ventana_inicio, ventana_fin in _ventanas(fecha_desde):
+        turnos_por_dia = _turnos_por_dia(_consulta_turnos_ocupados(profesional, ventana_inicio, ventana_fin))
+        fechas_disponibles += _fechas_con_disponibilidad(
+            ventana_inicio, ventana_fin, horarios_dict, turnos_por_dia,
+            servicio.duration_minutes, ahora, limite - len(fechas_disponibles),
+        )
+        if len(fechas_disponibles) >= limite:
+            break
+    return fechas_disponibles
+
+
+async def aproximos_dias_disponibles(profesional: Profesional, servicio: Servicio, fecha_desde: date, limite: int) -> list[dict]:
+    """Versión async de proximos_dias_disponibles (mismas queries, ORM async)."""
+    horarios_dict = _horarios_por_dia([h async for h in _consulta_horarios(profesional)])
+    fechas_disponibles = []
+    if not horarios_dict:
+        return fechas_disponibles
+
+    ahora = timezone.now()
+    for ventana_inicio, ventana_fin in _ventanas(fecha_desde):
+        turnos = [t async for t in _consulta_turnos_ocupados(profesional, ventana_inicio, ventana_fin)]
+        fechas_disponibles += _fechas_con_disponibilidad(
+            ventana_inicio, ventana_fin, horarios_dict, _turnos_por_dia(turnos),
+            servicio.duration_minutes, ahora, limite - len(fechas_disponibles),
+        )
+        if len(fechas_disponibles) >= limite:
+            break
+    return fechas_disponibles
+
+
+def slots_disponibles(fecha: date, horarios, ocupados, duracion_servicio: int, ahora: datetime) -> list[dict]:
+    """
+    Slots libres de un día, cada 30 minutos (lo que devuelve consultar_disponibilidad).
+
+    Args:
+        horarios: [(start_time, end_time), ...] del profesional ese día
+        ocupados: [(start_datetime, end_datetime), ...] turnos activos y bloqueos del día
+    """
+    slots = []
+    duracion = timedelta(minutes=duracion_servicio)
+    # Si es hoy, los slots deben empezar al menos 1 hora después de ahora
+    es_hoy = fecha == ahora.date()
+    hora_limite = (ahora + timedelta(hours=1)).time()
+
+    for hora_inicio, hora_fin in horarios:
+        slot_actual = datetime.combine(fecha, hora_inicio)
+        fin_horario = datetime.combine(fecha, hora_fin)
+        while slot_actual + duracion <= fin_horario:
+            slot_fin = slot_actual + duracion
+            libre = not (es_hoy and slot_actual.time() < hora_limite) and not any(
+                slot_actual < fin and slot_fin > inicio for inicio, fin in ocupados
+            )
+            if libre:
+                slots.append({
+                    'hora_inicio': slot_actual.time().strftime('%H:%M'),
+                    'hora_fin': slot_fin.time().strftime('%H:%M'),
+                    'disponible': True
+                })
+            slot_actual += timedelta(minutes=30)
+    return slots
+
+
+# Las consultas se arman acá y se recorren con for (sync) o async for (async)
+
+def _consulta_horarios(profesional: Profesional):
+    return HorarioDisponibilidad.objects.filter(
+        profesional=profesional,
+        negocio_id=profesional.negocio_id
+    ).values('day_of_week', 'start_time', 'end_time')
+
+
+def _consulta_turnos_ocupados(profesional: Profesional, desde: date, hasta: date):
+    return Turno.objects.filter(
+        profesional=profesional,
+        start_datetime__gte=datetime.combine(desde, datetime.min.time()),
+        start_datetime__lt=datetime.combine(hasta, datetime.min.time()),
+        status__in=['confirmado', 'pendiente'],
+        negocio_id=profesional.negocio_id
+    ).values('start_datetime', 'end_datetime')
+
+
+def _horarios_por_dia(horarios) -> dict:
+    horarios_dict = defaultdict(list)
+    for horario in horarios:
+        horarios_dict[horario['day_of_week']].append({
+            'start_time': horario['start_time'],
+            'end_time': horario['end_time']
+        })
+    return horarios_dict
+
+
+def _turnos_por_dia(turnos) -> dict:
+    turnos_por_dia = defaultdict(list)
+    for turno in turnos:
+        turnos_por_dia[turno['start_datetime'].date()].append(turno)
+    return turnos_por_dia
+
+
+def _ventanas(fecha_desde: date):
+    fecha_limite = fecha_desde + timedelta(days=MAX_DIAS_A_REVISAR)
+    ventana_inicio = fecha_desde
+    while ventana_inicio < fecha_limite:
+        ventana_fin = min(ventana_inicio + timedelta(days=DIAS_POR_VENTANA), fecha_limite)
+        yield ventana_inicio, ventana_fin
+        ventana_inicio = ventana_fin
+
+
+def _fechas_con_disponibilidad(desde, hasta, horarios_dict, turnos_por_dia, duracion_servicio, ahora, faltan) -> list[dict]:
+    fechas = []
+    fecha_actual = desde
+    while fecha_actual < hasta and len(fechas) < faltan:
+        if _dia_tiene_disponibilidad(
+            fecha_actual,
+            horarios_dict.get(fecha_actual.weekday()),
+            turnos_por_dia.get(fecha_actual, []),
+            duracion_servicio,
+            ahora,
+        ):
+            fechas.append({
+                'fecha': fecha_actual.strftime('%Y-%m-%d'),
+                'nombre_dia': fecha_actual.strftime('%A'),
+                'tiene_disponibilidad': True
+            })
+        fecha_actual += timedelta(days=1)
+    return fechas
+
+
+def _dia_tiene_disponibilidad(fecha, horarios_del_dia, turnos_del_dia, duracion_servicio, ahora) -> bool:
+    """
+    Verifica si un día específico tiene al menos un slot disponible.
+    No calcula todos los slots: corta en el primero libre.
+    """
+    # Verificar si es día pasado
+    if fecha < ahora.date():
+        return False
+
+    # Verificar si el profesional trabaja este día
+    if not horarios_del_dia:
+        return False
+
+    # Si es hoy, los slots deben empezar al menos 1 hora después de ahora
+    es_hoy = fecha == ahora.date()
+    hora_limite = (ahora + timedelta(hours=1)).time()
+    if es_hoy and not any(horario['end_time'] > hora_limite for horario in horarios_del_dia):
+        return False
+
+    for horario in horarios_del_dia:
+        hora_inicio = datetime.combine(fecha, horario['start_time'])
+        hora_fin = datetime.combine(fecha, horario['end_time'])
+
+        # Generar slots cada 30 minutos
+        slot_actual = hora_inicio
+        while slot_actual + timedelta(minutes=duracion_servicio) <= hora_fin:
+            slot_fin = slot_actual + timedelta(minutes=duracion_servicio)
+
+            if es_hoy and slot_actual.time() < hora_limite:
+                slot_actual += timedelta(minutes=30)
+                continue
+
+            hay_conflicto = any(
+                slot_actual < turno['end_datetime'] and slot_fin > turno['start_datetime']
+                for turno in turnos_del_dia
+            )
+            # Si encontramos UN slot libre, el día tiene disponibilidad
+            if not hay_conflicto:
+                return True
+
+            slot_actual += timedelta(minutes=30)
+
+    return False
+
+
+def reemplazar_horarios(profesional: Profesional, horarios: list[dict]) -> dict:
+    """
+    Deja la agenda semanal del profesional igual a `horarios` tocando solo lo que cambió.
+
+    Compara las franjas enviadas con las guardadas por (día, inicio, fin, recurrente):
+    borra en un DELETE las que ya no están, crea en un INSERT las nuevas y deja
+    intactas (mismo id) las que no cambiaron. Todo en una transacción.
+
+    Args:
+        horarios: dicts validados por HorarioDisponibilidadSerializer
+                  (day_of_week, start_time, end_time, is_recurring opcional)
+
+    Returns:
+        dict: {'horarios': [HorarioDisponibilidad, ...] en el orden enviado,
+               'creados': int, 'borrados': int}
+    """
+    deseados = {}
+    for horario in horarios:
+        clave = (horario['day_of_week'], horario['start_time'], horario['end_time'], horario.get('is_recurring', True))
+        deseados.setdefault(clave, horario)
+
+    with transaction.atomic():
+        actuales = {}
+        a_borrar = []
+        for horario in HorarioDisponibilidad.objects.select_for_update().filter(profesional=profesional).order_by('id'):
+            clave = (horario.day_of_week, horario.start_time, horario.end_time, horario.is_recurring)
+            # Las franjas con fechas o repetidas no vienen del PUT: se reemplazan
+            if clave in deseados and clave not in actuales and not (horario.start_date or horario.end_date):
+                actuales[clave] = horario
+            else:
+                a_borrar.append(horario)
+
+        nuevos = [
+            HorarioDisponibilidad(
+                profesional=profesional,
+                negocio=profesional.negocio,
+                day_of_week=clave[0],
+                start_time=clave[1],
+                end_time=clave[2],
+                is_recurring=clave[3],
+            )
+            for clave in deseados if clave not in actuales
+        ]
+
+        if a_borrar:
+            HorarioDisponibilidad.objects.filter(id__in=[h.id for h in a_borrar]).delete()
+        if nuevos:
+            # En PostgreSQL bulk_create devuelve los ids (RETURNING)
+            HorarioDisponibilidad.objects.bulk_create(nuevos)
+
+    por_clave = {**actuales, **{
+        (h.day_of_week, h.start_time, h.end_time, h.is_recurring): h for h in nuevos
+    }}
+    return {
+        'horarios': [por_clave[clave] for clave in deseados],
+        'creados': len(nuevos),
+        'borrados': len(a_borrar),
+    }
@@ -0,0 +1,290 @@
+"""
+Eventos de agenda en tiempo real (Server-Sent Events).
+
+El profesional se suscribe a /api/v1/reservas/agenda-profesional/eventos/ y
+recibe un evento cada vez que se confirma (commit) un turno nuevo, una
+cancelación, un turno completado o una reasignación en su agenda. Reemplaza
+el polling de AgendaProfesionalView / DiasConTurnosView.
+
+Los eventos llevan solo ids y horarios; el detalle se trae con la agenda o
+con el delta-sync (/reservas/sync/), que también cubre lo que se pierda
+mientras el cliente está desconectado.
+
+El broker se elige con AGENDA_EVENTOS_BROKER:
+- BrokerEnMemoria: un solo proceso ASGI (la request que crea el turno y la
+  conexión SSE tienen que caer en el mismo proceso);
+- BrokerRedis: varios workers o nodos, vía Redis pub/sub (REDIS_URL).
+
+Django 4.2 solo atiende http.disconnect mientras lee el body de la request:
+si el cliente corta el stream, nadie se entera y la suscripción seguiría viva
+hasta AGENDA_EVENTOS_DURACION_MAXIMA. DetectorDesconexionASGI (envuelve la app
+en barberia_project/asgi.py) escucha la desconexión por su cuenta, y cada
+proceso mantiene a lo sumo MAX_CONEXIONES_POR_PROFESIONAL conexiones por
+profesional (una nueva cierra la más vieja).
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+TURNO_CREADO = 'turno_creado'
+TURNO_CANCELADO = 'turno_cancelado'
+TURNO_COMPLETADO = 'turno_completado'
+TURNO_REASIGNADO = 'turno_reasignado'
+# El cliente perdió eventos (cola llena): tiene que volver a pedir la agenda
+RESINCRONIZAR = 'resincronizar'
+
+# Eventos pendientes por conexión antes de descartar y pedir resincronización
+MAX_EVENTOS_EN_COLA = 100
+# Comentario SSE cada N segundos sin eventos (proxies y balanceadores cortan conexiones mudas)
+KEEPALIVE_SEGUNDOS = 25
+# Espera sugerida al cliente (EventSource) antes de reconectar, en ms
+RECONEXION_MS = 3000
+# Conexiones abiertas por profesional en un proceso (varios dispositivos);
+# con una más se cierra la más vieja
+MAX_CONEXIONES_POR_PROFESIONAL = 5
+
+# Clave del scope ASGI con la que DetectorDesconexionASGI expone la desconexión
+CLAVE_SCOPE_DESCONEXION = 'ordema.desconexion'
+
+
+def evento_turno(tipo: str, turno) -> dict:
+    return {
+        'tipo': tipo,
+        'turno_id': turno.id,
+        'profesional_id': turno.profesional_id,
+        'status': turno.status,
+        'start_datetime': turno.start_datetime.isoformat(),
+        'end_datetime': turno.end_datetime.isoformat(),
+    }
+
+
+def programar_eventos(envios) -> None:
+    """
+    Publica los eventos cuando la transacción actual se confirme (fuera de una
+    transacción, en el momento).
+
+    Args:
+        envios: [(profesional_id, evento), ...]
+    """
+    envios = list(envios)
+    if not envios:
+        return
+
+    def publicar():
+        # Los eventos son un aviso: si el broker falla, el turno ya está guardado
+        # y el cliente lo verá en el próximo sync
+        try:
+            broker = obtener_broker()
+            for profesional_id, evento in envios:
+                broker.publicar(profesional_id, evento)
+        except Exception as e:
+            logger.error("[EVENTOS AGENDA] No se pudieron publicar %s eventos: %s", len(envios), e)
+
+    transaction.on_commit(publicar)
+
+
+async def mensajes_sse(suscripcion, duracion_maxima: int, desconexion=None):
+    """
+    Genera el stream text/event-stream de una suscripción y la cierra al terminar:
+    por duración máxima, porque el cliente se desconectó (`desconexion`, el
+    future de DetectorDesconexionASGI) o porque otra conexión del mismo
+    profesional la reemplazó.
+    """
+    loop = asyncio.get_running_loop()
+    fin = loop.time() + duracion_maxima
+    if desconexion is not None:
+        desconexion.add_done_callback(lambda _: suscripcion.terminar())
+    terminada = asyncio.ensure_future(suscripcion.terminada.wait())
+    try:
+        yield f"retry: {RECONEXION_MS}\n\n"
+        while (restante := fin - loop.time()) > 0 and not terminada.done():
+            proximo = asyncio.ensure_future(suscripcion.get())
+            await asyncio.wait(
+                {proximo, terminada}, timeout=min(KEEPALIVE_SEGUNDOS, restante),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not proximo.done():
+                proximo.cancel()
+                if not terminada.done():
+                    yield ": keepalive\n\n"
+                continue
+            evento = proximo.result()
+            yield f"event: {evento['tipo']}\ndata: {json.dumps(evento)}\n\n"
+    finally:
+        terminada.cancel()
+        await suscripcion.cerrar()
+
+
+class DetectorDesconexionASGI:
+    """
+    Middleware ASGI: avisa cuando el cliente corta la conexión.
+
+    Django 4.2 deja de llamar a `receive` después de leer el body, así que un
+    stream no se entera de la desconexión. Las vistas que lo necesitan llaman a
+    `request.scope[CLAVE_SCOPE_DESCONEXION]()` y obtienen un future que se
+    completa con el http.disconnect; el resto de las requests no paga nada.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        vigilante = None
+
+        def desconexion():
+            nonlocal vigilante
+            if vigilante is None:
+                vigilante = asyncio.ensure_future(self._esperar_desconexion(receive))
+            return vigilante
+
+        scope[CLAVE_SCOPE_DESCONEXION] = desconexion
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if vigilante is not None:
+                vigilante.cancel()
+
+    @staticmethod
+    async def _esperar_desconexion(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+
+@lru_cache(maxsize=None)
+def obtener_broker():
+    return import_string(settings.AGENDA_EVENTOS_BROKER)()
+
+
+# =============================================================================
+# BROKERS
+# =============================================================================
+
+# Suscripciones abiertas en este proceso, por profesional (en orden de apertura)
+_suscripciones_abiertas = defaultdict(list)
+
+
+class Suscripcion:
+    """Cola de eventos de una conexión SSE. `get()` espera el próximo evento."""
+
+    def __init__(self, profesional_id: int, al_cerrar=None):
+        self.cola = asyncio.Queue(maxsize=MAX_EVENTOS_EN_COLA)
+        self.loop = asyncio.get_running_loop()
+        self.desbordada = False
+        self.terminada = asyncio.Event()
+        self.profesional_id = profesional_id
+        self._al_cerrar = al_cerrar
+
+        abiertas = _suscripciones_abiertas[profesional_id]
+        abiertas.append(self)
+        for vieja in abiertas[:-MAX_CONEXIONES_POR_PROFESIONAL]:
+            vieja.terminar()
+
+    def entregar(self, evento: dict) -> None:
+        # Se llama en el loop de la conexión
+        try:
+            self.cola.put_nowait(evento)
+        except asyncio.QueueFull:
+            self.desbordada = True
+
+    async def get(self) -> dict:
+        if self.desbordada:
+            self.desbordada = False
+            while not self.cola.empty():
+                self.cola.get_nowait()
+            return {'tipo': RESINCRONIZAR}
+        return await self.cola.get()
+
+    def terminar(self) -> None:
+        """Pide cerrar el stream (cliente desconectado o reemplazada por una conexión nueva)."""
+        self.terminada.set()
+
+    async def cerrar(self) -> None:
+        abiertas = _suscripciones_abiertas.get(self.profesional_id, [])
+        if self in abiertas:
+            abiertas.remove(self)
+        if not abiertas:
+            _suscripciones_abiertas.pop(self.profesional_id, None)
+        if self._al_cerrar:
+            await self._al_cerrar()
+
+
+class BrokerEnMemoria:
+    """
+    Suscripciones en memoria del proceso.
+
+    `publicar` se llama desde vistas sync (otro hilo): la entrega se pasa al
+    loop de cada conexión con call_soon_threadsafe.
+    """
+
+    def __init__(self):
+        self._suscripciones = {}
+        self._lock = threading.Lock()
+
+    def publicar(self, profesional_id: int, evento: dict) -> None:
+        with self._lock:
+            suscripciones = list(self._suscripciones.get(profesional_id, ()))
+        for suscripcion in suscripciones:
+            suscripcion.loop.call_soon_threadsafe(suscripcion.entregar, evento)
+
+    async def suscribir(self, profesional_id: int) -> Suscripcion:
+        async def cerrar():
+            with self._lock:
+                activas = self._suscripciones.get(profesional_id, set())
+                activas.discard(suscripcion)
+                if not activas:
+                    self._suscripciones.pop(profesional_id, None)
+
+        suscripcion = Suscripcion(profesional_id, al_cerrar=cerrar)
+        with self._lock:
+            self._suscripciones.setdefault(profesional_id, set()).add(suscripcion)
+        return suscripcion
+
+
+class BrokerRedis:
+    """Redis pub/sub: un canal por profesional, compartido por todos los workers."""
+
+    def __init__(self):
+        import redis
+
+        self._url = settings.REDIS_URL
+        self._cliente = redis.Redis.from_url(self._url)
+
+    def _canal(self, profesional_id: int) -> str:
+        return f"agenda:{profesional_id}"
+
+    def publicar(self, profesional_id: int, evento: dict) -> None:
+        self._cliente.publish(self._canal(profesional_id), json.dumps(evento))
+
+    async def suscribir(self, profesional_id: int) -> Suscripcion:
+        import redis.asyncio
+
+        cliente = redis.asyncio.Redis.from_url(self._url)
+        pubsub = cliente.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self._canal(profesional_id))
+
+        async def leer():
+            async for mensaje in pubsub.listen():
+                suscripcion.entregar(json.loads(mensaje['data']))
+
+        async def cerrar():
+            lector.cancel()
+            await pubsub.unsubscribe()
+            await pubsub.close()
+            await cliente.close()
+
+        suscripcion = Suscripcion(profesional_id, al_cerrar=cerrar)
+        lector = asyncio.ensure_future(leer())
+        return suscripcion
@@ -0,0 +1,136 @@
+"""
+Exportación del historial de turnos de un negocio (CSV o JSON Lines).
+
+Las filas salen de `.values().iterator(chunk_size=...)`: no se instancian
+modelos ni se carga el resultado completo en memoria, así que exportar
+millones de turnos usa memoria constante y el primer byte sale enseguida.
+"""
+
+from datetime import date, datetime, time, timedelta
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.models import Negocio, Turno
+
+FORMATOS_EXPORTACION = ('csv', 'jsonl')
+CONTENT_TYPES_EXPORTACION = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+# Filas por viaje a la base (server-side cursor en PostgreSQL)
+CHUNK_SIZE_EXPORTACION = 2000
+# Las líneas se agrupan en bloques de ~64 KB: una escritura al socket por bloque, no por turno
+BLOQUE_EXPORTACION = 64 * 1024
+
+# Columnas exportadas (nombre, lookup), en orden. `precio` y `duracion_minutos`
+# son los valores actuales del servicio (el turno no guarda el precio cobrado).
+COLUMNAS_EXPORTACION = (
+    ('id', 'id'),
+    ('fecha_inicio', 'start_datetime'),
+    ('fecha_fin', 'end_datetime'),
+    ('estado', 'status'),
+    ('cliente_id', 'cliente_id'),
+    ('cliente_username', 'cliente__username'),
+    ('cliente_nombre', 'cliente__first_name'),
+    ('cliente_apellido', 'cliente__last_name'),
+    ('cliente_email', 'cliente__email'),
+    ('cliente_telefono', 'cliente__phone_number'),
+    ('profesional_id', 'profesional_id'),
+    ('profesional_nombre', 'profesional__user__first_name'),
+    ('profesional_apellido', 'profesional__user__last_name'),
+    ('servicio_id', 'servicio_id'),
+    ('servicio', 'servicio__name'),
+    ('duracion_minutos', 'servicio__duration_minutes'),
+    ('precio', 'servicio__price'),
+    ('notas', 'notes'),
+    ('creado', 'created_at'),
+)
+NOMBRES_COLUMNAS = tuple(nombre for nombre, _ in COLUMNAS_EXPORTACION)
+
+# El CSV se abre en planillas de cálculo: un texto que empieza con estos
+# caracteres se ejecuta como fórmula (CSV injection). Nombres y notas vienen
+# de usuarios finales (bot / app), así que en CSV se les antepone una comilla.
+INICIOS_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+
+def filas_turnos(negocio: Negocio, desde: date = None, hasta: date = None, chunk_size: int = CHUNK_SIZE_EXPORTACION):
+    """
+    Itera los turnos del negocio como tuplas (en el orden de NOMBRES_COLUMNAS),
+    ordenados por fecha de inicio.
+
+    Args:
+        desde: Primer día incluido (opcional)
+        hasta: Último día incluido (opcional)
+    """
+    turnos = Turno.objects.filter(negocio=negocio)
+    if desde:
+        turnos = turnos.filter(start_datetime__gte=datetime.combine(desde, time.min))
+    if hasta:
+        turnos = turnos.filter(start_datetime__lt=datetime.combine(hasta + timedelta(days=1), time.min))
+
+    return (
+        turnos.order_by('start_datetime', 'id')
+        .values_list(*(lookup for _, lookup in COLUMNAS_EXPORTACION))
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def exportar_turnos(filas, formato: str):
+    """
+    Serializa las filas (una línea por turno, más el encabezado en CSV).
+
+    Devuelve un generador de bloques de texto, pensado para StreamingHttpResponse
+    o para escribir a un archivo.
+    """
+    if formato == 'csv':
+        return _en_bloques(_lineas_csv(filas))
+    if formato == 'jsonl':
+        return _en_bloques(_lineas_jsonl(filas))
+    raise ValueError(f"Formato de exportación desconocido: {formato}")
+
+
+def _en_bloques(lineas):
+    bloque = []
+    tamaño = 0
+    for linea in lineas:
+        bloque.append(linea)
+        tamaño += len(linea)
+        if tamaño >= BLOQUE_EXPORTACION:
+            yield ''.join(bloque)
+            bloque = []
+            tamaño = 0
+    if bloque:
+        yield ''.join(bloque)
+
+
+class _Eco:
+    """Pseudo-archivo para csv.writer: devuelve la línea en lugar de guardarla."""
+
+    def write(self, valor):
+        return valor
+
+
+def _lineas_csv(filas):
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(NOMBRES_COLUMNAS)
+    for fila in filas:
+        yield escritor.writerow(_a_texto(valor) for valor in fila)
+
+
+def _lineas_jsonl(filas):
+    for fila in filas:
+        yield json.dumps(dict(zip(NOMBRES_COLUMNAS, fila)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def _a_texto(valor):
+    # Solo para CSV: JSON Lines exporta los valores tal cual
+    if valor is None:
+        return ''
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    if isinstance(valor, str) and valor.startswith(INICIOS_FORMULA):
+        return "'" + valor
+    return valor
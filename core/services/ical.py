@@ -0,0 +1,181 @@
+"""
+Feed iCalendar de suscripción por profesional (/ical/<token>.ics).
+
+Los clientes de calendario (Google, Apple, Outlook) consultan el feed cada
+pocos minutos, así que:
+- la validación (ETag / Last-Modified) sale de un solo aggregate, sin armar el feed;
+- cada VEVENT se serializa una vez por versión y queda en cache.
+
+La versión de un VEVENT es el último `updated_at` entre el turno y lo que se
+muestra de sus relaciones (servicio, cliente, negocio): renombrar un servicio
+o cambiar el teléfono de un cliente cambia el ETag y el fragmento.
+"""
+
+import hashlib
+import secrets
+from datetime import timedelta, timezone as dt_timezone
+from typing import Optional
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from icalendar import Calendar, Event
+
+from core.models import Profesional, Turno
+
+# Ventana móvil del feed: un mes hacia atrás y tres hacia adelante
+VENTANA_PASADO = timedelta(days=30)
+VENTANA_FUTURO = timedelta(days=90)
+
+# Los fragmentos se indexan por (turno, versión): una versión vieja nunca se
+# vuelve a pedir, el TTL solo libera memoria.
+VEVENT_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# Los turnos cancelados salen del feed (el calendario del suscriptor los borra)
+ESTADOS_EXCLUIDOS = ('cancelado',)
+
+
+def generar_token_ical() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def obtener_token_ical(profesional: Profesional, rotar: bool = False) -> str:
+    """
+    Devuelve el token del feed del profesional, creándolo si no existe.
+
+    Con `rotar=True` genera uno nuevo e invalida el enlace anterior.
+    """
+    if rotar or not profesional.ical_token:
+        profesional.ical_token = generar_token_ical()
+        profesional.save(update_fields=['ical_token', 'updated_at'])
+    return profesional.ical_token
+
+
+def _ventana(ahora=None):
+    ahora = ahora or timezone.now()
+    inicio = (ahora - VENTANA_PASADO).replace(hour=0, minute=0, second=0, microsecond=0)
+    return inicio, inicio + VENTANA_PASADO + VENTANA_FUTURO
+
+
+def _turnos_ventana(profesional: Profesional, inicio, fin):
+    return Turno.objects.filter(
+        profesional=profesional,
+        start_datetime__gte=inicio,
+        start_datetime__lt=fin,
+    ).exclude(status__in=ESTADOS_EXCLUIDOS)
+
+
+def _version_vevent():
+    # Todo lo que _serializar_vevent lee de otras tablas
+    return Greatest('updated_at', 'servicio__updated_at', 'cliente__updated_at', 'negocio__updated_at')
+
+
+def version_feed(profesional: Profesional) -> tuple[str, Optional[object]]:
+    """
+    Calcula la versión del feed sin serializarlo.
+
+    El ETag cubre el último cambio de los turnos del feed y de lo que muestran
+    (servicio, cliente, negocio), la cantidad de turnos (detecta borrados y
+    cancelaciones), el nombre del calendario (negocio y usuario del
+    profesional) y el inicio de la ventana (detecta el corrimiento diario).
+
+    `profesional` debe venir con select_related('user', 'negocio').
+
+    Returns:
+        tuple: (etag: str, last_modified: datetime | None)
+    """
+    inicio, fin = _ventana()
+    resumen = _turnos_ventana(profesional, inicio, fin).aggregate(
+        ultimo_cambio=Max(_version_vevent()),
+        total=Count('id'),
+    )
+    ultimo_cambio = max(
+        filter(None, (resumen['ultimo_cambio'], profesional.user.updated_at, profesional.negocio.updated_at)),
+        default=None,
+    )
+    crudo = f"{profesional.id}|{inicio.date().isoformat()}|{ultimo_cambio.isoformat() if ultimo_cambio else ''}|{resumen['total']}"
+    return hashlib.sha256(crudo.encode()).hexdigest(), ultimo_cambio
+
+
+def _clave_vevent(turno) -> str:
+    return f"ical:vevent:{turno.id}:{turno.version_vevent.timestamp()}"
+
+
+def _serializar_vevent(turno) -> bytes:
+    event = Event()
+    cliente = turno.cliente.get_full_name() or turno.cliente.username
+    event.add('summary', f'{turno.servicio.name} - {cliente}')
+
+    descripcion = f"Cliente: {cliente}"
+    if turno.cliente.phone_number:
+        descripcion += f"\nTeléfono: {turno.cliente.phone_number}"
+    descripcion += f"\nDuración: {turno.servicio.duration_minutes} minutos"
+    if turno.notes:
+        descripcion += f"\n\n{turno.notes}"
+    event.add('description', descripcion)
+
+    # Fechas (sin timezone ya que USE_TZ = False en settings)
+    event.add('dtstart', turno.start_datetime)
+    event.add('dtend', turno.end_datetime)
+
+    if turno.negocio.address:
+        event.add('location', f'{turno.negocio.nombre}, {turno.negocio.address}')
+    else:
+        event.add('location', turno.negocio.nombre)
+
+    event.add('status', 'CONFIRMED' if turno.status in ('confirmado', 'completado') else 'TENTATIVE')
+
+    # Mismo UID que el .ics del email: el calendario lo reconoce como el mismo evento
+    event.add('uid', f'turno-{turno.id}@ordema.app')
+    # DTSTAMP fijo por versión para que el fragmento sea cacheable.
+    # RFC 5545 lo exige en UTC; updated_at es naive en hora local (USE_TZ = False).
+    modificado_utc = timezone.make_aware(turno.version_vevent).astimezone(dt_timezone.utc)
+    event.add('dtstamp', modificado_utc)
+    event.add('last-modified', modificado_utc)
+    return event.to_ical()
+
+
+def generar_feed_profesional(profesional: Profesional) -> bytes:
+    """
+    Arma el .ics completo del profesional para la ventana móvil.
+
+    Solo se serializan los turnos cuya versión no está en cache; el resto se
+    reutiliza tal cual.
+    """
+    inicio, fin = _ventana()
+    turnos = list(
+        _turnos_ventana(profesional, inicio, fin)
+        .annotate(version_vevent=_version_vevent())
+        .only('id')
+        .order_by('start_datetime', 'id')
+    )
+
+    claves = {turno.id: _clave_vevent(turno) for turno in turnos}
+    fragmentos = cache.get_many(list(claves.values()))
+
+    faltantes = [turno.id for turno in turnos if claves[turno.id] not in fragmentos]
+    if faltantes:
+        nuevos = {}
+        for turno in (
+            Turno.objects.filter(id__in=faltantes)
+            .annotate(version_vevent=_version_vevent())
+            .select_related('cliente', 'servicio', 'negocio')
+        ):
+            nuevos[_clave_vevent(turno)] = _serializar_vevent(turno)
+        cache.set_many(nuevos, VEVENT_CACHE_TIMEOUT)
+        fragmentos.update(nuevos)
+
+    cal = Calendar()
+    cal.add('prodid', '-//Ordema App//Agenda Profesional//ES')
+    cal.add('version', '2.0')
+    cal.add('calscale', 'GREGORIAN')
+    cal.add('x-wr-calname', f'{profesional.negocio.nombre} - {profesional}')
+    cal.add('x-published-ttl', 'PT15M')
+    cabecera = cal.to_ical()
+    cierre = b'END:VCALENDAR\r\n'
+    if cabecera.endswith(cierre):
+        cabecera = cabecera[:-len(cierre)]
+
+    cuerpo = b''.join(fragmentos[claves[turno.id]] for turno in turnos if claves[turno.id] in fragmentos)
+    return cabecera + cuerpo + cierre
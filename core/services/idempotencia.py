@@ -0,0 +1,175 @@
+"""
+Soporte de `Idempotency-Key` para endpoints que crean o modifican turnos.
+
+El bot (n8n) reintenta las requests que exceden su timeout; con la misma
+clave, el reintento recibe la respuesta original en lugar de volver a validar,
+crear el turno y encolar el email.
+"""
+
+from datetime import timedelta
+from functools import wraps
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.models import ClaveIdempotencia
+
+HEADER_IDEMPOTENCIA = 'Idempotency-Key'
+HEADER_REPETIDA = 'Idempotent-Replayed'
+
+# Cuánto tiempo se guarda la respuesta (los reintentos del bot ocurren en minutos)
+IDEMPOTENCIA_TTL = timedelta(hours=24)
+
+# Una clave en curso (sin status_code) con un lock más viejo que esto se considera
+# abandonada (worker matado por timeout u OOM a mitad de la vista) y el próximo
+# reintento la retoma. Varias veces el timeout de gunicorn (30s por defecto).
+RESERVA_EXPIRA = timedelta(minutes=2)
+
+
+def idempotente(nombre: str):
+    """
+    Decorador para métodos de APIView (post/put/patch/delete).
+
+    Sin header `Idempotency-Key` la vista corre normalmente. Con header:
+    - primera vez: ejecuta la vista y guarda su respuesta (salvo errores 5xx);
+    - reintento: devuelve la respuesta guardada con `Idempotent-Replayed: true`;
+    - reintento mientras la primera sigue en curso: 409 (pasado RESERVA_EXPIRA
+      se la da por abandonada y el reintento ejecuta la vista);
+    - misma clave con otro contenido: 422.
+
+    Args:
+        nombre: Identificador del endpoint (forma parte del alcance de la clave)
+    """
+    def decorador(metodo):
+        @wraps(metodo)
+        def envoltura(self, request, *args, **kwargs):
+            clave = request.headers.get(HEADER_IDEMPOTENCIA)
+            if not clave:
+                return metodo(self, request, *args, **kwargs)
+
+            if len(clave) > ClaveIdempotencia._meta.get_field('clave').max_length:
+                return Response({
+                    'success': False,
+                    'message': f'{HEADER_IDEMPOTENCIA} demasiado larga (máx: 255 caracteres)'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            huella = _huella(request)
+            registro, creado = _reservar(f"{nombre}:{_actor(request)}", clave, huella)
+
+            if not creado:
+                return _respuesta_guardada(registro, huella)
+
+            # Filtrar por el lock: si esta ejecución se pasó de RESERVA_EXPIRA y un
+            # reintento la retomó, el resultado de la fila es del reintento
+            propia = ClaveIdempotencia.objects.filter(id=registro.id, locked_at=registro.locked_at)
+            try:
+                response = metodo(self, request, *args, **kwargs)
+            except Exception:
+                propia.delete()
+                raise
+
+            if response.status_code >= 500:
+                # Error transitorio: el próximo reintento debe volver a ejecutarse
+                propia.delete()
+            else:
+                propia.update(
+                    status_code=response.status_code,
+                    respuesta=json.loads(json.dumps(response.data, cls=JSONEncoder)),
+                )
+            return response
+        return envoltura
+    return decorador
+
+
+def _es_request_del_bot(request) -> bool:
+    bot_token = request.headers.get('X-BOT-TOKEN')
+    expected_bot_token = getattr(settings, 'BOT_TOKEN', None)
+    return bool(bot_token and expected_bot_token and bot_token == expected_bot_token)
+
+
+def _actor(request) -> str:
+    negocio = getattr(request, 'negocio', None)
+    actor = 'bot' if _es_request_del_bot(request) else f'user:{request.user.pk}'
+    return f"{actor}:negocio:{negocio.id if negocio else '-'}"
+
+
+def _huella(request) -> str:
+    contenido = json.dumps(request.data, sort_keys=True, cls=JSONEncoder, default=str)
+    crudo = f"{request.method}|{request.path}|{contenido}"
+    return hashlib.sha256(crudo.encode()).hexdigest()
+
+
+def _reservar(alcance: str, clave: str, huella: str):
+    """
+    Inserta la clave como 'en curso'. Si ya existe, devuelve la existente.
+
+    El índice único (alcance, clave) resuelve la carrera entre dos reintentos
+    simultáneos: solo uno inserta, el otro ve la fila del primero. Una clave
+    en curso abandonada se retoma con un UPDATE condicional (solo un reintento
+    lo gana).
+
+    Returns:
+        tuple: (ClaveIdempotencia, creado: bool)
+    """
+    ahora = timezone.now()
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                return ClaveIdempotencia.objects.create(
+                    alcance=alcance,
+                    clave=clave,
+                    huella=huella,
+                    locked_at=ahora,
+                    expires_at=ahora + IDEMPOTENCIA_TTL,
+                ), True
+        except IntegrityError:
+            existente = ClaveIdempotencia.objects.filter(alcance=alcance, clave=clave).first()
+            if existente is None:
+                # La otra request falló y liberó la clave: volver a intentar
+                continue
+            if existente.expires_at <= ahora:
+                # Vencida: se descarta y se reutiliza la clave
+                existente.delete()
+                continue
+            if existente.status_code is None and existente.huella == huella and ClaveIdempotencia.objects.filter(
+                id=existente.id,
+                status_code__isnull=True,
+                locked_at__lt=ahora - RESERVA_EXPIRA,
+            ).update(locked_at=ahora, expires_at=ahora + IDEMPOTENCIA_TTL):
+                existente.locked_at = ahora
+                return existente, True
+            return existente, False
+    raise IntegrityError(f'No se pudo reservar {HEADER_IDEMPOTENCIA} {clave}')
+
+
+def _respuesta_guardada(registro: ClaveIdempotencia, huella: str) -> Response:
+    if registro.huella != huella:
+        return Response({
+            'success': False,
+            'message': f'La {HEADER_IDEMPOTENCIA} ya se usó con otro contenido'
+        }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    if registro.status_code is None:
+        return Response({
+            'success': False,
+            'message': 'La request original con esta clave todavía se está procesando. Reintente en unos segundos'
+        }, status=status.HTTP_409_CONFLICT)
+
+    return Response(registro.respuesta, status=registro.status_code, headers={HEADER_REPETIDA: 'true'})
+
+
+def purgar_claves_vencidas() -> int:
+    """
+    Borra las claves vencidas.
+
+    Returns:
+        int: cantidad de claves borradas
+    """
+    borradas, _ = ClaveIdempotencia.objects.filter(expires_at__lte=timezone.now()).delete()
+    return borradas
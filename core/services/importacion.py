@@ -0,0 +1,383 @@
+"""
+Importación masiva desde CSV (alta de un negocio nuevo): servicios, horarios y clientes.
+
+El CSV se valida completo en memoria (con una query por tipo de búsqueda, no
+por fila) y las filas válidas se insertan con `bulk_create` sobre la clave
+natural de cada modelo, así reimportar el mismo archivo no duplica nada. Las
+filas inválidas se informan con su número de línea y no frenan al resto.
+
+No pasa por `save()` ni por señales: lo que `save()` calcula (username en
+minúsculas, phone_e164) se calcula acá.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+import csv
+import io
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from core.constants import IONIC_ICON_CHOICES
+from core.models import HorarioDisponibilidad, Membership, Negocio, Profesional, Servicio, Usuario
+from core.utils.telefonos import normalizar_telefono
+
+TAMANO_LOTE_IMPORTACION = 1000
+
+DIAS_SEMANA = {
+    nombre.lower(): numero for numero, nombre in HorarioDisponibilidad.day_of_week_choices
+}
+DIAS_SEMANA.update({'miercoles': 2, 'sabado': 5})
+VALORES_SI = {'1', 'si', 'sí', 'true', 'verdadero'}
+VALORES_NO = {'0', 'no', 'false', 'falso'}
+ICONOS_VALIDOS = {valor for valor, _ in IONIC_ICON_CHOICES}
+
+
+@dataclass
+class ResultadoImportacion:
+    """
+    Resumen de una importación.
+
+    Para clientes: `creados` son usuarios nuevos, `actualizados` usuarios que ya
+    existían y se sumaron al negocio, `sin_cambios` los que ya eran miembros.
+    """
+    filas: int = 0
+    creados: int = 0
+    actualizados: int = 0
+    sin_cambios: int = 0
+    errores: list = field(default_factory=list)  # [(línea, mensaje), ...]
+    aplicado: bool = True
+
+    def agregar_error(self, linea: int, mensaje: str):
+        self.errores.append((linea, mensaje))
+
+
+def importar_csv(tipo: str, negocio: Negocio, contenido: str, dry_run: bool = False) -> ResultadoImportacion:
+    """
+    Importa un CSV de `tipo` ('servicios', 'horarios' o 'clientes') en el negocio.
+
+    Args:
+        contenido: Texto del archivo (con encabezado). Acepta ',' o ';' como separador
+        dry_run: Solo valida; no escribe nada
+
+    Raises:
+        ValueError: tipo desconocido o faltan columnas obligatorias
+    """
+    if tipo not in TIPOS_IMPORTACION:
+        raise ValueError(f"Tipo de importación desconocido: {tipo}")
+    importador, columnas_obligatorias = TIPOS_IMPORTACION[tipo]
+
+    filas = _leer_csv(contenido, columnas_obligatorias)
+    resultado = ResultadoImportacion(filas=len(filas), aplicado=not dry_run)
+    with transaction.atomic():
+        importador(negocio, filas, resultado, dry_run)
+    resultado.errores.sort()
+    return resultado
+
+
+# =============================================================================
+# SERVICIOS  (clave natural: name, única en toda la tabla)
+# =============================================================================
+
+def _importar_servicios(negocio, filas, resultado, dry_run):
+    validos = {}
+    for linea, fila in filas:
+        try:
+            servicio = Servicio(
+                negocio=negocio,
+                name=_texto_obligatorio(fila, 'nombre', 100),
+                description=fila.get('descripcion') or None,
+                duration_minutes=_entero(fila, 'duracion_minutos', minimo=1),
+                price=_precio(fila),
+                is_active=_booleano(fila, 'activo', default=True),
+                icon_name=_icono(fila),
+            )
+        except ValueError as e:
+            resultado.agregar_error(linea, str(e))
+            continue
+        if servicio.name in validos:
+            resultado.agregar_error(linea, f"El servicio '{servicio.name}' está repetido en el archivo")
+            continue
+        validos[servicio.name] = (linea, servicio)
+
+    existentes = dict(_en_lotes(
+        lambda lote: Servicio.objects.filter(name__in=lote).values_list('name', 'negocio_id'), list(validos)
+    ))
+    servicios = []
+    for nombre, (linea, servicio) in validos.items():
+        if nombre in existentes and existentes[nombre] != negocio.id:
+            # name es único en toda la tabla: no pisar el servicio de otro negocio
+            resultado.agregar_error(linea, f"Ya existe un servicio '{nombre}' en otro negocio")
+            continue
+        if nombre in existentes:
+            resultado.actualizados += 1
+        else:
+            resultado.creados += 1
+        servicios.append(servicio)
+
+    if not dry_run and servicios:
+        Servicio.objects.bulk_create(
+            servicios,
+            batch_size=TAMANO_LOTE_IMPORTACION,
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=['description', 'duration_minutes', 'price', 'is_active', 'icon_name', 'updated_at'],
+        )
+
+
+# =============================================================================
+# HORARIOS  (clave natural: profesional, día, inicio, fin — horario_recurrente_uniq)
+# =============================================================================
+
+def _importar_horarios(negocio, filas, resultado, dry_run):
+    usernames = {fila.get('profesional', '').strip().lower() for _, fila in filas}
+    profesionales = {
+        p.user.username: p
+        for p in Profesional.objects.filter(negocio=negocio, user__username__in=usernames).select_related('user')
+    }
+
+    validos = {}
+    for linea, fila in filas:
+        try:
+            username = _texto_obligatorio(fila, 'profesional', 150).lower()
+            if username not in profesionales:
+                raise ValueError(f"'{username}' no es profesional de {negocio.nombre}")
+            dia = _dia_semana(fila)
+            inicio = _hora(fila, 'inicio')
+            fin = _hora(fila, 'fin')
+            if fin <= inicio:
+                raise ValueError("La hora de fin debe ser posterior a la de inicio")
+        except ValueError as e:
+            resultado.agregar_error(linea, str(e))
+            continue
+        clave = (profesionales[username].id, dia, inicio, fin)
+        if clave in validos:
+            resultado.sin_cambios += 1
+            continue
+        validos[clave] = HorarioDisponibilidad(
+            profesional=profesionales[username], negocio=negocio,
+            day_of_week=dia, start_time=inicio, end_time=fin, is_recurring=True,
+        )
+
+    existentes = set(
+        HorarioDisponibilidad.objects.filter(
+            profesional_id__in={clave[0] for clave in validos},
+            is_recurring=True, start_date__isnull=True, end_date__isnull=True,
+        ).values_list('profesional_id', 'day_of_week', 'start_time', 'end_time')
+    )
+    nuevos = [horario for clave, horario in validos.items() if clave not in existentes]
+    resultado.creados += len(nuevos)
+    resultado.sin_cambios += len(validos) - len(nuevos)
+
+    if not dry_run and nuevos:
+        HorarioDisponibilidad.objects.bulk_create(nuevos, batch_size=TAMANO_LOTE_IMPORTACION, ignore_conflicts=True)
+
+
+# =============================================================================
+# CLIENTES  (clave natural: username; membership por (user, negocio))
+# =============================================================================
+
+def _importar_clientes(negocio, filas, resultado, dry_run):
+    validos = {}
+    telefonos = {}
+    for linea, fila in filas:
+        try:
+            email = (fila.get('email') or '').strip().lower()
+            if email:
+                try:
+                    validate_email(email)
+                except ValidationError:
+                    raise ValueError(f"Email inválido: '{email}'")
+            username = (fila.get('username') or '').strip().lower() or email
+            if not username:
+                raise ValueError("Falta 'username' o 'email'")
+            try:
+                Usuario.username_validator(username)
+            except ValidationError:
+                raise ValueError(f"Username inválido: '{username}'")
+            if len(username) > 150:
+                raise ValueError("El username supera los 150 caracteres")
+            telefono = (fila.get('telefono') or '').strip()
+            phone_e164 = normalizar_telefono(telefono)
+            if telefono and not phone_e164:
+                raise ValueError(f"Teléfono inválido: '{telefono}'")
+        except ValueError as e:
+            resultado.agregar_error(linea, str(e))
+            continue
+        if username in validos:
+            resultado.agregar_error(linea, f"El usuario '{username}' está repetido en el archivo")
+            continue
+        if phone_e164 and phone_e164 in telefonos:
+            resultado.agregar_error(linea, f"El teléfono {telefono} está repetido en el archivo")
+            continue
+        if phone_e164:
+            telefonos[phone_e164] = username
+        validos[username] = (linea, Usuario(
+            username=username,
+            email=email,
+            first_name=(fila.get('nombre') or '').strip()[:150],
+            last_name=(fila.get('apellido') or '').strip()[:150],
+            phone_number=telefono or None,
+            phone_e164=phone_e164,
+            password=make_password(None),
+        ))
+
+    existentes = dict(_en_lotes(
+        lambda lote: Usuario.objects.filter(username__in=lote).values_list('username', 'id'), list(validos)
+    ))
+    # El teléfono es único: no puede estar a nombre de otro usuario ya registrado
+    duenos_telefono = dict(_en_lotes(
+        lambda lote: Usuario.objects.filter(phone_e164__in=lote).values_list('phone_e164', 'username'), list(telefonos)
+    ))
+    for e164, dueno in duenos_telefono.items():
+        username = telefonos[e164]
+        if dueno != username and username in validos:
+            linea, _ = validos.pop(username)
+            resultado.agregar_error(linea, f"El teléfono ya está registrado por otro usuario ({dueno})")
+
+    miembros = set(_en_lotes(
+        lambda lote: Membership.objects.filter(negocio=negocio, user_id__in=lote).values_list('user_id', flat=True),
+        list(existentes.values()),
+    ))
+    nuevos = []
+    for username, (_, usuario) in validos.items():
+        if username not in existentes:
+            nuevos.append(usuario)
+            resultado.creados += 1
+        elif existentes[username] in miembros:
+            resultado.sin_cambios += 1
+        else:
+            # Usuario de otro negocio: se suma como cliente, sin tocar sus datos
+            resultado.actualizados += 1
+
+    if dry_run or not validos:
+        return
+
+    Usuario.objects.bulk_create(nuevos, batch_size=TAMANO_LOTE_IMPORTACION, ignore_conflicts=True)
+    ids = _en_lotes(
+        lambda lote: Usuario.objects.filter(username__in=lote).values_list('id', flat=True), list(validos)
+    )
+    Membership.objects.bulk_create(
+        [Membership(user_id=user_id, negocio=negocio, rol=Membership.Roles.CLIENTE, is_active=True)
+         for user_id in ids if user_id not in miembros],
+        batch_size=TAMANO_LOTE_IMPORTACION,
+        ignore_conflicts=True,
+    )
+
+
+# Ayuda para el formulario del admin y el help del comando
+COLUMNAS_IMPORTACION = {
+    'servicios': 'nombre, duracion_minutos, precio (obligatorias); descripcion, activo (si/no), icono',
+    'horarios': 'profesional (username), dia (0-6 o Lunes..Domingo), inicio y fin (HH:MM)',
+    'clientes': 'username y/o email (al menos uno); nombre, apellido, telefono',
+}
+
+TIPOS_IMPORTACION = {
+    'servicios': (_importar_servicios, ('nombre', 'duracion_minutos', 'precio')),
+    'horarios': (_importar_horarios, ('profesional', 'dia', 'inicio', 'fin')),
+    'clientes': (_importar_clientes, ()),
+}
+
+
+# =============================================================================
+# LECTURA Y VALIDACIÓN DE CAMPOS
+# =============================================================================
+
+def _leer_csv(contenido: str, columnas_obligatorias) -> list:
+    """
+    Returns:
+        list: [(número de línea, {columna: valor}), ...] con columnas en minúsculas
+    """
+    contenido = contenido.lstrip('\ufeff')
+    primera_linea = contenido.split('\n', 1)[0]
+    separador = ';' if primera_linea.count(';') > primera_linea.count(',') else ','
+    lector = csv.DictReader(io.StringIO(contenido), delimiter=separador)
+    lector.fieldnames = [(columna or '').strip().lower() for columna in (lector.fieldnames or [])]
+
+    faltantes = [c for c in columnas_obligatorias if c not in lector.fieldnames]
+    if faltantes:
+        raise ValueError(f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+
+    filas = []
+    for fila in lector:
+        if not any((valor or '').strip() for valor in fila.values() if isinstance(valor, str)):
+            continue  # línea vacía
+        filas.append((lector.line_num, {k: (v or '').strip() for k, v in fila.items() if k}))
+    return filas
+
+
+def _en_lotes(consulta, valores, tamano=5000):
+    """Ejecuta `consulta(lote)` por lotes de valores (evita IN (...) gigantes) y concatena."""
+    resultados = []
+    for i in range(0, len(valores), tamano):
+        resultados.extend(consulta(valores[i:i + tamano]))
+    return resultados
+
+
+def _texto_obligatorio(fila, columna, largo_maximo):
+    valor = fila.get(columna, '')
+    if not valor:
+        raise ValueError(f"'{columna}' es obligatorio")
+    if len(valor) > largo_maximo:
+        raise ValueError(f"'{columna}' supera los {largo_maximo} caracteres")
+    return valor
+
+
+def _entero(fila, columna, minimo):
+    try:
+        valor = int(fila.get(columna, ''))
+    except ValueError:
+        raise ValueError(f"'{columna}' debe ser un número entero")
+    if valor < minimo:
+        raise ValueError(f"'{columna}' debe ser al menos {minimo}")
+    return valor
+
+
+def _precio(fila):
+    try:
+        precio = Decimal(fila.get('precio', '').replace(',', '.'))
+    except InvalidOperation:
+        raise ValueError("'precio' debe ser un número")
+    if not precio.is_finite() or precio < 0:
+        raise ValueError("'precio' debe ser mayor o igual a 0")
+    precio = precio.quantize(Decimal('0.01'))
+    if precio >= Decimal('100000000'):
+        raise ValueError("'precio' es demasiado grande")
+    return precio
+
+
+def _booleano(fila, columna, default):
+    valor = fila.get(columna, '').lower()
+    if not valor:
+        return default
+    if valor in VALORES_SI:
+        return True
+    if valor in VALORES_NO:
+        return False
+    raise ValueError(f"'{columna}' debe ser si/no")
+
+
+def _icono(fila):
+    icono = fila.get('icono') or None
+    if icono and icono not in ICONOS_VALIDOS:
+        raise ValueError(f"Ícono desconocido: '{icono}'")
+    return icono
+
+
+def _dia_semana(fila):
+    valor = fila.get('dia', '').lower()
+    if valor.isdigit() and 0 <= int(valor) <= 6:
+        return int(valor)
+    if valor in DIAS_SEMANA:
+        return DIAS_SEMANA[valor]
+    raise ValueError("'dia' debe ser 0-6 (0=Lunes) o el nombre del día")
+
+
+def _hora(fila, columna):
+    try:
+        return datetime.strptime(fila.get(columna, ''), '%H:%M').time()
+    except ValueError:
+        raise ValueError(f"'{columna}' debe tener formato HH:MM")
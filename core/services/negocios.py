@@ -0,0 +1,21 @@
+from django.db.models import Q, QuerySet
+
+
+def buscar_negocios(queryset: QuerySet, q: str) -> QuerySet:
+    """
+    Filtra negocios por nombre o dirección (búsqueda parcial, sin distinguir mayúsculas).
+
+    En PostgreSQL la búsqueda se apoya en los índices trigram sobre
+    UPPER(nombre) y UPPER(address); en otros motores cae a un LIKE normal.
+
+    Args:
+        queryset: QuerySet de Negocio a filtrar
+        q: Texto a buscar (vacío = sin filtro)
+
+    Returns:
+        QuerySet filtrado
+    """
+    q = (q or '').strip()
+    if not q:
+        return queryset
+    return queryset.filter(Q(nombre__icontains=q) | Q(address__icontains=q))
@@ -0,0 +1,236 @@
+from datetime import timedelta
+from typing import Optional
+import logging
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import EmailOutbox, Negocio, Turno, Usuario
+from core.utils.email_utils import (
+    construir_email_bienvenida_usuario,
+    construir_email_cancelacion_turno,
+    construir_email_confirmacion_turno,
+    enviar_emails_en_lote,
+)
+
+logger = logging.getLogger(__name__)
+
+# Backoff exponencial entre reintentos: 30s, 60s, 120s, ... hasta 1 hora
+BACKOFF_BASE_SEGUNDOS = 30
+BACKOFF_MAXIMO_SEGUNDOS = 3600
+
+# Un email en 'enviando' con un lock más viejo que esto se considera abandonado
+# (worker caído a mitad de envío) y vuelve a ser reclamable.
+BLOQUEO_EXPIRA = timedelta(minutes=10)
+
+
+# =============================================================================
+# ENCOLADO (llamar dentro de la misma transacción que el turno / usuario)
+# =============================================================================
+
+def encolar_email_confirmacion_turno(turno: Turno) -> Optional[EmailOutbox]:
+    """
+    Encola el email de confirmación de un turno.
+
+    Returns:
+        EmailOutbox o None si el cliente no tiene email
+    """
+    if not turno.cliente.email:
+        print(f"[EMAIL] Cliente {turno.cliente.username} no tiene email registrado")
+        return None
+
+    return EmailOutbox.objects.create(
+        tipo=EmailOutbox.Tipos.CONFIRMACION_TURNO,
+        payload={'turno_id': turno.id},
+        destinatario=turno.cliente.email,
+        negocio=turno.negocio,
+    )
+
+
+def encolar_email_bienvenida_usuario(user: Usuario, password: str, negocio: Negocio) -> Optional[EmailOutbox]:
+    """
+    Encola el email de bienvenida con las credenciales del usuario.
+
+    La contraseña temporal viaja en el payload solo hasta que el email se
+    envía o se descarta; en ese momento se borra de la fila.
+
+    Returns:
+        EmailOutbox o None si el usuario no tiene email
+    """
+    if not user.email:
+        print(f"[EMAIL] Usuario {user.username} no tiene email registrado")
+        return None
+
+    return EmailOutbox.objects.create(
+        tipo=EmailOutbox.Tipos.BIENVENIDA_USUARIO,
+        payload={'user_id': user.id, 'negocio_id': negocio.id, 'password': password},
+        destinatario=user.email,
+        negocio=negocio,
+    )
+
+
+def encolar_emails_turnos(turnos, tipo: str) -> int:
+    """
+    Encola un email por turno con un solo INSERT (acciones masivas del admin).
+
+    Args:
+        turnos: Turnos con `cliente` cargado (select_related) para no hacer una query por fila
+        tipo: EmailOutbox.Tipos.CONFIRMACION_TURNO o EmailOutbox.Tipos.CANCELACION_TURNO
+
+    Returns:
+        int: cantidad de emails encolados (los clientes sin email se omiten)
+    """
+    items = [
+        EmailOutbox(
+            tipo=tipo,
+            payload={'turno_id': turno.id},
+            destinatario=turno.cliente.email,
+            negocio_id=turno.negocio_id,
+        )
+        for turno in turnos
+        if turno.cliente.email
+    ]
+    EmailOutbox.objects.bulk_create(items)
+    return len(items)
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+def reclamar_emails(limite: int) -> list[EmailOutbox]:
+    """
+    Reclama hasta `limite` emails listos para enviar.
+
+    Usa SELECT ... FOR UPDATE SKIP LOCKED para que varios workers no tomen
+    la misma fila, y marca las filas como 'enviando' antes de soltar el lock
+    (la transacción no queda abierta durante el envío SMTP).
+    """
+    ahora = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=EmailOutbox.Estados.PENDIENTE, next_attempt_at__lte=ahora) |
+                Q(status=EmailOutbox.Estados.ENVIANDO, locked_at__lt=ahora - BLOQUEO_EXPIRA)
+            )
+            .order_by('id')
+            .values_list('id', flat=True)[:limite]
+        )
+        if ids:
+            EmailOutbox.objects.filter(id__in=ids).update(
+                status=EmailOutbox.Estados.ENVIANDO,
+                locked_at=ahora,
+                intentos=F('intentos') + 1,
+                updated_at=ahora,
+            )
+    return list(EmailOutbox.objects.filter(id__in=ids).order_by('id'))
+
+
+def construir_mensaje(item: EmailOutbox):
+    """
+    Construye el EmailMultiAlternatives de un item de la cola.
+
+    Returns:
+        EmailMultiAlternatives o None si el destinatario ya no tiene email
+    """
+    if item.tipo in (EmailOutbox.Tipos.CONFIRMACION_TURNO, EmailOutbox.Tipos.CANCELACION_TURNO):
+        turno = Turno.objects.select_related(
+            'cliente', 'profesional__user', 'servicio', 'negocio'
+        ).get(id=item.payload['turno_id'])
+        if item.tipo == EmailOutbox.Tipos.CANCELACION_TURNO:
+            return construir_email_cancelacion_turno(turno)
+        return construir_email_confirmacion_turno(turno)
+
+    if item.tipo == EmailOutbox.Tipos.BIENVENIDA_USUARIO:
+        user = Usuario.objects.get(id=item.payload['user_id'])
+        negocio = Negocio.objects.get(id=item.payload['negocio_id'])
+        return construir_email_bienvenida_usuario(user, item.payload.get('password', ''), negocio)
+
+    raise ValueError(f"Tipo de email desconocido: {item.tipo}")
+
+
+def _payload_sin_secretos(payload: dict) -> dict:
+    return {k: v for k, v in payload.items() if k != 'password'}
+
+
+def marcar_enviado(item: EmailOutbox) -> None:
+    ahora = timezone.now()
+    EmailOutbox.objects.filter(id=item.id).update(
+        status=EmailOutbox.Estados.ENVIADO,
+        sent_at=ahora,
+        locked_at=None,
+        last_error='',
+        payload=_payload_sin_secretos(item.payload),
+        updated_at=ahora,
+    )
+
+
+def marcar_error(item: EmailOutbox, error, reintentar: bool = True) -> str:
+    """
+    Registra un error de envío y programa el reintento con backoff exponencial.
+
+    Returns:
+        str: estado final del item ('pendiente' si se reintentará, 'fallido' si no)
+    """
+    ahora = timezone.now()
+    campos = {
+        'locked_at': None,
+        'last_error': str(error)[:2000],
+        'updated_at': ahora,
+    }
+    if reintentar and item.intentos < item.max_intentos:
+        espera = min(BACKOFF_BASE_SEGUNDOS * 2 ** (item.intentos - 1), BACKOFF_MAXIMO_SEGUNDOS)
+        campos['status'] = EmailOutbox.Estados.PENDIENTE
+        campos['next_attempt_at'] = ahora + timedelta(seconds=espera)
+    else:
+        campos['status'] = EmailOutbox.Estados.FALLIDO
+        campos['payload'] = _payload_sin_secretos(item.payload)
+
+    EmailOutbox.objects.filter(id=item.id).update(**campos)
+    logger.warning(f"[EMAIL OUTBOX] #{item.id} ({item.tipo}) intento {item.intentos}: {error}")
+    return campos['status']
+
+
+def procesar_lote(limite: int = 50) -> dict:
+    """
+    Reclama y envía un lote de emails de la cola.
+
+    Todo el lote sale por una sola sesión SMTP (ver `enviar_emails_en_lote`).
+
+    Returns:
+        dict: {'reclamados', 'enviados', 'reintentos', 'fallidos'}
+    """
+    resultado = {'reclamados': 0, 'enviados': 0, 'reintentos': 0, 'fallidos': 0}
+    items = reclamar_emails(limite)
+    resultado['reclamados'] = len(items)
+
+    a_enviar = []
+    for item in items:
+        try:
+            mensaje = construir_mensaje(item)
+        except (Turno.DoesNotExist, Usuario.DoesNotExist, Negocio.DoesNotExist, ValueError) as e:
+            # El objeto ya no existe: reintentar no sirve
+            marcar_error(item, e, reintentar=False)
+            resultado['fallidos'] += 1
+            continue
+
+        if mensaje is None:
+            marcar_error(item, 'El destinatario ya no tiene email registrado', reintentar=False)
+            resultado['fallidos'] += 1
+            continue
+
+        a_enviar.append((item, mensaje))
+
+    errores = enviar_emails_en_lote([mensaje for _, mensaje in a_enviar], batch_size=max(len(a_enviar), 1))
+
+    for (item, _), error in zip(a_enviar, errores):
+        if error is None:
+            marcar_enviado(item)
+            resultado['enviados'] += 1
+        else:
+            estado = marcar_error(item, error)
+            resultado['reintentos' if estado == EmailOutbox.Estados.PENDIENTE else 'fallidos'] += 1
+
+    return resultado
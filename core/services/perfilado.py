@@ -0,0 +1,199 @@
+"""
+Perfilado a pedido de requests de la API (`?_profile=1`).
+
+Cuando un negocio reporta una pantalla lenta que no se reproduce en local, el
+staff (o quien traiga un token firmado en el header X-Perfilado) repite la
+request con `?_profile=1`. La vista corre bajo cProfile y con un
+`execute_wrapper` que anota cada SQL con su duración; la captura se guarda en
+PERFILADO_DIR y la respuesta trae su id en el header X-Perfilado-Id.
+
+Las capturas son un buffer circular en disco: un JSON por captura y, al
+superar PERFILADO_MAX_CAPTURAS, se borran las más viejas. Se ven desde el
+admin en /admin/perfilado/.
+
+Sin el parámetro no se hace nada más que mirar el query string (ver
+PerfiladoMiddleware).
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import time
+import uuid
+from datetime import datetime
+
+from django.conf import settings
+from django.core import signing
+from django.db import connection
+
+PARAM_PERFILADO = '_profile'
+HEADER_PERFILADO = 'X-Perfilado'
+SALT_PERFILADO = 'core.perfilado'
+
+# Funciones del resumen de cProfile (ordenado por tiempo acumulado)
+LINEAS_PERFIL = 60
+# Tope de SQL guardados por captura (una N+1 puede generar miles)
+MAX_SQL_CAPTURA = 2000
+MAX_LARGO_PARAMS = 300
+
+_ID_VALIDO = re.compile(r'^\d{8}T\d{6}-[0-9a-f]{8}$')
+
+
+# =============================================================================
+# AUTORIZACIÓN
+# =============================================================================
+
+def generar_token_perfilado(nota: str = '') -> str:
+    """Token para el header X-Perfilado (la vigencia se controla al validarlo)."""
+    return signing.TimestampSigner(salt=SALT_PERFILADO).sign(nota or 'perfilado')
+
+
+def token_perfilado_valido(token: str) -> bool:
+    try:
+        signing.TimestampSigner(salt=SALT_PERFILADO).unsign(token, max_age=settings.PERFILADO_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def puede_perfilar(request) -> bool:
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated and user.is_staff:
+        return True
+    token = request.headers.get(HEADER_PERFILADO)
+    return bool(token) and token_perfilado_valido(token)
+
+
+# =============================================================================
+# CAPTURA
+# =============================================================================
+
+class _RegistroSQL:
+    """execute_wrapper que anota cada statement en orden, con su duración."""
+
+    def __init__(self):
+        self.statements = []
+        self.omitidos = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if len(self.statements) < MAX_SQL_CAPTURA:
+                self.statements.append({
+                    'sql': sql,
+                    'params': repr(params)[:MAX_LARGO_PARAMS],
+                    'many': many,
+                    'ms': round((time.perf_counter() - inicio) * 1000, 3),
+                })
+            else:
+                self.omitidos += 1
+
+
+def perfilar_vista(request, llamada):
+    """
+    Ejecuta `llamada()` (la vista) perfilada y guarda la captura.
+
+    Returns:
+        tuple: (response, id de la captura)
+    """
+    perfil = cProfile.Profile()
+    registro = _RegistroSQL()
+    inicio = time.perf_counter()
+    with connection.execute_wrapper(registro):
+        perfil.enable()
+        try:
+            response = llamada()
+            # Las respuestas de DRF se renderizan después del middleware: forzarlo acá
+            # para que la serialización entre en el perfil
+            if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                response.render()
+        finally:
+            perfil.disable()
+    duracion = time.perf_counter() - inicio
+
+    salida = io.StringIO()
+    pstats.Stats(perfil, stream=salida).sort_stats('cumulative').print_stats(LINEAS_PERFIL)
+
+    user = getattr(request, 'user', None)
+    captura = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'metodo': request.method,
+        'path': request.get_full_path(),
+        'usuario': user.get_username() if user is not None and user.is_authenticated else None,
+        'usuario_id': user.pk if user is not None and user.is_authenticated else None,
+        'negocio_id': getattr(getattr(request, 'negocio', None), 'id', None),
+        'status': response.status_code,
+        'ms': round(duracion * 1000, 1),
+        'sql_total': len(registro.statements) + registro.omitidos,
+        'sql_ms': round(sum(s['ms'] for s in registro.statements), 1),
+        'sql_omitidos': registro.omitidos,
+        'sql': registro.statements,
+        'perfil': salida.getvalue(),
+    }
+    return response, guardar_captura(captura)
+
+
+# =============================================================================
+# BUFFER EN DISCO
+# =============================================================================
+
+def guardar_captura(captura: dict) -> str:
+    """Escribe la captura (atómicamente) y borra las que sobran del buffer."""
+    directorio = settings.PERFILADO_DIR
+    os.makedirs(directorio, exist_ok=True)
+
+    # El nombre ordena cronológicamente: el más viejo es el primero
+    id_captura = f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+    captura['id'] = id_captura
+    temporal = os.path.join(directorio, f".{id_captura}.tmp")
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(captura, archivo, ensure_ascii=False)
+    os.replace(temporal, os.path.join(directorio, f"{id_captura}.json"))
+
+    for viejo in _archivos()[:-settings.PERFILADO_MAX_CAPTURAS]:
+        try:
+            os.remove(os.path.join(directorio, viejo))
+        except FileNotFoundError:
+            pass  # Otro proceso ya lo borró
+    return id_captura
+
+
+def listar_capturas(usuario_id=None) -> list:
+    """
+    Resumen de las capturas, de la más nueva a la más vieja.
+
+    Args:
+        usuario_id: Solo las de este usuario (default: todas)
+    """
+    capturas = []
+    for nombre in reversed(_archivos()):
+        captura = leer_captura(nombre[:-len('.json')])
+        if captura is None or (usuario_id is not None and captura.get('usuario_id') != usuario_id):
+            continue
+        captura.pop('sql')
+        captura.pop('perfil')
+        capturas.append(captura)
+    return capturas
+
+
+def leer_captura(id_captura: str):
+    """La captura completa, o None si no existe (o ya salió del buffer)."""
+    if not _ID_VALIDO.match(id_captura):
+        return None
+    try:
+        with open(os.path.join(settings.PERFILADO_DIR, f"{id_captura}.json"), encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _archivos() -> list:
+    try:
+        return sorted(n for n in os.listdir(settings.PERFILADO_DIR) if n.endswith('.json'))
+    except FileNotFoundError:
+        return []
@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import Turno
+from core.utils.email_utils import construir_email_recordatorio_turno, enviar_emails_en_lote
+
+logger = logging.getLogger(__name__)
+
+ESTADOS_RECORDABLES = ('pendiente', 'confirmado')
+
+
+@dataclass(frozen=True)
+class EtapaRecordatorio:
+    nombre: str
+    anticipacion: timedelta
+    campo_marca: str
+    cuando: str
+
+
+# De la más cercana a la más lejana: cada etapa cubre (ahora, ahora + anticipación]
+# menos lo que ya cubre la etapa anterior, así un turno a 1 hora no recibe
+# el recordatorio de 24h.
+ETAPAS = (
+    EtapaRecordatorio('2h', timedelta(hours=2), 'reminder_2h_sent_at', 'en 2 horas'),
+    EtapaRecordatorio('24h', timedelta(hours=24), 'reminder_24h_sent_at', 'mañana'),
+)
+
+
+def _ventana(etapa: EtapaRecordatorio, ahora):
+    desde = ahora
+    for anterior in ETAPAS:
+        if anterior is etapa:
+            break
+        desde = ahora + anterior.anticipacion
+    return desde, ahora + etapa.anticipacion
+
+
+def reclamar_recordatorios(etapa: EtapaRecordatorio, limite: int) -> list[Turno]:
+    """
+    Reclama hasta `limite` turnos cuyo recordatorio de `etapa` está pendiente.
+
+    Usa SELECT ... FOR UPDATE SKIP LOCKED sobre el índice parcial de la etapa y
+    setea la marca dentro de la misma transacción: un turno reclamado no vuelve
+    a aparecer para ningún otro worker.
+
+    Los turnos reservados después del momento ideal de envío se saltean (el
+    email de confirmación ya cubre ese caso).
+
+    La marca se escribe con .update() sin tocar updated_at: no es un cambio
+    visible del turno y no debe disparar el delta-sync de la app.
+    """
+    ahora = timezone.now()
+    desde, hasta = _ventana(etapa, ahora)
+    with transaction.atomic():
+        ids = list(
+            Turno.objects.select_for_update(skip_locked=True)
+            .filter(
+                status__in=ESTADOS_RECORDABLES,
+                start_datetime__gt=desde,
+                start_datetime__lte=hasta,
+                created_at__lte=F('start_datetime') - etapa.anticipacion,
+                **{f'{etapa.campo_marca}__isnull': True},
+            )
+            .order_by('start_datetime')
+            .values_list('id', flat=True)[:limite]
+        )
+        if ids:
+            Turno.objects.filter(id__in=ids).update(**{etapa.campo_marca: ahora})
+
+    return list(
+        Turno.objects.filter(id__in=ids)
+        .select_related('cliente', 'profesional__user', 'servicio', 'negocio')
+        .order_by('start_datetime')
+    )
+
+
+def procesar_recordatorios(etapa: EtapaRecordatorio, limite: int = 50) -> dict:
+    """
+    Reclama y envía un lote de recordatorios de `etapa` por una sola sesión SMTP.
+
+    Si el envío falla se libera la marca para que el próximo ciclo lo reintente
+    (mientras el turno siga dentro de la ventana).
+
+    Returns:
+        dict: {'reclamados', 'enviados', 'sin_email', 'fallidos',
+               'lag_max', 'lag_promedio'}  (lag en segundos respecto del
+               momento ideal de envío: start_datetime - anticipación)
+    """
+    resultado = {
+        'reclamados': 0, 'enviados': 0, 'sin_email': 0, 'fallidos': 0,
+        'lag_max': 0.0, 'lag_promedio': 0.0,
+    }
+    turnos = reclamar_recordatorios(etapa, limite)
+    resultado['reclamados'] = len(turnos)
+
+    a_enviar = []
+    for turno in turnos:
+        mensaje = construir_email_recordatorio_turno(turno, etapa.cuando)
+        if mensaje is None:
+            resultado['sin_email'] += 1
+            continue
+        a_enviar.append((turno, mensaje))
+
+    errores = enviar_emails_en_lote([mensaje for _, mensaje in a_enviar], batch_size=max(len(a_enviar), 1))
+
+    ahora = timezone.now()
+    lags = []
+    liberar = []
+    for (turno, _), error in zip(a_enviar, errores):
+        if error is None:
+            resultado['enviados'] += 1
+            lags.append(max((ahora - (turno.start_datetime - etapa.anticipacion)).total_seconds(), 0.0))
+        else:
+            resultado['fallidos'] += 1
+            liberar.append(turno.id)
+            logger.warning(f"[RECORDATORIOS] turno #{turno.id} ({etapa.nombre}): {error}")
+
+    if liberar:
+        Turno.objects.filter(id__in=liberar).update(**{etapa.campo_marca: None})
+
+    if lags:
+        resultado['lag_max'] = max(lags)
+        resultado['lag_promedio'] = sum(lags) / len(lags)
+    return resultado
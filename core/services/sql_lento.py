@@ -0,0 +1,145 @@
+"""
+Log de queries lentas, agregado por vista, negocio y forma del SQL.
+
+SqlLentoMiddleware envuelve cada request con `connection.execute_wrapper`;
+toda query que tarda SQL_LENTO_UMBRAL_MS o más se suma en memoria bajo la
+clave (vista, negocio, huella del SQL). Cada SQL_LENTO_INTERVALO_VOLCADO
+segundos los agregados se vuelcan al logger `core.services.sql_lento`, una
+línea JSON por clave, y se reinician: un timer (hilo daemon) se programa con
+el primer agregado, así que un worker que queda quieto también vuelca.
+
+La huella es el SQL con los literales y las listas de IN normalizados, así
+que las N queries de un mismo filtro (por ejemplo el exists() por slot de
+`_tiene_disponibilidad`) quedan en una sola línea con veces y tiempo total.
+"""
+
+import atexit
+import json
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+logger = logging.getLogger(__name__)
+
+# Con más claves que esto se vuelca antes de tiempo (la memoria queda acotada)
+MAX_CLAVES_SQL_LENTO = 500
+
+_agregados = {}
+_lock = threading.Lock()
+_ultimo_volcado = time.monotonic()
+_timer_volcado = None
+
+_LISTA_IN = re.compile(r'\bIN \((?:\?, )*\?\)', re.IGNORECASE)
+_VALUES = re.compile(r'\bVALUES (?:\((?:\?, )*\?\)(?:, )?)+', re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMERO = re.compile(r'(?<![\w".])-?\d+(?:\.\d+)?\b')
+_ESPACIOS = re.compile(r'\s+')
+
+
+def huella_sql(sql: str) -> str:
+    """SQL normalizado: misma huella para la misma query con distintos valores."""
+    huella = _STRING.sub('?', sql).replace('%s', '?')
+    huella = _NUMERO.sub('?', huella)
+    huella = _LISTA_IN.sub('IN (...)', huella)
+    huella = _VALUES.sub('VALUES (...)', huella)
+    return _ESPACIOS.sub(' ', huella).strip()
+
+
+class RegistroSQLLento:
+    """execute_wrapper de una request: anota las queries que superan el umbral."""
+
+    def __init__(self, request, umbral_ms: float):
+        self.request = request
+        self.umbral_ms = umbral_ms
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - inicio) * 1000
+            if ms >= self.umbral_ms:
+                registrar_sql_lento(_vista(self.request), _negocio_id(self.request), sql, ms)
+
+
+def registrar_sql_lento(vista: str, negocio_id, sql: str, ms: float) -> None:
+    global _timer_volcado
+
+    clave = (vista, negocio_id, huella_sql(sql))
+    with _lock:
+        agregado = _agregados.get(clave)
+        if agregado is None:
+            _agregados[clave] = [1, ms, ms]
+        else:
+            agregado[0] += 1
+            agregado[1] += ms
+            agregado[2] = max(agregado[2], ms)
+        if _timer_volcado is None:
+            espera = _ultimo_volcado + settings.SQL_LENTO_INTERVALO_VOLCADO - time.monotonic()
+            _timer_volcado = threading.Timer(max(espera, 0), _volcar_por_timer)
+            _timer_volcado.daemon = True
+            _timer_volcado.start()
+    volcar_sql_lento()
+
+
+def _volcar_por_timer() -> None:
+    global _timer_volcado
+
+    with _lock:
+        _timer_volcado = None
+    volcar_sql_lento(forzar=True)
+
+
+def volcar_sql_lento(forzar: bool = False) -> int:
+    """
+    Escribe los agregados al log (de mayor a menor tiempo total) y los reinicia,
+    si pasó el intervalo de volcado o se acumularon demasiadas claves.
+
+    Returns:
+        int: cantidad de líneas escritas
+    """
+    global _agregados, _ultimo_volcado
+
+    ahora = time.monotonic()
+    vencido = ahora - _ultimo_volcado >= settings.SQL_LENTO_INTERVALO_VOLCADO
+    if not (forzar or vencido or len(_agregados) >= MAX_CLAVES_SQL_LENTO):
+        return 0
+    with _lock:
+        agregados, _agregados = _agregados, {}
+        _ultimo_volcado = ahora
+
+    for (vista, negocio_id, huella), (veces, total_ms, max_ms) in sorted(
+        agregados.items(), key=lambda item: item[1][1], reverse=True
+    ):
+        logger.warning("[SQL LENTO] %s", json.dumps({
+            'vista': vista,
+            'negocio_id': negocio_id,
+            'veces': veces,
+            'total_ms': round(total_ms, 1),
+            'max_ms': round(max_ms, 1),
+            'sql': huella,
+        }, ensure_ascii=False))
+    return len(agregados)
+
+
+# Lo que quede sin volcar al terminar el worker
+atexit.register(volcar_sql_lento, forzar=True)
+
+
+def _vista(request) -> str:
+    # resolver_match no existe todavía durante los middlewares previos a la vista
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return request.path_info
+    return match.view_name
+
+
+def _negocio_id(request):
+    return getattr(getattr(request, 'negocio', None), 'id', None)
@@ -0,0 +1,157 @@
+"""
+Operaciones masivas sobre turnos (acciones del admin).
+
+Cada operación es un único UPDATE ... WHERE id IN (...) en lugar de un
+`save()` por turno. `updated_at` se setea explícitamente porque `.update()`
+no dispara `auto_now` y la app sincroniza por ese campo (delta-sync).
+Por el mismo motivo tampoco dispara las señales que mantienen el rollup de
+analíticas y publican los eventos de agenda: cada operación lo hace explícitamente.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import BloqueoHorario, EmailOutbox, Profesional, Turno
+from core.services.analiticas import programar_recalculo_rollup
+from core.services.eventos_agenda import (
+    TURNO_CANCELADO, TURNO_COMPLETADO, TURNO_REASIGNADO, evento_turno, programar_eventos
+)
+from core.services.outbox import encolar_emails_turnos
+
+# Solo estos estados se pueden completar, cancelar o reasignar
+ESTADOS_ACTIVOS = ('pendiente', 'confirmado')
+
+
+def completar_turnos(turnos) -> int:
+    """
+    Marca como completados los turnos activos del queryset.
+
+    Returns:
+        int: cantidad de turnos actualizados
+    """
+    activos = turnos.filter(status__in=ESTADOS_ACTIVOS)
+    with transaction.atomic():
+        a_completar = list(activos.only('id', 'negocio_id', 'profesional_id', 'status', 'start_datetime', 'end_datetime'))
+        completados = activos.update(
+            status='completado',
+            updated_at=timezone.now(),
+        )
+        for turno in a_completar:
+            turno.status = 'completado'
+        programar_recalculo_rollup(_dias_afectados((t.negocio_id, t.start_datetime) for t in a_completar))
+        programar_eventos((t.profesional_id, evento_turno(TURNO_COMPLETADO, t)) for t in a_completar)
+    return completados
+
+
+def cancelar_turnos(turnos) -> dict:
+    """
+    Cancela los turnos activos del queryset y encola el aviso a cada cliente.
+
+    Returns:
+        dict: {'cancelados': int, 'emails': int}
+    """
+    with transaction.atomic():
+        a_cancelar = _bloquear_activos(turnos)
+        if not a_cancelar:
+            return {'cancelados': 0, 'emails': 0}
+
+        cancelados = Turno.objects.filter(id__in=[t.id for t in a_cancelar]).update(
+            status='cancelado',
+            updated_at=timezone.now(),
+        )
+        emails = encolar_emails_turnos(a_cancelar, EmailOutbox.Tipos.CANCELACION_TURNO)
+        for turno in a_cancelar:
+            turno.status = 'cancelado'
+        programar_recalculo_rollup(_dias_afectados((t.negocio_id, t.start_datetime) for t in a_cancelar))
+        programar_eventos((t.profesional_id, evento_turno(TURNO_CANCELADO, t)) for t in a_cancelar)
+    return {'cancelados': cancelados, 'emails': emails}
+
+
+def reasignar_turnos(turnos, profesional: Profesional) -> dict:
+    """
+    Pasa los turnos activos del queryset a otro profesional del mismo negocio.
+
+    Es todo o nada: si algún turno se superpone con la agenda del profesional
+    destino (turnos, bloqueos u otro turno de la misma selección) o es de otro
+    negocio, no se mueve ninguno y se devuelven los conflictos. A cada cliente
+    se le reenvía la confirmación con el nuevo profesional.
+
+    Returns:
+        dict: {'reasignados': int, 'emails': int, 'conflictos': [Turno, ...]}
+    """
+    with transaction.atomic():
+        a_mover = [t for t in _bloquear_activos(turnos) if t.profesional_id != profesional.id]
+        if not a_mover:
+            return {'reasignados': 0, 'emails': 0, 'conflictos': []}
+
+        conflictos = [t for t in a_mover if t.negocio_id != profesional.negocio_id]
+        conflictos += _conflictos_de_agenda(profesional, [t for t in a_mover if t not in conflictos])
+        if conflictos:
+            return {'reasignados': 0, 'emails': 0, 'conflictos': conflictos}
+
+        reasignados = Turno.objects.filter(id__in=[t.id for t in a_mover]).update(
+            profesional=profesional,
+            updated_at=timezone.now(),
+        )
+        # El profesional anterior ve el turno salir de su agenda; el nuevo, entrar
+        anteriores = [t.profesional_id for t in a_mover]
+        for turno in a_mover:
+            turno.profesional_id = profesional.id
+        emails = encolar_emails_turnos(a_mover, EmailOutbox.Tipos.CONFIRMACION_TURNO)
+        programar_recalculo_rollup(_dias_afectados((t.negocio_id, t.start_datetime) for t in a_mover))
+        programar_eventos(
+            (destino, evento_turno(TURNO_REASIGNADO, t))
+            for t, anterior in zip(a_mover, anteriores)
+            for destino in (anterior, profesional.id)
+        )
+    return {'reasignados': reasignados, 'emails': emails, 'conflictos': []}
+
+
+def _dias_afectados(pares) -> set:
+    return {(negocio_id, inicio.date()) for negocio_id, inicio in pares}
+
+
+def _bloquear_activos(turnos) -> list:
+    # of=('self',): bloquear solo las filas de turno, no las de usuario del join
+    return list(
+        turnos.filter(status__in=ESTADOS_ACTIVOS)
+        .select_related('cliente')
+        .select_for_update(of=('self',))
+        .order_by('start_datetime')
+    )
+
+
+def _conflictos_de_agenda(profesional: Profesional, turnos: list) -> list:
+    """
+    Turnos que se superpondrían en la agenda del profesional.
+
+    Trae en una query los turnos activos del profesional en el rango cubierto
+    por la selección (y en otra sus bloqueos); el cruce se hace en memoria.
+    """
+    if not turnos:
+        return []
+
+    desde = min(t.start_datetime for t in turnos)
+    hasta = max(t.end_datetime for t in turnos)
+    ocupados = list(
+        Turno.objects.filter(
+            profesional=profesional,
+            status__in=ESTADOS_ACTIVOS,
+            start_datetime__lt=hasta,
+            end_datetime__gt=desde,
+        ).exclude(id__in=[t.id for t in turnos]).values_list('start_datetime', 'end_datetime')
+    )
+    ocupados += BloqueoHorario.objects.filter(
+        profesional=profesional,
+        start_datetime__lt=hasta,
+        end_datetime__gt=desde,
+    ).values_list('start_datetime', 'end_datetime')
+
+    conflictos = []
+    for turno in turnos:
+        if any(turno.start_datetime < fin and turno.end_datetime > inicio for inicio, fin in ocupados):
+            conflictos.append(turno)
+        else:
+            # Los turnos ya aceptados de la selección también ocupan la agenda
+            ocupados.append((turno.start_datetime, turno.end_datetime))
+    return conflictos
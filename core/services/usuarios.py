@@ -0,0 +1,72 @@
+from typing import Optional
+
+from core.models import Usuario
+from core.utils.telefonos import normalizar_telefono
+
+
+def resolver_usuario_por_telefono(telefono) -> Optional[Usuario]:
+    """
+    Busca el usuario dueño de un teléfono, sin importar el formato en que llegue.
+
+    Normaliza a E.164 (solo dígitos) y busca por `phone_e164` (índice único).
+
+    Args:
+        telefono: Número tal como lo envía el bot o la app ('5491173616085', '+54 9 11 ...')
+
+    Returns:
+        Usuario o None si el número no es válido o no está registrado
+    """
+    e164 = normalizar_telefono(telefono)
+    if not e164:
+        return None
+
+    # Sin cache: es una query por índice único, y un cache por proceso (LocMem)
+    # no se entera de los cambios hechos desde otros workers
+    return Usuario.objects.filter(phone_e164=e164).first()
+
+
+def telefono_registrado(telefono, excluir_usuario_id=None) -> bool:
+    """
+    Indica si el teléfono (normalizado) ya pertenece a otro usuario.
+    """
+    e164 = normalizar_telefono(telefono)
+    if not e164:
+        return False
+    usuarios = Usuario.objects.filter(phone_e164=e164)
+    if excluir_usuario_id is not None:
+        usuarios = usuarios.exclude(id=excluir_usuario_id)
+    return usuarios.exists()
+
+
+def resolver_telefonos_duplicados(dry_run: bool = False) -> dict:
+    """
+    Resuelve los usuarios que la migración 0025 dejó sin phone_e164 por tener
+    un número repetido.
+
+    - Si el número ya quedó libre (el dueño lo cambió o se borró), se le asigna.
+    - Si sigue perteneciendo a otro usuario, se le quita el teléfono: el número
+      queda con la cuenta más antigua, igual que en 0025.
+
+    Returns:
+        {'asignados': [(id, e164), ...], 'quitados': [(id, phone_number), ...]}
+    """
+    resultado = {'asignados': [], 'quitados': []}
+    pendientes = (
+        Usuario.objects.filter(phone_e164__isnull=True)
+        .exclude(phone_number__isnull=True).exclude(phone_number='')
+        .order_by('id')
+        .values_list('id', 'phone_number')
+    )
+    for usuario_id, phone_number in pendientes.iterator():
+        e164 = normalizar_telefono(phone_number)
+        if e164 is None:
+            continue
+        if not Usuario.objects.filter(phone_e164=e164).exists():
+            resultado['asignados'].append((usuario_id, e164))
+            if not dry_run:
+                Usuario.objects.filter(id=usuario_id, phone_e164__isnull=True).update(phone_e164=e164)
+        else:
+            resultado['quitados'].append((usuario_id, phone_number))
+            if not dry_run:
+                Usuario.objects.filter(id=usuario_id, phone_e164__isnull=True).update(phone_number=None)
+    return resultado
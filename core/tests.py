@@ -1,3 +1,101 @@
-from django.test import TestCase
+from datetime import datetime, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import admin
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import (
+    BloqueoHorario, HorarioDisponibilidad, Negocio, Profesional, Servicio, Turno, Usuario,
+)
+
+
+# Las changelists cargan el CSS del admin: sin collectstatic el manifest no existe
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class ChangelistAdminQueriesTest(TestCase):
+    """
+    Las changelists del admin hacen la misma cantidad de queries con cualquier
+    tamaño de página (sin N+1 por fila ni por opción de los filtros).
+    """
+
+    FILAS = 30
+    TAMANIOS_PAGINA = (5, 25)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = Usuario.objects.create_superuser('admin_test', 'admin@test.com', 'clave-test')
+        negocios = [
+            Negocio.objects.create(nombre=f'Negocio test {i}', propietario=cls.superuser) for i in range(2)
+        ]
+        servicios = [
+            Servicio.objects.create(name=f'Servicio test {i}', duration_minutes=30, price=100, negocio=negocio)
+            for i, negocio in enumerate(negocios)
+        ]
+        usuarios = Usuario.objects.bulk_create([
+            Usuario(username=f'usuario_test_{i}', first_name='Nombre', last_name=f'Apellido {i}')
+            for i in range(cls.FILAS)
+        ])
+        profesionales = Profesional.objects.bulk_create([
+            Profesional(user=usuario, negocio=negocios[i % 2]) for i, usuario in enumerate(usuarios)
+        ])
+
+        inicio = datetime(2026, 1, 5, 9, 0)
+        HorarioDisponibilidad.objects.bulk_create([
+            HorarioDisponibilidad(
+                profesional=profesional, negocio=profesional.negocio,
+                day_of_week=0, start_time=time(9), end_time=time(18),
+            )
+            for profesional in profesionales
+        ])
+        BloqueoHorario.objects.bulk_create([
+            BloqueoHorario(
+                profesional=profesional, negocio=profesional.negocio,
+                start_datetime=inicio, end_datetime=inicio + timedelta(hours=1),
+            )
+            for profesional in profesionales
+        ])
+        Turno.objects.bulk_create([
+            Turno(
+                cliente=usuarios[(i + 1) % cls.FILAS], profesional=profesional,
+                servicio=servicios[i % 2], negocio=profesional.negocio,
+                start_datetime=inicio + timedelta(days=i),
+                end_datetime=inicio + timedelta(days=i, minutes=30),
+            )
+            for i, profesional in enumerate(profesionales)
+        ])
+
+    def setUp(self):
+        self.client.force_login(self.superuser)
+
+    def _queries_changelist(self, modelo, tamanio_pagina):
+        model_admin = admin.site._registry[modelo]
+        url = reverse(f'admin:core_{modelo._meta.model_name}_changelist')
+        with mock.patch.object(model_admin, 'list_per_page', tamanio_pagina):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['cl'].result_list), tamanio_pagina)
+        return len(queries)
+
+    def _assert_queries_constantes(self, modelo):
+        chica, grande = self.TAMANIOS_PAGINA
+        esperadas = self._queries_changelist(modelo, chica)
+        model_admin = admin.site._registry[modelo]
+        with mock.patch.object(model_admin, 'list_per_page', grande):
+            with self.assertNumQueries(esperadas):
+                response = self.client.get(reverse(f'admin:core_{modelo._meta.model_name}_changelist'))
+        self.assertEqual(len(response.context['cl'].result_list), grande)
+
+    def test_changelist_turnos(self):
+        self._assert_queries_constantes(Turno)
+
+    def test_changelist_bloqueos(self):
+        self._assert_queries_constantes(BloqueoHorario)
+
+    def test_changelist_horarios(self):
+        self._assert_queries_constantes(HorarioDisponibilidad)
+
+    def test_changelist_profesionales(self):
+        self._assert_queries_constantes(Profesional)
@@ -1,9 +1,10 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from .views import (
     # APIs de Autenticación
-    RegistroView, BotRegistroView, mis_negocios, seleccionar_negocio, unirse_negocio, negocios_disponibles, LoginView, LogoutView, PerfilView, CambiarContrasenaView,
+    RegistroView, BotRegistroView, bot_bootstrap, mis_negocios, seleccionar_negocio, unirse_negocio, negocios_disponibles, LoginView, LogoutView, PerfilView, CambiarContrasenaView,
     
     # APIs Públicas
     servicios_publicos, profesionales_disponibles, resumen_negocio, listar_negocios,
@@ -24,9 +25,42 @@ from .views import (
     ProximosDiasDisponiblesView,
 
     # API Check User
-    check_user
+    check_user,
+
+    # Delta-sync de turnos para la app móvil
+    SincronizarTurnosView,
+
+    # Suscripción iCalendar del profesional
+    enlace_ical_profesional,
+
+    # Exportación de turnos para el dueño del negocio
+    exportar_turnos_negocio,
+
+    # Analíticas para el dueño del negocio
+    analiticas_negocio,
+    mapa_ocupacion_negocio,
+
+    # Eventos de agenda en tiempo real (SSE)
+    eventos_agenda_profesional,
+
+    # Versiones async de las consultas públicas del bot (servidor ASGI)
+    servicios_publicos_async, profesionales_disponibles_async,
+    consultar_disponibilidad_async, proximos_dias_disponibles_async
 )
 
+# Con VISTAS_PUBLICAS_ASYNC (servido por uvicorn / daphne) las consultas públicas
+# que usa el bot responden con las vistas async, en las mismas URLs
+if settings.VISTAS_PUBLICAS_ASYNC:
+    vista_servicios_publicos = servicios_publicos_async
+    vista_profesionales_disponibles = profesionales_disponibles_async
+    vista_consultar_disponibilidad = consultar_disponibilidad_async
+    vista_proximos_dias_disponibles = proximos_dias_disponibles_async
+else:
+    vista_servicios_publicos = servicios_publicos
+    vista_profesionales_disponibles = profesionales_disponibles
+    vista_consultar_disponibilidad = consultar_disponibilidad
+    vista_proximos_dias_disponibles = ProximosDiasDisponiblesView.as_view()
+
 urlpatterns = [
     # =============================================================================
     # RUTAS DE AUTENTICACIÓN
@@ -56,14 +90,16 @@ urlpatterns = [
     
     # Registro desde bot de WhatsApp
     path('bot/register/', BotRegistroView.as_view(), name='bot_registro'),
+    # Contexto inicial de la conversación (usuario + servicios + profesionales + próximos días)
+    path('bot/bootstrap/', bot_bootstrap, name='bot_bootstrap'),
     
     # =============================================================================
     # RUTAS PÚBLICAS (SIN AUTENTICACIÓN)
     # =============================================================================
     
     path('negocios/', listar_negocios, name='listar_negocios'),
-    path('servicios-publicos/', servicios_publicos, name='servicios_publicos'),
-    path('profesionales-disponibles/', profesionales_disponibles, name='profesionales_disponibles'),
+    path('servicios-publicos/', vista_servicios_publicos, name='servicios_publicos'),
+    path('profesionales-disponibles/', vista_profesionales_disponibles, name='profesionales_disponibles'),
     path('resumen-negocio/', resumen_negocio, name='resumen_negocio'),
     
     # =============================================================================
@@ -71,11 +107,11 @@ urlpatterns = [
     # =============================================================================
     
     # Consultar disponibilidad (público)
-    path('reservas/disponibilidad/', consultar_disponibilidad, name='consultar_disponibilidad'),
+    path('reservas/disponibilidad/', vista_consultar_disponibilidad, name='consultar_disponibilidad'),
     # Nuevo endpoint optimizado para obtener días con disponibilidad (público)
     path('reservas/dias-con-disponibilidad/', DiasConDisponibilidadView.as_view(), name='dias_con_disponibilidad'),
     # Endpoint para WhatsApp Flow - Próximos N días disponibles
-    path('reservas/disponibilidad/proximos-dias/', ProximosDiasDisponiblesView.as_view(), name='proximos_dias_disponibles'),
+    path('reservas/disponibilidad/proximos-dias/', vista_proximos_dias_disponibles, name='proximos_dias_disponibles'),
     # Consultar disponibilidad (privada)
     path('disponibilidad/', disponibilidad_profesional, name='disponibilidad_profesional'),
     
@@ -83,6 +119,8 @@ urlpatterns = [
     path('reservas/crear/', CrearTurnoView.as_view(), name='crear_turno'),
     path('reservas/mis-turnos/', MisTurnosView.as_view(), name='mis_turnos'),
     path('reservas/cancelar/<int:turno_id>/', CancelarTurnoView.as_view(), name='cancelar_turno'),
+    # Delta-sync del cache local de la app (cliente o profesional)
+    path('reservas/sync/', SincronizarTurnosView.as_view(), name='sincronizar_turnos'),
     
     # =============================================================================
     # RUTAS DE AGENDA DEL PROFESIONAL
@@ -90,8 +128,18 @@ urlpatterns = [
     
     # Agenda del profesional
     path('reservas/agenda-profesional/', AgendaProfesionalView.as_view(), name='agenda_profesional'),
+    # Cambios de la agenda en tiempo real (Server-Sent Events, servidor ASGI)
+    path('reservas/agenda-profesional/eventos/', eventos_agenda_profesional, name='eventos_agenda_profesional'),
     path('reservas/dias-con-turnos/', DiasConTurnosView.as_view(), name='dias_con_turnos'),
     path('reservas/completar/<int:turno_id>/', CompletarTurnoView.as_view(), name='completar_turno'),
     path('reservas/cancelar-profesional/<int:turno_id>/', CancelarTurnoProfesionalView.as_view(), name='cancelar_turno_profesional'),
+    # Enlace de suscripción al calendario (feed en /ical/<token>.ics)
+    path('profesional/ical/', enlace_ical_profesional, name='enlace_ical_profesional'),
+    # Historial de turnos en CSV / JSON Lines (streaming)
+    path('negocio/exportar-turnos/', exportar_turnos_negocio, name='exportar_turnos_negocio'),
+    # Ingresos, ocupación y cancelaciones (desde el rollup diario)
+    path('negocio/analiticas/', analiticas_negocio, name='analiticas_negocio'),
+    # Mapa de calor día de la semana × franja horaria
+    path('negocio/ocupacion/', mapa_ocupacion_negocio, name='mapa_ocupacion_negocio'),
 
 ]
\ No newline at end of file
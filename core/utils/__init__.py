@@ -4,11 +4,23 @@ Incluye helpers para emails, validaciones, etc.
 """
 
 from .email_utils import (
+    construir_email_bienvenida_usuario,
+    construir_email_cancelacion_turno,
+    construir_email_confirmacion_turno,
+    construir_email_recordatorio_turno,
     enviar_email_bienvenida_usuario,
     enviar_email_confirmacion_turno,
+    enviar_emails_en_lote,
 )
+from .telefonos import normalizar_telefono
 
 __all__ = [
+    'construir_email_bienvenida_usuario',
+    'construir_email_cancelacion_turno',
+    'construir_email_confirmacion_turno',
+    'construir_email_recordatorio_turno',
     'enviar_email_bienvenida_usuario',
     'enviar_email_confirmacion_turno',
+    'enviar_emails_en_lote',
+    'normalizar_telefono',
 ]
@@ -3,15 +3,20 @@ Utilidades para envío de emails en el sistema Ordema.
 Centraliza toda la lógica de emails para facilitar mantenimiento y escalabilidad.
 """
 
-from django.core.mail import send_mail, EmailMultiAlternatives
+from django.core.mail import send_mail, EmailMultiAlternatives, get_connection
 from django.conf import settings
+from django.template.loader import render_to_string
 from icalendar import Calendar, Event
 from datetime import datetime
+import smtplib
 
+# Errores que indican que la sesión SMTP se cayó (vale la pena reconectar y reintentar)
+ERRORES_CONEXION_SMTP = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
 
-def enviar_email_bienvenida_usuario(user, password, negocio):
+
+def construir_email_bienvenida_usuario(user, password, negocio):
     """
-    Envía email de bienvenida al usuario recién registrado con sus credenciales.
+    Construye (sin enviar) el email de bienvenida con las credenciales del usuario.
     
     Args:
         user: Instancia del modelo Usuario
@@ -19,18 +24,15 @@ def enviar_email_bienvenida_usuario(user, password, negocio):
         negocio: Instancia del modelo Negocio al que fue agregado
     
     Returns:
-        bool: True si se envió exitosamente, False si hubo error
+        EmailMultiAlternatives | None: None si el usuario no tiene email
     """
-    try:
-        # Validar que el usuario tenga email
-        if not user.email:
-            print(f"[EMAIL] Usuario {user.username} no tiene email registrado")
-            return False
-        
-        asunto = f'Bienvenido a Ordema - Tus credenciales de acceso'
-        
-        # Generar contenido texto plano
-        texto_plano = f"""
+    if not user.email:
+        return None
+    
+    asunto = f'Bienvenido a Ordema - Tus credenciales de acceso'
+    
+    # Generar contenido texto plano
+    texto_plano = f"""
 Hola {user.first_name},
 
 ¡Bienvenido a Ordema!
@@ -50,21 +52,42 @@ Link de acceso directo al chatbot OrdemAI: https://wa.me/message/BYVIR2BDKTACD1
 
 Saludos,
 El equipo de {negocio.nombre} & Ordema.
-        """.strip()
-        
-        # Generar contenido HTML
-        html_content = _construir_template_html_bienvenida(user, password, negocio)
-        
-        # Crear mensaje con alternativas (texto + HTML)
-        email = EmailMultiAlternatives(
-            subject=asunto,
-            body=texto_plano,
-            from_email=settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'noreply@ordema.app',
-            to=[user.email]
-        )
-        
-        # Adjuntar versión HTML
-        email.attach_alternative(html_content, "text/html")
+    """.strip()
+    
+    # Generar contenido HTML
+    html_content = _construir_template_html_bienvenida(user, password, negocio)
+    
+    # Crear mensaje con alternativas (texto + HTML)
+    email = EmailMultiAlternatives(
+        subject=asunto,
+        body=texto_plano,
+        from_email=settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'noreply@ordema.app',
+        to=[user.email]
+    )
+    
+    # Adjuntar versión HTML
+    email.attach_alternative(html_content, "text/html")
+    
+    return email
+
+
+def enviar_email_bienvenida_usuario(user, password, negocio):
+    """
+    Envía email de bienvenida al usuario recién registrado con sus credenciales.
+    
+    Args:
+        user: Instancia del modelo Usuario
+        password: Contraseña temporal generada (en texto plano)
+        negocio: Instancia del modelo Negocio al que fue agregado
+    
+    Returns:
+        bool: True si se envió exitosamente, False si hubo error
+    """
+    try:
+        email = construir_email_bienvenida_usuario(user, password, negocio)
+        if email is None:
+            print(f"[EMAIL] Usuario {user.username} no tiene email registrado")
+            return False
         
         # Enviar
         email.send(fail_silently=False)
@@ -135,6 +158,49 @@ Duración: {turno.servicio.duration_minutes} minutos
     return cal.to_ical()
 
 
+def construir_email_confirmacion_turno(turno):
+    """
+    Construye (sin enviar) el email de confirmación de turno con el .ics adjunto.
+    
+    Args:
+        turno: Instancia del modelo Turno
+    
+    Returns:
+        EmailMultiAlternatives | None: None si el cliente no tiene email
+    """
+    if not turno.cliente.email:
+        return None
+    
+    asunto = f'Confirmación de Turno - {turno.negocio.nombre}'
+    
+    # Generar contenido texto plano
+    texto_plano = _construir_texto_plano_turno(turno)
+    
+    # Generar contenido HTML
+    html_content = _construir_template_html_turno(turno)
+    
+    # Crear mensaje con alternativas (texto + HTML)
+    email = EmailMultiAlternatives(
+        subject=asunto,
+        body=texto_plano,
+        from_email=settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'noreply@ordema.app',
+        to=[turno.cliente.email]
+    )
+    
+    # Adjuntar versión HTML
+    email.attach_alternative(html_content, "text/html")
+    
+    # Generar y adjuntar archivo .ics
+    ics_content = generar_archivo_ics(turno)
+    email.attach(
+        f'turno_{turno.id}.ics',
+        ics_content,
+        'text/calendar'
+    )
+    
+    return email
+
+
 def enviar_email_confirmacion_turno(turno):
     """
     Envía email de confirmación de turno con archivo .ics adjunto.
@@ -146,38 +212,11 @@ def enviar_email_confirmacion_turno(turno):
         bool: True si se envió exitosamente, False si hubo error
     """
     try:
-        # Validar que el cliente tenga email
-        if not turno.cliente.email:
+        email = construir_email_confirmacion_turno(turno)
+        if email is None:
             print(f"[EMAIL] Cliente {turno.cliente.username} no tiene email registrado")
             return False
         
-        asunto = f'Confirmación de Turno - {turno.negocio.nombre}'
-        
-        # Generar contenido texto plano
-        texto_plano = _construir_texto_plano_turno(turno)
-        
-        # Generar contenido HTML
-        html_content = _construir_template_html_turno(turno)
-        
-        # Crear mensaje con alternativas (texto + HTML)
-        email = EmailMultiAlternatives(
-            subject=asunto,
-            body=texto_plano,
-            from_email=settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'noreply@ordema.app',
-            to=[turno.cliente.email]
-        )
-        
-        # Adjuntar versión HTML
-        email.attach_alternative(html_content, "text/html")
-        
-        # Generar y adjuntar archivo .ics
-        ics_content = generar_archivo_ics(turno)
-        email.attach(
-            f'turno_{turno.id}.ics',
-            ics_content,
-            'text/calendar'
-        )
-        
         # Enviar
         email.send(fail_silently=False)
         print(f"[EMAIL] Confirmación de turno enviada a {turno.cliente.email}")
@@ -188,6 +227,180 @@ def enviar_email_confirmacion_turno(turno):
         return False
 
 
+def construir_email_recordatorio_turno(turno, cuando):
+    """
+    Construye (sin enviar) el email de recordatorio de un turno próximo.
+    
+    Args:
+        turno: Instancia del modelo Turno
+        cuando: Texto relativo para el asunto y el encabezado (ej: 'mañana', 'en 2 horas')
+    
+    Returns:
+        EmailMultiAlternatives | None: None si el cliente no tiene email
+    """
+    if not turno.cliente.email:
+        return None
+    
+    asunto = f'Recordatorio: tu turno es {cuando} - {turno.negocio.nombre}'
+    
+    texto_plano = f"""
+Hola {turno.cliente.first_name},
+
+Te recordamos que tienes un turno en {turno.negocio.nombre} {cuando}:
+
+📌 Servicio: {turno.servicio.name}
+👤 Profesional: {turno.profesional.user.get_full_name()}
+📅 Fecha: {turno.start_datetime.strftime('%d/%m/%Y')}
+⏰ Horario: {turno.start_datetime.strftime('%H:%M')} hs.
+"""
+    if turno.negocio.address:
+        texto_plano += f"📍 Dirección: {turno.negocio.address}\n"
+    texto_plano += f"""
+¿No puedes asistir? Recuerda que puedes cancelar tu turno desde la app hasta 2 horas antes de la hora programada.
+
+¡Te esperamos!
+
+Saludos,
+{turno.negocio.nombre}
+    """
+    
+    html_content = render_to_string('emails/recordatorio_turno.html', {
+        'turno': turno,
+        'cuando': cuando,
+        'colores': COLORES_EMAIL,
+        'negocio': turno.negocio,
+    })
+    
+    email = EmailMultiAlternatives(
+        subject=asunto,
+        body=texto_plano.strip(),
+        from_email=settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'noreply@ordema.app',
+        to=[turno.cliente.email]
+    )
+    email.attach_alternative(html_content, "text/html")
+    
+    return email
+
+
+def construir_email_cancelacion_turno(turno):
+    """
+    Construye (sin enviar) el email que avisa al cliente que su turno fue cancelado.
+    
+    Args:
+        turno: Instancia del modelo Turno (ya cancelado)
+    
+    Returns:
+        EmailMultiAlternatives | None: None si el cliente no tiene email
+    """
+    if not turno.cliente.email:
+        return None
+    
+    asunto = f'Turno cancelado - {turno.negocio.nombre}'
+    
+    texto_plano = f"""
+Hola {turno.cliente.first_name},
+
+Tu turno en {turno.negocio.nombre} fue cancelado:
+
+📌 Servicio: {turno.servicio.name}
+👤 Profesional: {turno.profesional.user.get_full_name()}
+📅 Fecha: {turno.start_datetime.strftime('%d/%m/%Y')}
+⏰ Horario: {turno.start_datetime.strftime('%H:%M')} hs.
+
+Puedes reservar un nuevo turno desde la app cuando quieras.
+
+Saludos,
+{turno.negocio.nombre}
+    """
+    
+    html_content = render_to_string('emails/cancelacion_turno.html', {
+        'turno': turno,
+        'colores': COLORES_EMAIL,
+        'negocio': turno.negocio,
+    })
+    
+    email = EmailMultiAlternatives(
+        subject=asunto,
+        body=texto_plano.strip(),
+        from_email=settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'noreply@ordema.app',
+        to=[turno.cliente.email]
+    )
+    email.attach_alternative(html_content, "text/html")
+    
+    return email
+
+
+def enviar_emails_en_lote(mensajes, batch_size=None):
+    """
+    Envía muchos emails reutilizando una sola sesión SMTP por lote.
+    
+    Con `email.send()` cada mensaje abre y cierra su propia conexión TLS;
+    acá se abre una conexión por cada `batch_size` mensajes. Si la sesión
+    se cae a mitad de lote, se reconecta y se reintenta ese mensaje una vez.
+    
+    Args:
+        mensajes: Lista de EmailMessage / EmailMultiAlternatives
+        batch_size: Mensajes por conexión (default: settings.EMAIL_BATCH_SIZE o 50)
+    
+    Returns:
+        list: Un elemento por mensaje, en el mismo orden: None si se envió,
+              o la excepción si falló
+    """
+    batch_size = batch_size or getattr(settings, 'EMAIL_BATCH_SIZE', 50)
+    resultados = []
+    
+    for inicio in range(0, len(mensajes), batch_size):
+        lote = mensajes[inicio:inicio + batch_size]
+        connection = get_connection(fail_silently=False)
+        
+        try:
+            connection.open()
+        except Exception as e:
+            # Sin conexión no se puede enviar nada del lote
+            _manejar_error_email(e, 'conexion_lote')
+            resultados.extend([e] * len(lote))
+            continue
+        
+        try:
+            for mensaje in lote:
+                resultados.append(_enviar_con_reconexion(connection, mensaje))
+        finally:
+            try:
+                connection.close()
+            except Exception:
+                pass
+    
+    return resultados
+
+
+def _enviar_con_reconexion(connection, mensaje):
+    """
+    Envía un mensaje por una conexión ya abierta. Si la sesión se cayó,
+    reconecta y reintenta una vez.
+    
+    Returns:
+        None si se envió, o la excepción si falló
+    """
+    try:
+        connection.send_messages([mensaje])
+        return None
+    except ERRORES_CONEXION_SMTP as e:
+        _manejar_error_email(e, 'reconexion_lote')
+    except Exception as e:
+        return e
+    
+    try:
+        connection.close()
+    except Exception:
+        pass
+    try:
+        connection.open()
+        connection.send_messages([mensaje])
+        return None
+    except Exception as e:
+        return e
+
+
 def _construir_texto_plano_turno(turno):
     """
     Construye el contenido en texto plano para el email de confirmación.
@@ -240,10 +453,21 @@ Saludos,
     return texto.strip()
 
 
+# Colores neutros corporativos (sin personalización por negocio)
+COLORES_EMAIL = {
+    'primary': '#4A90E2',  # Azul corporativo
+    'dark': '#2C3E50',     # Gris oscuro
+    'light': '#F7F9FC',    # Gris claro de fondo
+    'text': '#34495E',     # Gris texto
+    'border': '#E1E8ED',   # Borde gris claro
+    'success': '#27AE60',  # Verde para destacar credenciales
+    'danger': '#C0392B',   # Rojo para cancelaciones
+}
+
 def _construir_template_html_turno(turno):
     """
-    Construye el template HTML para el email de confirmación de turno.
-    Usa colores neutros corporativos (sin personalización por negocio).
+    Renderiza el template HTML para el email de confirmación de turno
+    (emails/confirmacion_turno.html).
     
     Args:
         turno: Instancia del modelo Turno
@@ -251,170 +475,17 @@ def _construir_template_html_turno(turno):
     Returns:
         str: HTML del email
     """
-    fecha = turno.start_datetime.strftime('%d/%m/%Y')
-    hora_inicio = turno.start_datetime.strftime('%H:%M')
-    hora_fin = turno.end_datetime.strftime('%H:%M')
-    
-    # Colores neutros corporativos
-    COLOR_PRIMARY = '#4A90E2'  # Azul corporativo
-    COLOR_DARK = '#2C3E50'     # Gris oscuro
-    COLOR_LIGHT = '#F7F9FC'    # Gris claro de fondo
-    COLOR_TEXT = '#34495E'     # Gris texto
-    COLOR_BORDER = '#E1E8ED'   # Borde gris claro
-    
-    html = f"""
-<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Confirmación de Turno</title>
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: {COLOR_LIGHT};">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: {COLOR_LIGHT}; padding: 20px 0;">
-        <tr>
-            <td align="center">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); overflow: hidden;">
-                    
-                    <!-- Header -->
-                    <tr>
-                        <td style="background-color: {COLOR_PRIMARY}; padding: 30px 40px; text-align: center;">
-                            <h1 style="margin: 0; color: #ffffff; font-size: 24px; font-weight: 600;">
-                                ✅ Turno Confirmado
-                            </h1>
-                        </td>
-                    </tr>
-                    
-                    <!-- Body -->
-                    <tr>
-                        <td style="padding: 40px;">
-                            <p style="margin: 0 0 20px 0; color: {COLOR_TEXT}; font-size: 16px; line-height: 1.5;">
-                                Hola <strong>{turno.cliente.first_name}</strong>,
-                            </p>
-                            <p style="margin: 0 0 30px 0; color: {COLOR_TEXT}; font-size: 16px; line-height: 1.5;">
-                                ¡Tu turno ha sido confirmado exitosamente! A continuación encontrarás todos los detalles:
-                            </p>
-                            
-                            <!-- Detalles del Turno -->
-                            <table width="100%" cellpadding="0" cellspacing="0" style="background-color: {COLOR_LIGHT}; border-radius: 6px; border: 1px solid {COLOR_BORDER};">
-                                <tr>
-                                    <td style="padding: 25px;">
-                                        <table width="100%" cellpadding="0" cellspacing="0">
-                                            <tr>
-                                                <td style="padding: 8px 0;">
-                                                    <span style="color: {COLOR_TEXT}; font-size: 14px; display: inline-block; width: 120px;">📌 Servicio:</span>
-                                                    <strong style="color: {COLOR_DARK}; font-size: 14px;">{turno.servicio.name}</strong>
-                                                </td>
-                                            </tr>
-                                            <tr>
-                                                <td style="padding: 8px 0;">
-                                                    <span style="color: {COLOR_TEXT}; font-size: 14px; display: inline-block; width: 120px;">👤 Profesional:</span>
-                                                    <strong style="color: {COLOR_DARK}; font-size: 14px;">{turno.profesional.user.get_full_name()}</strong>
-                                                </td>
-                                            </tr>
-                                            <tr>
-                                                <td style="padding: 8px 0;">
-                                                    <span style="color: {COLOR_TEXT}; font-size: 14px; display: inline-block; width: 120px;">📅 Fecha:</span>
-                                                    <strong style="color: {COLOR_DARK}; font-size: 14px;">{fecha}</strong>
-                                                </td>
-                                            </tr>
-                                            <tr>
-                                                <td style="padding: 8px 0;">
-                                                    <span style="color: {COLOR_TEXT}; font-size: 14px; display: inline-block; width: 120px;">⏰ Horario:</span>
-                                                    <strong style="color: {COLOR_DARK}; font-size: 14px;">{hora_inicio} - {hora_fin}</strong>
-                                                </td>
-                                            </tr>
-                                            <tr>
-                                                <td style="padding: 8px 0;">
-                                                    <span style="color: {COLOR_TEXT}; font-size: 14px; display: inline-block; width: 120px;">⏱️  Duración:</span>
-                                                    <strong style="color: {COLOR_DARK}; font-size: 14px;">{turno.servicio.duration_minutes} minutos</strong>
-                                                </td>
-                                            </tr>
-                                            <tr>
-                                                <td style="padding: 8px 0;">
-                                                    <span style="color: {COLOR_TEXT}; font-size: 14px; display: inline-block; width: 120px;">💰 Precio:</span>
-                                                    <strong style="color: {COLOR_DARK}; font-size: 14px;">${turno.servicio.price}</strong>
-                                                </td>
-                                            </tr>
-    """
-    
-    # Agregar dirección si existe
-    if turno.negocio.address:
-        html += f"""
-                                            <tr>
-                                                <td style="padding: 8px 0;">
-                                                    <span style="color: {COLOR_TEXT}; font-size: 14px; display: inline-block; width: 120px;">📍 Dirección:</span>
-                                                    <strong style="color: {COLOR_DARK}; font-size: 14px;">{turno.negocio.address}</strong>
-                                                </td>
-                                            </tr>
-        """
-    
-    # Agregar notas si existen
-    if turno.notes:
-        html += f"""
-                                            <tr>
-                                                <td style="padding: 8px 0;">
-                                                    <span style="color: {COLOR_TEXT}; font-size: 14px; display: inline-block; width: 120px;">📝 Notas:</span>
-                                                    <strong style="color: {COLOR_DARK}; font-size: 14px;">{turno.notes}</strong>
-                                                </td>
-                                            </tr>
-        """
-    
-    html += f"""
-                                        </table>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <!-- Información sobre archivo .ics -->
-                            <div style="margin-top: 30px; padding: 20px; background-color: #FFF9E6; border-left: 4px solid #FFC107; border-radius: 4px;">
-                                <p style="margin: 0; color: {COLOR_TEXT}; font-size: 14px; line-height: 1.6;">
-                                    <strong>📅 Agregar a tu calendario:</strong><br>
-                                    Hemos adjuntado un archivo <code>.ics</code> que puedes usar para agregar este turno a Google Calendar, Outlook, Apple Calendar o cualquier otra aplicación de calendario.
-                                </p>
-                            </div>
-                            
-                            <!-- Política de cancelación -->
-                            <div style="margin-top: 20px; padding: 15px; background-color: {COLOR_LIGHT}; border-radius: 4px;">
-                                <p style="margin: 0; color: {COLOR_TEXT}; font-size: 13px; line-height: 1.5;">
-                                    <strong>ℹ️  Política de cancelación:</strong><br>
-                                    Recuerda que puedes cancelar tu turno desde la app hasta 2 horas antes de la hora programada.
-                                </p>
-                            </div>
-                            
-                            <p style="margin: 30px 0 0 0; color: {COLOR_TEXT}; font-size: 16px; line-height: 1.5;">
-                                ¡Te esperamos!
-                            </p>
-                        </td>
-                    </tr>
-                    
-                    <!-- Footer -->
-                    <tr>
-                        <td style="background-color: {COLOR_LIGHT}; padding: 30px; text-align: center; border-top: 1px solid {COLOR_BORDER};">
-                            <p style="margin: 0 0 10px 0; color: {COLOR_DARK}; font-size: 16px; font-weight: 600;">
-                                {turno.negocio.nombre}
-                            </p>
-                            <p style="margin: 0; color: {COLOR_TEXT}; font-size: 13px;">
-                                Powered by <strong>Ordema</strong>
-                            </p>
-                        </td>
-                    </tr>
-                    
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>
-    """
-    
-    return html
+    return render_to_string('emails/confirmacion_turno.html', {
+        'turno': turno,
+        'negocio': turno.negocio,
+        'colores': COLORES_EMAIL,
+    })
 
 
 def _construir_template_html_bienvenida(user, password, negocio):
     """
-    Construye el template HTML para el email de bienvenida.
-    Usa colores neutros corporativos (sin personalización por negocio).
+    Renderiza el template HTML para el email de bienvenida
+    (emails/bienvenida_usuario.html).
     
     Args:
         user: Instancia del modelo Usuario
@@ -424,128 +495,12 @@ def _construir_template_html_bienvenida(user, password, negocio):
     Returns:
         str: HTML del email
     """
-    # Colores neutros corporativos (mismos que el template de turnos)
-    COLOR_PRIMARY = '#4A90E2'  # Azul corporativo
-    COLOR_DARK = '#2C3E50'     # Gris oscuro
-    COLOR_LIGHT = '#F7F9FC'    # Gris claro de fondo
-    COLOR_TEXT = '#34495E'     # Gris texto
-    COLOR_BORDER = '#E1E8ED'   # Borde gris claro
-    COLOR_SUCCESS = '#27AE60'  # Verde para destacar credenciales
-    
-    html = f"""
-<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Bienvenido a Ordema</title>
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: {COLOR_LIGHT};">
-    <table width="100%" cellpadding="0" cellspacing="0" style="background-color: {COLOR_LIGHT}; padding: 20px 0;">
-        <tr>
-            <td align="center">
-                <table width="600" cellpadding="0" cellspacing="0" style="background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); overflow: hidden;">
-                    
-                    <!-- Header -->
-                    <tr>
-                        <td style="background-color: {COLOR_SUCCESS}; padding: 30px 40px; text-align: center;">
-                            <h1 style="margin: 0; color: #ffffff; font-size: 24px; font-weight: 600;">
-                                🎉 ¡Bienvenido a Ordema!
-                            </h1>
-                        </td>
-                    </tr>
-                    
-                    <!-- Body -->
-                    <tr>
-                        <td style="padding: 40px;">
-                            <p style="margin: 0 0 20px 0; color: {COLOR_TEXT}; font-size: 16px; line-height: 1.5;">
-                                Hola <strong>{user.first_name}</strong>,
-                            </p>
-                            <p style="margin: 0 0 30px 0; color: {COLOR_TEXT}; font-size: 16px; line-height: 1.5;">
-                                Tu cuenta ha sido creada exitosamente y ahora eres parte de <strong>{negocio.nombre}</strong>. ¡Estamos muy contentos de tenerte con nosotros!
-                            </p>
-                            
-                            <!-- Credenciales de Acceso -->
-                            <div style="background-color: {COLOR_LIGHT}; border-radius: 6px; border: 1px solid {COLOR_BORDER}; padding: 25px; margin-bottom: 30px;">
-                                <h2 style="margin: 0 0 20px 0; color: {COLOR_DARK}; font-size: 18px; font-weight: 600;">
-                                    🔑 Tus credenciales de acceso
-                                </h2>
-                                <table width="100%" cellpadding="0" cellspacing="0">
-                                    <tr>
-                                        <td style="padding: 8px 0;">
-                                            <span style="color: {COLOR_TEXT}; font-size: 14px; display: inline-block; width: 120px;">👤 Usuario:</span>
-                                            <strong style="color: {COLOR_DARK}; font-size: 14px;">{user.username}</strong>
-                                        </td>
-                                    </tr>
-                                    <tr>
-                                        <td style="padding: 8px 0;">
-                                            <span style="color: {COLOR_TEXT}; font-size: 14px; display: inline-block; width: 120px;">🔐 Contraseña:</span>
-                                            <code style="background-color: #ffffff; padding: 4px 8px; border-radius: 4px; border: 1px solid {COLOR_BORDER}; color: {COLOR_DARK}; font-size: 14px; font-family: 'Courier New', monospace;">{password}</code>
-                                        </td>
-                                    </tr>
-                                </table>
-                            </div>
-                            
-                            <!-- Advertencia de seguridad -->
-                            <div style="margin-bottom: 30px; padding: 15px; background-color: #FFF9E6; border-left: 4px solid #FFC107; border-radius: 4px;">
-                                <p style="margin: 0; color: {COLOR_TEXT}; font-size: 14px; line-height: 1.6;">
-                                    ⚠️  <strong>Importante:</strong> Esta es una contraseña temporal. Por tu seguridad, te recomendamos cambiarla una vez que accedas a la aplicación por primera vez.
-                                </p>
-                            </div>
-                            
-                            <!-- Formas de acceso -->
-                            <div style="background-color: #E8F5E9; border-radius: 6px; padding: 20px; margin-bottom: 25px;">
-                                <h3 style="margin: 0 0 15px 0; color: {COLOR_DARK}; font-size: 16px; font-weight: 600;">
-                                    📱 ¿Cómo puedes acceder a Ordema?
-                                </h3>
-                                <ul style="margin: 0; padding-left: 20px; color: {COLOR_TEXT}; font-size: 14px; line-height: 1.8;">
-                                    <li>Descarga la <strong>aplicación móvil de Ordema</strong> e inicia sesión con tus credenciales</li>
-                                    <li>Chatea con nuestro asistente <strong>OrdemAI</strong> en WhatsApp desde tu número registrado</li>
-                                </ul>
-                            </div>
-                            
-                            <!-- Botón de WhatsApp -->
-                            <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom: 25px;">
-                                <tr>
-                                    <td align="center" style="padding: 15px 0;">
-                                        <a href="https://wa.me/message/BYVIR2BDKTACD1" style="display: inline-block; padding: 14px 30px; background-color: #25D366; color: #ffffff; text-decoration: none; border-radius: 6px; font-size: 15px; font-weight: 600;">
-                                            💬 Chatear con OrdemAI
-                                        </a>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <p style="margin: 0; color: {COLOR_TEXT}; font-size: 14px; text-align: center; line-height: 1.5;">
-                                WhatsApp: <strong>+54 9 11 2559-3285</strong>
-                            </p>
-                            
-                            <p style="margin: 30px 0 0 0; color: {COLOR_TEXT}; font-size: 16px; line-height: 1.5;">
-                                ¡Te esperamos! 🚀
-                            </p>
-                        </td>
-                    </tr>
-                    
-                    <!-- Footer -->
-                    <tr>
-                        <td style="background-color: {COLOR_LIGHT}; padding: 30px; text-align: center; border-top: 1px solid {COLOR_BORDER};">
-                            <p style="margin: 0 0 10px 0; color: {COLOR_DARK}; font-size: 16px; font-weight: 600;">
-                                {negocio.nombre}
-                            </p>
-                            <p style="margin: 0; color: {COLOR_TEXT}; font-size: 13px;">
-                                Powered by <strong>Ordema</strong>
-                            </p>
-                        </td>
-                    </tr>
-                    
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>
-    """
-    
-    return html
+    return render_to_string('emails/bienvenida_usuario.html', {
+        'user': user,
+        'password': password,
+        'negocio': negocio,
+        'colores': COLORES_EMAIL,
+    })
 
 
 def _manejar_error_email(error, contexto):
@@ -0,0 +1,33 @@
+"""
+Normalización de números de teléfono.
+
+El bot de WhatsApp envía el número sin '+', la app lo guarda como lo tipea el
+usuario ('+54 9 11 7361-6085', '5491173616085', ...). Para buscar usuarios por
+teléfono se compara siempre la forma E.164 en dígitos (sin '+').
+"""
+
+import re
+from typing import Optional
+
+# E.164: hasta 15 dígitos incluyendo el código de país
+E164_MAX_DIGITOS = 15
+E164_MIN_DIGITOS = 8
+
+_NO_DIGITOS = re.compile(r'\D+')
+
+
+def normalizar_telefono(valor) -> Optional[str]:
+    """
+    Devuelve el teléfono en formato E.164 solo dígitos, o None si no es válido.
+
+    Ej: '+54 9 11 7361-6085' -> '5491173616085', '0054911...' -> '54911...'
+    """
+    if not valor:
+        return None
+    digitos = _NO_DIGITOS.sub('', str(valor))
+    # Prefijo internacional de discado ('00' + código de país)
+    if digitos.startswith('00'):
+        digitos = digitos[2:]
+    if not E164_MIN_DIGITOS <= len(digitos) <= E164_MAX_DIGITOS:
+        return None
+    return digitos
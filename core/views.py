@@ -8,11 +8,32 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from django.utils import timezone
 from django.conf import settings
+from django.db import transaction
 from datetime import datetime, timedelta, date
 from rest_framework import serializers
 from core.permissions import IsMemberOfSelectedNegocio, IsBotOrAdmin, IsBotOrAuthenticatedMember
 from core.roles import is_profesional, is_cliente
 from core.services.memberships import get_profesional_profile
+from core.services.negocios import buscar_negocios
+from core.services.outbox import encolar_email_confirmacion_turno
+from core.services.usuarios import resolver_usuario_por_telefono
+from core.services.disponibilidad import (
+    aproximos_dias_disponibles, proximos_dias_disponibles, reemplazar_horarios, slots_disponibles
+)
+from core.services.idempotencia import idempotente
+from core.services.ical import generar_feed_profesional, obtener_token_ical, version_feed
+from core.services.exportacion import CONTENT_TYPES_EXPORTACION, FORMATOS_EXPORTACION, exportar_turnos, filas_turnos
+from core.services.analiticas import AGRUPACIONES_ANALITICAS, MAX_DIAS_ANALITICAS, obtener_analiticas
+from core.services.ocupacion import MAX_DIAS_MAPA, RESOLUCIONES_MAPA, mapa_ocupacion
+from core.services.eventos_agenda import CLAVE_SCOPE_DESCONEXION, mensajes_sse, obtener_broker
+from core.pagination import NegocioCursorPagination, codificar_cursor_sync, decodificar_cursor_sync
+from django.db.models import Q
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from asgiref.sync import sync_to_async
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 import calendar
 from core.roles import Roles, has_role
 
@@ -365,25 +386,22 @@ def negocios_disponibles(request):
     """
     API para listar negocios donde el usuario NO tiene membership activa.
     
-    GET /api/v1/auth/negocios-disponibles/
+    GET /api/v1/auth/negocios-disponibles/?q=<texto>&cursor=<cursor>&page_size=20&fields=id,nombre,logo_url
     
-    Devuelve una lista de negocios a los que el usuario puede unirse.
+    Devuelve una página de negocios a los que el usuario puede unirse,
+    ordenados por nombre. `count` (total) solo viene en la primera página.
     """
-    # IDs de negocios donde el usuario YA tiene membership
+    # IDs de negocios donde el usuario YA tiene membership (subquery, no se evalúa aparte)
     mis_negocios_ids = Membership.objects.filter(
         user=request.user,
         is_active=True
     ).values_list('negocio_id', flat=True)
     
     # Negocios donde NO tiene membership
-    negocios = Negocio.objects.exclude(id__in=mis_negocios_ids).order_by('nombre')
-    serializer = NegocioSerializer(negocios, many=True, context={'request': request})
-    
-    return Response({
-        'success': True,
-        'count': negocios.count(),
-        'negocios': serializer.data
-    })
+    negocios = Negocio.objects.exclude(id__in=mis_negocios_ids)
+    negocios = buscar_negocios(negocios, request.query_params.get('q'))
+
+    return _respuesta_directorio_negocios(request, negocios)
 
 
 class LogoutView(APIView):
@@ -516,7 +534,7 @@ def profesionales_disponibles(request):
             'message': 'No se pudo determinar el negocio.'
         }, status=status.HTTP_400_BAD_REQUEST)
 
-    profesionales = Profesional.objects.filter(is_available=True, negocio=negocio)
+    profesionales = Profesional.objects.filter(is_available=True, negocio=negocio).select_related('user')
     serializer = ProfesionalSerializer(profesionales, many=True)
 
     return Response({
@@ -532,17 +550,45 @@ def listar_negocios(request):
     """
     API pública para listar todos los negocios disponibles en Ordema.
     
-    GET /api/v1/negocios/
+    GET /api/v1/negocios/?q=<texto>&cursor=<cursor>&page_size=20&fields=id,nombre,logo_url
     
-    Devuelve una lista de todos los negocios para que el usuario pueda 
-    seleccionar uno durante el registro.
+    Devuelve una página de negocios (ordenados por nombre) para que el usuario
+    pueda seleccionar uno durante el registro. `count` (total) solo viene en
+    la primera página.
     """
-    negocios = Negocio.objects.all().order_by('nombre')
-    serializer = NegocioSerializer(negocios, many=True, context={'request': request})
-    
+    negocios = buscar_negocios(Negocio.objects.all(), request.query_params.get('q'))
+
+    return _respuesta_directorio_negocios(request, negocios)
+
+
+def _respuesta_directorio_negocios(request, negocios):
+    """
+    Pagina por cursor (orden por nombre) y serializa un queryset de negocios
+    con el shape común de listar_negocios / negocios_disponibles.
+
+    Soporta ?fields=id,nombre,logo_url para traer y devolver solo esos campos.
+    """
+    try:
+        fields = NegocioSerializer.parsear_fields(request.query_params.get('fields'))
+    except serializers.ValidationError as e:
+        return Response({
+            'success': False,
+            'message': 'Parámetro fields inválido',
+            'errors': e.detail
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    # 'nombre' siempre se trae: el cursor se construye a partir de él
+    negocios = NegocioSerializer.optimizar_queryset(negocios, fields, extra=['nombre'])
+
+    paginator = NegocioCursorPagination()
+    page = paginator.paginate_queryset(negocios, request)
+    serializer = NegocioSerializer(page, many=True, fields=fields, context={'request': request})
+
     return Response({
         'success': True,
-        'count': negocios.count(),
+        'count': paginator.total_count,
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
         'negocios': serializer.data
     })
 
@@ -602,25 +648,16 @@ def check_user(request):
             'message': 'Parámetro phone requerido'
         }, status=status.HTTP_400_BAD_REQUEST)
 
-    # Buscar usuario por teléfono (case insensitive o exacto según necesidad, aquí exacto)
-    try:
-        user = Usuario.objects.get(phone_number=phone)
-    except Usuario.DoesNotExist:
+    # Buscar usuario por teléfono normalizado (acepta '+54 9 11 ...', '54911...', etc.)
+    user = resolver_usuario_por_telefono(phone)
+    if user is None:
         return Response({
             "found": False,
             "message": "Usuario no registrado"
         }, status=status.HTTP_200_OK)
 
     # Obtener membresías del usuario
-    memberships = Membership.objects.filter(user=user, is_active=True).select_related('negocio')
-    
-    businesses_data = []
-    for membership in memberships:
-        businesses_data.append({
-            "id": membership.negocio.id,
-            "name": membership.negocio.nombre,
-            "role": membership.rol.capitalize()
-        })
+    businesses_data = _negocios_del_usuario(user)
 
     response_data = {
         "found": True,
@@ -637,6 +674,133 @@ def check_user(request):
     return Response([response_data], status=status.HTTP_200_OK)
 
 
+def _negocios_del_usuario(user):
+    """Membresías activas del usuario en el formato que consume el bot."""
+    memberships = Membership.objects.filter(user=user, is_active=True).select_related('negocio')
+    return [
+        {
+            "id": membership.negocio.id,
+            "name": membership.negocio.nombre,
+            "role": membership.rol.capitalize()
+        }
+        for membership in memberships
+    ]
+
+
+# =============================================================================
+# API BOOTSTRAP DEL BOT - Contexto inicial de la conversación en una llamada
+# =============================================================================
+
+@api_view(['GET'])
+@permission_classes([IsBotOrAdmin])
+def bot_bootstrap(request):
+    """
+    Devuelve todo lo que el bot necesita al iniciar una conversación, en una sola llamada
+    (reemplaza check-user + servicios-publicos + profesionales-disponibles + proximos-dias).
+
+    GET /api/v1/bot/bootstrap/?phone=5491173616085
+
+    Headers: X-BOT-TOKEN, X-Negocio-ID
+
+    Query Parameters:
+    - phone (str, requerido): teléfono del usuario (cualquier formato)
+    - profesional_id (int, opcional): profesional para los próximos días (default: el primero disponible)
+    - servicio_id (int, opcional): servicio para los próximos días (default: el primero activo)
+    - limite (int, opcional): cantidad de días a retornar (default: 9, máx: 20)
+
+    Response:
+    {
+        "success": true,
+        "negocio": {"id": 1, "nombre": "..."},
+        "found": true,
+        "user": {"id": 3, "username": "...", "first_name": "...", "phone": "..."},
+        "es_cliente": true,                  # tiene membership de cliente en este negocio
+        "businesses": [...],                 # igual que check-user
+        "servicios": [...],                  # igual que servicios-publicos
+        "profesionales": [...],              # igual que profesionales-disponibles
+        "proximos_dias": {
+            "profesional_id": 5, "servicio_id": 2, "fecha_desde": "2026-10-19",
+            "fechas": [...]                  # igual que proximos-dias
+        }
+    }
+    """
+    negocio = getattr(request, 'negocio', None)
+    if not negocio:
+        return Response({
+            'success': False,
+            'message': 'No se pudo determinar el negocio. Asegúrese de enviar X-Negocio-ID.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    phone = request.query_params.get('phone')
+    if not phone:
+        return Response({
+            'success': False,
+            'message': 'Parámetro phone requerido'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        limite = int(request.query_params.get('limite', 9))
+        if limite < 1 or limite > 20:
+            limite = 9
+    except (ValueError, TypeError):
+        limite = 9
+
+    # Usuario y membresías
+    user = resolver_usuario_por_telefono(phone)
+    businesses_data = _negocios_del_usuario(user) if user else []
+    es_cliente = any(
+        b['id'] == negocio.id and b['role'].lower() == Membership.Roles.CLIENTE
+        for b in businesses_data
+    )
+
+    # Catálogo del negocio
+    servicios = list(Servicio.objects.filter(is_active=True, negocio=negocio).order_by('id'))
+    profesionales = list(
+        Profesional.objects.filter(is_available=True, negocio=negocio).select_related('user').order_by('id')
+    )
+
+    # Próximos días para el profesional/servicio elegidos (o los primeros)
+    profesional = _elegir_por_id(profesionales, request.query_params.get('profesional_id'))
+    servicio = _elegir_por_id(servicios, request.query_params.get('servicio_id'))
+    proximos_dias = None
+    if profesional and servicio:
+        fecha_desde = timezone.now().date()
+        proximos_dias = {
+            'profesional_id': profesional.id,
+            'servicio_id': servicio.id,
+            'fecha_desde': fecha_desde.strftime('%Y-%m-%d'),
+            'fechas': proximos_dias_disponibles(profesional, servicio, fecha_desde, limite),
+        }
+
+    return Response({
+        'success': True,
+        'negocio': {'id': negocio.id, 'nombre': negocio.nombre},
+        'found': user is not None,
+        'user': {
+            'id': user.id,
+            'username': user.username,
+            'first_name': f"{user.first_name}".strip(),
+            'phone': user.phone_number
+        } if user else None,
+        'es_cliente': es_cliente,
+        'businesses': businesses_data,
+        'servicios': ServicioSerializer(servicios, many=True).data,
+        'profesionales': ProfesionalSerializer(profesionales, many=True).data,
+        'proximos_dias': proximos_dias,
+    })
+
+
+def _elegir_por_id(objetos, id_param):
+    """Devuelve el objeto con ese id (si se pidió) o el primero de la lista."""
+    if not id_param:
+        return objetos[0] if objetos else None
+    try:
+        id_param = int(id_param)
+    except (ValueError, TypeError):
+        return None
+    return next((obj for obj in objetos if obj.id == id_param), None)
+
+
 # =============================================================================
 # APIs DE RESERVAS
 # =============================================================================
@@ -652,9 +816,13 @@ class CrearTurnoView(APIView):
     2. Bot WhatsApp: Bot crea turno para un usuario específico (X-BOT-TOKEN + cliente_phone)
     
     Valida disponibilidad completa antes de crear el turno.
+    
+    Header opcional: Idempotency-Key (un reintento con la misma clave devuelve
+    la respuesta original sin crear otro turno).
     """
     permission_classes = [IsBotOrAuthenticatedMember]
 
+    @idempotente('crear_turno')
     def post(self, request):
         # Detectar si la request viene del bot verificando el header X-BOT-TOKEN
         bot_token = request.headers.get('X-BOT-TOKEN')
@@ -672,10 +840,9 @@ class CrearTurnoView(APIView):
                     'message': 'El bot debe especificar cliente_phone (sin prefijo +)'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            try:
-                # Buscar usuario por teléfono (sin +, como se maneja en el backend)
-                cliente = Usuario.objects.get(phone_number=cliente_phone)
-            except Usuario.DoesNotExist:
+            # Buscar usuario por teléfono normalizado (índice único phone_e164, cacheado por conversación)
+            cliente = resolver_usuario_por_telefono(cliente_phone)
+            if cliente is None:
                 return Response({
                     'success': False,
                     'message': f'Usuario con teléfono {cliente_phone} no encontrado'
@@ -711,16 +878,13 @@ class CrearTurnoView(APIView):
         )
 
         if serializer.is_valid():
-            # Crea el turno asignando el cliente correcto (usuario real o especificado por el bot)
-            turno = serializer.save(cliente=cliente, negocio=request.negocio)
+            with transaction.atomic():
+                # Crea el turno asignando el cliente correcto (usuario real o especificado por el bot)
+                turno = serializer.save(cliente=cliente, negocio=request.negocio)
 
-            # Enviar email de confirmación con archivo .ics (no bloquea si falla)
-            from core.utils.email_utils import enviar_email_confirmacion_turno
-            try:
-                enviar_email_confirmacion_turno(turno)
-            except Exception as e:
-                # Loguear error pero no afectar la respuesta al cliente
-                print(f"Error al enviar email de confirmación de turno: {str(e)}")
+                # Encolar email de confirmación con .ics en la misma transacción;
+                # lo envía el worker (manage.py run_email_worker) fuera del request
+                encolar_email_confirmacion_turno(turno)
 
             # Devolver información completa del turno creado
             return Response({
@@ -748,6 +912,7 @@ class MisTurnosView(APIView):
     2. Bot WhatsApp: Bot consulta turnos de un usuario específico (X-BOT-TOKEN + cliente_phone)
     
     Devuelve todos los turnos del cliente con información completa.
+    Con ?fields=id,fecha,hora_inicio,servicio_name devuelve (y consulta) solo esos campos.
     """
     permission_classes = [IsBotOrAuthenticatedMember]
     
@@ -768,10 +933,9 @@ class MisTurnosView(APIView):
                     'message': 'El bot debe especificar cliente_phone como query parameter'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            try:
-                # Buscar usuario por teléfono
-                cliente = Usuario.objects.get(phone_number=cliente_phone)
-            except Usuario.DoesNotExist:
+            # Buscar usuario por teléfono normalizado (índice único phone_e164, cacheado por conversación)
+            cliente = resolver_usuario_por_telefono(cliente_phone)
+            if cliente is None:
                 return Response({
                     'success': False,
                     'message': f'Usuario con teléfono {cliente_phone} no encontrado'
@@ -801,18 +965,31 @@ class MisTurnosView(APIView):
                 'message': 'Usuario no tiene negocio asignado'
             }, status=status.HTTP_400_BAD_REQUEST)
         
+        try:
+            fields = MisTurnosSerializer.parsear_fields(request.query_params.get('fields'))
+        except serializers.ValidationError as e:
+            return Response({
+                'success': False,
+                'message': 'Parámetro fields inválido',
+                'errors': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
+
         # Obtener turnos del cliente del mismo negocio ordenados por fecha (más recientes primero)
         turnos = Turno.objects.filter(
             cliente=cliente,
             negocio=request.negocio
         ).order_by('-start_datetime')
+        # status y start_datetime se usan abajo para separar próximos / historial
+        turnos = MisTurnosSerializer.optimizar_queryset(
+            turnos, fields, extra=['status', 'start_datetime']
+        )
         
         # Separar turnos por estado
         turnos_proximos = []
         turnos_historial = []
         
         for turno in turnos:
-            turno_data = MisTurnosSerializer(turno).data
+            turno_data = MisTurnosSerializer(turno, fields=fields).data
             
             # Si está confirmado y es futuro -> próximo
             if turno.status == 'pendiente' and turno.start_datetime > timezone.now():
@@ -840,9 +1017,13 @@ class CancelarTurnoView(APIView):
     2. Bot WhatsApp: Bot cancela turno de un usuario específico (X-BOT-TOKEN + cliente_phone)
     
     Solo permite cancelar turnos propios con más de 2 horas de anticipación.
+    
+    Header opcional: Idempotency-Key (un reintento con la misma clave devuelve
+    la respuesta original).
     """
     permission_classes = [IsBotOrAuthenticatedMember]
     
+    @idempotente('cancelar_turno')
     def post(self, request, turno_id):
         # Detectar si la request viene del bot verificando el header X-BOT-TOKEN
         bot_token = request.headers.get('X-BOT-TOKEN')
@@ -860,10 +1041,9 @@ class CancelarTurnoView(APIView):
                     'message': 'El bot debe especificar cliente_phone en el body'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            try:
-                # Buscar usuario por teléfono
-                cliente = Usuario.objects.get(phone_number=cliente_phone)
-            except Usuario.DoesNotExist:
+            # Buscar usuario por teléfono normalizado (índice único phone_e164, cacheado por conversación)
+            cliente = resolver_usuario_por_telefono(cliente_phone)
+            if cliente is None:
                 return Response({
                     'success': False,
                     'message': f'Usuario con teléfono {cliente_phone} no encontrado'
@@ -967,85 +1147,35 @@ def consultar_disponibilidad(request):
     dia_semana = fecha.weekday()
     
     # Obtener horarios de trabajo del profesional para ese día
-    horarios_trabajo = HorarioDisponibilidad.objects.filter(
+    horarios_trabajo = list(HorarioDisponibilidad.objects.filter(
         profesional=profesional,
         day_of_week=dia_semana,
         negocio_id=negocio.id
-    )
+    ).values_list('start_time', 'end_time'))
     
-    if not horarios_trabajo.exists():
+    if not horarios_trabajo:
         return Response({
             'success': True,
             'horarios_disponibles': [],
             'message': 'El profesional no trabaja este día'
         })
     
-    # Obtener turnos existentes para esa fecha
-    turnos_existentes = Turno.objects.filter(
+    # Turnos activos y bloqueos de esa fecha
+    ocupados = list(Turno.objects.filter(
         profesional=profesional,
         start_datetime__date=fecha,
         status__in=['pendiente', 'confirmado'],
         negocio_id=negocio.id
-    )
-    
-    # Obtener bloqueos para esa fecha
-    bloqueos = BloqueoHorario.objects.filter(
+    ).values_list('start_datetime', 'end_datetime'))
+    ocupados += BloqueoHorario.objects.filter(
         profesional=profesional,
         start_datetime__date=fecha,
         negocio_id=negocio.id
-    )
-    
-    # Generar horarios disponibles
-    horarios_disponibles = []
-    duracion_servicio = servicio.duration_minutes
+    ).values_list('start_datetime', 'end_datetime')
     
-    for horario in horarios_trabajo:
-        # Generar slots de tiempo cada 30 minutos
-        hora_actual = timezone.datetime.combine(fecha, horario.start_time)
-        hora_fin = timezone.datetime.combine(fecha, horario.end_time)
-        
-        while hora_actual + timezone.timedelta(minutes=duracion_servicio) <= hora_fin:
-            # Filtrar horarios pasados si la fecha es hoy
-            ahora = timezone.now()
-            # Asegúrate de que fecha es date, ahora es datetime
-            if isinstance(fecha, str):
-                from datetime import datetime as dt
-                fecha = dt.strptime(fecha, "%Y-%m-%d").date()
-            if fecha == ahora.date():
-                # Si quieres filtrar a partir de 1 hora después de la actual:
-                hora_limite = (ahora + timezone.timedelta(hours=1)).time()
-                # Asegúrate de que hora_actual es datetime
-                if hora_actual.time() < hora_limite:
-                    hora_actual += timezone.timedelta(minutes=30)
-                    continue
-
-            # Verificar si hay conflicto con turnos existentes
-            hay_conflicto = False
-            
-            for turno in turnos_existentes:
-                if (hora_actual < turno.end_datetime and 
-                    hora_actual + timezone.timedelta(minutes=duracion_servicio) > turno.start_datetime):
-                    hay_conflicto = True
-                    break
-            
-            # Verificar si hay conflicto con bloqueos
-            if not hay_conflicto:
-                for bloqueo in bloqueos:
-                    if (hora_actual < bloqueo.end_datetime and 
-                        hora_actual + timezone.timedelta(minutes=duracion_servicio) > bloqueo.start_datetime):
-                        hay_conflicto = True
-                        break
-            
-            # Si no hay conflicto, es un horario disponible
-            if not hay_conflicto:
-                horarios_disponibles.append({
-                    'hora_inicio': hora_actual.time().strftime('%H:%M'),
-                    'hora_fin': (hora_actual + timezone.timedelta(minutes=duracion_servicio)).time().strftime('%H:%M'),
-                    'disponible': True
-                })
-            
-            # Avanzar al siguiente slot (cada 30 minutos)
-            hora_actual += timezone.timedelta(minutes=30)
+    horarios_disponibles = slots_disponibles(
+        fecha, horarios_trabajo, ocupados, servicio.duration_minutes, timezone.now()
+    )
     
     return Response({
         'success': True,
@@ -1072,16 +1202,13 @@ def disponibilidad_profesional(request):
         return Response(serializer.data)
 
     if request.method == 'PUT':
-        # El frontend debe enviar una lista de objetos con day_of_week, start_time, end_time
-        HorarioDisponibilidad.objects.filter(profesional=profesional).delete()
-        data = request.data.copy() if hasattr(request.data, 'copy') else dict(request.data)
-        for item in data:
-            item['profesional'] = profesional.id
-        serializer = HorarioDisponibilidadSerializer(data=data, many=True, context={'profesional': profesional})
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        # El frontend debe enviar una lista de objetos con day_of_week, start_time, end_time.
+        # Se valida todo antes de tocar la base; después solo cambian las franjas distintas.
+        serializer = HorarioDisponibilidadSerializer(data=request.data, many=True, context={'profesional': profesional})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        resultado = reemplazar_horarios(profesional, serializer.validated_data)
+        return Response(HorarioDisponibilidadSerializer(resultado['horarios'], many=True).data)
 
 
 # ============================================================================= 
@@ -1285,9 +1412,13 @@ class CancelarTurnoProfesionalView(APIView):
     POST /api/v1/reservas/cancelar-profesional/{turno_id}/
     
     Permite a los profesionales cancelar turnos de su agenda.
+    
+    Header opcional: Idempotency-Key (un reintento con la misma clave devuelve
+    la respuesta original).
     """
     permission_classes = [permissions.IsAuthenticated]
     
+    @idempotente('cancelar_turno_profesional')
     def post(self, request, turno_id):
         # Solo profesionales pueden cancelar turnos de su agenda
         if not is_profesional(request.user, request.negocio):
@@ -1523,6 +1654,57 @@ class CambiarContrasenaView(APIView):
 # API PARA WHATSAPP FLOW - PRÓXIMOS DÍAS DISPONIBLES
 # =============================================================================
 
+def _parametros_proximos_dias(query_params):
+    """
+    Valida los parámetros de ProximosDiasDisponiblesView (y su versión async).
+
+    Returns:
+        tuple: ((profesional_id, servicio_id, fecha_desde, limite), None) o (None, error)
+    """
+    # Validar parámetros requeridos
+    profesional_id = query_params.get('profesional_id')
+    servicio_id = query_params.get('servicio_id')
+
+    if not profesional_id or not servicio_id:
+        return None, {
+            'success': False,
+            'error': 'Se requieren los parámetros profesional_id y servicio_id'
+        }
+
+    try:
+        profesional_id = int(profesional_id)
+        servicio_id = int(servicio_id)
+    except (ValueError, TypeError):
+        return None, {
+            'success': False,
+            'error': 'profesional_id y servicio_id deben ser números enteros'
+        }
+
+    # Validar fecha de inicio (opcional, default: hoy)
+    fecha_desde_str = query_params.get('fecha_desde')
+    if fecha_desde_str:
+        try:
+            fecha_desde = datetime.strptime(fecha_desde_str, '%Y-%m-%d').date()
+        except ValueError:
+            return None, {
+                'success': False,
+                'error': 'Formato de fecha inválido. Use YYYY-MM-DD'
+            }
+    else:
+        fecha_desde = timezone.now().date()
+
+    # Validar límite (opcional, default: 9, máx: 20)
+    limite = query_params.get('limite', 9)
+    try:
+        limite = int(limite)
+        if limite < 1 or limite > 20:
+            limite = 9
+    except (ValueError, TypeError):
+        limite = 9
+
+    return (profesional_id, servicio_id, fecha_desde, limite), None
+
+
 class ProximosDiasDisponiblesView(APIView):
     """
     API optimizada para WhatsApp Flow (n8n).
@@ -1553,46 +1735,10 @@ class ProximosDiasDisponiblesView(APIView):
     permission_classes = [permissions.AllowAny]
     
     def get(self, request):
-        # Validar parámetros requeridos
-        profesional_id = request.GET.get('profesional_id')
-        servicio_id = request.GET.get('servicio_id')
-        
-        if not profesional_id or not servicio_id:
-            return Response({
-                'success': False,
-                'error': 'Se requieren los parámetros profesional_id y servicio_id'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        try:
-            profesional_id = int(profesional_id)
-            servicio_id = int(servicio_id)
-        except (ValueError, TypeError):
-            return Response({
-                'success': False,
-                'error': 'profesional_id y servicio_id deben ser números enteros'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Validar fecha de inicio (opcional, default: hoy)
-        fecha_desde_str = request.GET.get('fecha_desde')
-        if fecha_desde_str:
-            try:
-                fecha_desde = datetime.strptime(fecha_desde_str, '%Y-%m-%d').date()
-            except ValueError:
-                return Response({
-                    'success': False,
-                    'error': 'Formato de fecha inválido. Use YYYY-MM-DD'
-                }, status=status.HTTP_400_BAD_REQUEST)
-        else:
-            fecha_desde = timezone.now().date()
-        
-        # Validar límite (opcional, default: 9, máx: 20)
-        limite = request.GET.get('limite', 9)
-        try:
-            limite = int(limite)
-            if limite < 1 or limite > 20:
-                limite = 9
-        except (ValueError, TypeError):
-            limite = 9
+        parametros, error = _parametros_proximos_dias(request.GET)
+        if error:
+            return Response(error, status=status.HTTP_400_BAD_REQUEST)
+        profesional_id, servicio_id, fecha_desde, limite = parametros
         
         # Validar que el profesional y servicio existan
         try:
@@ -1609,46 +1755,8 @@ class ProximosDiasDisponiblesView(APIView):
                 'error': 'Servicio no encontrado'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        # Obtener horarios de trabajo del profesional (pre-fetch para optimización)
-        horarios_trabajo = HorarioDisponibilidad.objects.filter(
-            profesional=profesional,
-            negocio=profesional.negocio
-        ).values('day_of_week', 'start_time', 'end_time')
-        
-        # Crear diccionario de horarios por día de la semana
-        horarios_dict = {}
-        for horario in horarios_trabajo:
-            dia = horario['day_of_week']
-            if dia not in horarios_dict:
-                horarios_dict[dia] = []
-            horarios_dict[dia].append({
-                'start_time': horario['start_time'],
-                'end_time': horario['end_time']
-            })
-        
-        # Buscar días disponibles
-        fechas_disponibles = []
-        fecha_actual = fecha_desde
-        max_dias_a_revisar = 60  # Límite de seguridad
-        dias_revisados = 0
-        
-        while len(fechas_disponibles) < limite and dias_revisados < max_dias_a_revisar:
-            # Verificar si hay disponibilidad en este día
-            if self._verificar_disponibilidad_dia(
-                profesional, 
-                servicio, 
-                fecha_actual, 
-                horarios_dict
-            ):
-                fechas_disponibles.append({
-                    'fecha': fecha_actual.strftime('%Y-%m-%d'),
-                    'nombre_dia': fecha_actual.strftime('%A'),
-                    'tiene_disponibilidad': True
-                })
-            
-            # Avanzar al siguiente día
-            fecha_actual += timedelta(days=1)
-            dias_revisados += 1
+        # Una query de horarios + una por ventana de días (no una por día)
+        fechas_disponibles = proximos_dias_disponibles(profesional, servicio, fecha_desde, limite)
         
         return Response({
             'success': True,
@@ -1658,99 +1766,626 @@ class ProximosDiasDisponiblesView(APIView):
             'fecha_desde': fecha_desde.strftime('%Y-%m-%d'),
             'fechas': fechas_disponibles
         }, status=status.HTTP_200_OK)
-    
-    def _verificar_disponibilidad_dia(self, profesional, servicio, fecha, horarios_dict):
-        """
-        Verifica si un día específico tiene al menos un slot disponible.
-        Optimizado para no calcular todos los slots, solo verificar si existe al menos uno.
-        
-        Args:
-            profesional: Instancia de Profesional
-            servicio: Instancia de Servicio
-            fecha: date object
-            horarios_dict: Dict con horarios pre-cargados {day_of_week: [horarios]}
-        
-        Returns:
-            bool: True si hay al menos un slot disponible
-        """
-        # Verificar si es día pasado
-        if fecha < timezone.now().date():
-            return False
-        
-        # Verificar si el profesional trabaja este día
-        dia_semana = fecha.weekday()
-        horarios_del_dia = horarios_dict.get(dia_semana)
-        
-        if not horarios_del_dia:
-            return False
-        
-        # Si es hoy, verificar que no sea muy tarde
-        ahora = timezone.now()
-        if fecha == ahora.date():
-            hora_actual = ahora.time()
-            # Verificar si algún horario tiene slots después de la hora actual + 1 hora
-            hora_limite = (ahora + timedelta(hours=1)).time()
-            tiene_horario_valido = any(
-                horario['end_time'] > hora_limite 
-                for horario in horarios_del_dia
+
+# =============================================================================
+# API DE SINCRONIZACIÓN INCREMENTAL DE TURNOS (APP MÓVIL)
+# =============================================================================
+
+class SincronizarTurnosView(APIView):
+    """
+    Delta-sync de turnos para el cache local de la app.
+
+    GET /api/v1/reservas/sync/?vista=cliente|profesional&cursor=<cursor>&limite=200
+
+    Query Parameters:
+    - vista (str, opcional): 'cliente' (mis turnos, default) o 'profesional' (mi agenda)
+    - cursor (str, opcional): cursor opaco devuelto por la llamada anterior.
+      Sin cursor se devuelve todo el historial (sincronización inicial).
+    - limite (int, opcional): cambios por página (default: 200, máx: 500)
+
+    Response:
+    {
+        "success": true,
+        "turnos": [...],          # creados/modificados (upsert en el cache)
+        "eliminados": [           # tombstones: turnos cancelados (borrar del cache)
+            {"id": 12, "status": "cancelado", "updated_at": "..."}
+        ],
+        "cursor": "MjAyNi0x...",  # enviar en la próxima llamada
+        "has_more": false         # true => volver a llamar enseguida con el nuevo cursor
+    }
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    LIMITE_DEFAULT = 200
+    LIMITE_MAXIMO = 500
+    # Margen para no adelantar el cursor sobre transacciones que aún no
+    # hicieron commit con un updated_at anterior al último entregado.
+    MARGEN_COMMIT = timedelta(seconds=2)
+
+    def get(self, request):
+        negocio = getattr(request, 'negocio', None)
+        if not negocio:
+            return Response({
+                'success': False,
+                'message': 'No se pudo determinar el negocio. Verifique que esté enviando el header X-Negocio-ID'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        vista = request.GET.get('vista', 'cliente')
+        if vista == 'profesional':
+            if not is_profesional(request.user, negocio):
+                return Response({
+                    'success': False,
+                    'message': 'Solo los profesionales pueden sincronizar su agenda'
+                }, status=status.HTTP_403_FORBIDDEN)
+
+            profesional = get_profesional_profile(request.user, negocio)
+            if not profesional:
+                return Response({
+                    'success': False,
+                    'message': 'Usuario profesional no encontrado'
+                }, status=status.HTTP_404_NOT_FOUND)
+
+            turnos = Turno.objects.filter(negocio=negocio, profesional=profesional).select_related('cliente', 'servicio')
+            serializer_class = AgendaProfesionalSerializer
+        elif vista == 'cliente':
+            if not is_cliente(request.user, negocio):
+                return Response({
+                    'success': False,
+                    'message': 'Solo los clientes pueden sincronizar sus turnos'
+                }, status=status.HTTP_403_FORBIDDEN)
+
+            turnos = MisTurnosSerializer.optimizar_queryset(
+                Turno.objects.filter(negocio=negocio, cliente=request.user)
             )
-            if not tiene_horario_valido:
-                return False
-        
-        # Obtener turnos existentes para esta fecha (optimizado: una sola query)
-        turnos_existentes = Turno.objects.filter(
-            profesional=profesional,
-            start_datetime__date=fecha,
-            status__in=['confirmado', 'pendiente'],
-            negocio=profesional.negocio
-        ).values('start_datetime', 'end_datetime')
-        
-        # Convertir a lista para iterar múltiples veces
-        lista_turnos = list(turnos_existentes)
-        
-        duracion_servicio = servicio.duration_minutes
-        
-        # Verificar cada bloque de horario del día
-        for horario in horarios_del_dia:
-            hora_inicio = datetime.combine(fecha, horario['start_time'])
-            hora_fin = datetime.combine(fecha, horario['end_time'])
-            
-            # Generar slots cada 30 minutos
-            slot_actual = hora_inicio
-            
-            while slot_actual + timedelta(minutes=duracion_servicio) <= hora_fin:
-                slot_fin = slot_actual + timedelta(minutes=duracion_servicio)
-                
-                # Si es hoy, verificar que no sea hora pasada
-                if fecha == ahora.date():
-                    hora_limite = (ahora + timedelta(hours=1)).time()
-                    if slot_actual.time() < hora_limite:
-                        slot_actual += timedelta(minutes=30)
-                        continue
-                
-                # Verificar si este slot está ocupado
-                hay_conflicto = False
-                for turno in lista_turnos:
-                    turno_inicio = turno['start_datetime']
-                    turno_fin = turno['end_datetime']
-                    
-                    # Hacer timezone-aware si es necesario
-                    if timezone.is_aware(turno_inicio):
-                        slot_actual_aware = timezone.make_aware(slot_actual)
-                        slot_fin_aware = timezone.make_aware(slot_fin)
-                    else:
-                        slot_actual_aware = slot_actual
-                        slot_fin_aware = slot_fin
-                    
-                    # Verificar solapamiento
-                    if slot_actual_aware < turno_fin and slot_fin_aware > turno_inicio:
-                        hay_conflicto = True
-                        break
-                
-                # Si encontramos UN slot libre, el día tiene disponibilidad
-                if not hay_conflicto:
-                    return True
-                
-                slot_actual += timedelta(minutes=30)
-        
-        return False
\ No newline at end of file
+            serializer_class = MisTurnosSerializer
+        else:
+            return Response({
+                'success': False,
+                'message': "Parámetro vista inválido. Use 'cliente' o 'profesional'"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        cursor = request.GET.get('cursor')
+        if cursor:
+            try:
+                desde_updated_at, desde_id = decodificar_cursor_sync(cursor)
+            except ValueError:
+                return Response({
+                    'success': False,
+                    'message': 'Cursor inválido. Reinicie la sincronización sin cursor'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            turnos = turnos.filter(
+                Q(updated_at__gt=desde_updated_at) |
+                Q(updated_at=desde_updated_at, id__gt=desde_id)
+            )
+
+        try:
+            limite = int(request.GET.get('limite', self.LIMITE_DEFAULT))
+            if limite < 1 or limite > self.LIMITE_MAXIMO:
+                limite = self.LIMITE_DEFAULT
+        except (ValueError, TypeError):
+            limite = self.LIMITE_DEFAULT
+
+        # Una fila de más para saber si quedan cambios pendientes
+        lote = list(
+            turnos.filter(updated_at__lte=timezone.now() - self.MARGEN_COMMIT)
+            .order_by('updated_at', 'id')[:limite + 1]
+        )
+        has_more = len(lote) > limite
+        lote = lote[:limite]
+
+        cambios = []
+        eliminados = []
+        for turno in lote:
+            if turno.status == 'cancelado':
+                eliminados.append({
+                    'id': turno.id,
+                    'status': turno.status,
+                    'updated_at': turno.updated_at,
+                })
+            else:
+                cambios.append(serializer_class(turno).data)
+
+        if lote:
+            cursor = codificar_cursor_sync(lote[-1].updated_at, lote[-1].id)
+
+        return Response({
+            'success': True,
+            'vista': vista,
+            'turnos': cambios,
+            'eliminados': eliminados,
+            'cursor': cursor,
+            'has_more': has_more,
+        })
+
+
+# =============================================================================
+# FEED ICALENDAR DEL PROFESIONAL (SUSCRIPCIÓN DESDE GOOGLE / APPLE CALENDAR)
+# =============================================================================
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def enlace_ical_profesional(request):
+    """
+    Devuelve el enlace de suscripción al calendario del profesional.
+
+    GET  /api/v1/profesional/ical/  -> enlace actual (lo crea si no existe)
+    POST /api/v1/profesional/ical/  -> rota el token (el enlace anterior deja de funcionar)
+
+    Response:
+    {
+        "success": true,
+        "url": "https://.../ical/<token>.ics"
+    }
+    """
+    negocio = getattr(request, 'negocio', None)
+    if not negocio or not is_profesional(request.user, negocio):
+        return Response({
+            'success': False,
+            'message': 'Solo los profesionales pueden suscribirse a su agenda'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    profesional = get_profesional_profile(request.user, negocio)
+    if not profesional:
+        return Response({
+            'success': False,
+            'message': 'Usuario profesional no encontrado'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    token = obtener_token_ical(profesional, rotar=request.method == 'POST')
+    return Response({
+        'success': True,
+        'url': request.build_absolute_uri(reverse('ical_profesional', args=[token])),
+    })
+
+
+def feed_ical_profesional(request, token):
+    """
+    Feed .ics público (protegido por token) con la agenda del profesional.
+
+    GET /ical/<token>.ics
+
+    Responde 304 si el If-None-Match / If-Modified-Since del cliente de
+    calendario coincide con la versión actual, sin armar el feed.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+
+    profesional = Profesional.objects.select_related('user', 'negocio').filter(ical_token=token).first()
+    if not profesional:
+        raise Http404('Calendario no encontrado')
+
+    etag, ultimo_cambio = version_feed(profesional)
+    etag = quote_etag(etag)
+    last_modified = int(ultimo_cambio.timestamp()) if ultimo_cambio else None
+
+    no_modificado = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if no_modificado is None:
+        response = HttpResponse(generar_feed_profesional(profesional), content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = 'inline; filename="agenda.ics"'
+    else:
+        response = no_modificado
+
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = 'private, max-age=300'
+    return response
+
+
+# =============================================================================
+# EXPORTACIÓN DEL HISTORIAL DE TURNOS (CONTABILIDAD)
+# =============================================================================
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def exportar_turnos_negocio(request):
+    """
+    Descarga el historial de turnos del negocio para el dueño.
+
+    GET /api/v1/negocio/exportar-turnos/?formato=csv&desde=2025-01-01&hasta=2025-12-31
+
+    Query Parameters:
+    - formato (str, opcional): 'csv' (default) o 'jsonl'
+    - desde / hasta (str, opcional): rango de fechas de inicio, YYYY-MM-DD, inclusive
+
+    La respuesta se transmite a medida que se leen los turnos (no tiene
+    Content-Length), así que sirve para historiales de cualquier tamaño.
+    """
+    negocio = getattr(request, 'negocio', None)
+    if not negocio:
+        return Response({
+            'success': False,
+            'message': 'No se pudo determinar el negocio. Asegúrese de enviar el X-Negocio-ID en los header'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if not (request.user.is_superuser or negocio.propietario_id == request.user.id):
+        return Response({
+            'success': False,
+            'message': 'Solo el dueño del negocio puede exportar los turnos'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    formato = request.GET.get('formato', 'csv')
+    if formato not in FORMATOS_EXPORTACION:
+        return Response({
+            'success': False,
+            'message': f"Formato inválido. Use: {', '.join(FORMATOS_EXPORTACION)}"
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        desde = datetime.strptime(request.GET['desde'], '%Y-%m-%d').date() if request.GET.get('desde') else None
+        hasta = datetime.strptime(request.GET['hasta'], '%Y-%m-%d').date() if request.GET.get('hasta') else None
+    except ValueError:
+        return Response({
+            'success': False,
+            'message': 'Formato de fecha inválido. Use YYYY-MM-DD'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    response = StreamingHttpResponse(
+        exportar_turnos(filas_turnos(negocio, desde, hasta), formato),
+        content_type=CONTENT_TYPES_EXPORTACION[formato],
+    )
+    nombre = f"turnos_negocio_{negocio.id}_{timezone.now():%Y%m%d}.{formato}"
+    response['Content-Disposition'] = f'attachment; filename="{nombre}"'
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+# =============================================================================
+# ANALÍTICAS DEL NEGOCIO (INGRESOS, OCUPACIÓN, CANCELACIONES)
+# =============================================================================
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def analiticas_negocio(request):
+    """
+    Ingresos, ocupación y tasa de cancelación del negocio para el dueño.
+
+    GET /api/v1/negocio/analiticas/?desde=2025-01-01&hasta=2025-06-30&agrupar=profesional
+
+    Query Parameters:
+    - desde / hasta (str, requeridos): rango de días, YYYY-MM-DD, inclusive (máx. 731 días)
+    - agrupar (str, opcional): 'profesional' (default), 'servicio' o 'semana'
+
+    Se responde desde el rollup diario (TurnoRollupDiario), no recorriendo los
+    turnos. Los ingresos son de turnos completados, al precio actual del servicio.
+    """
+    negocio = getattr(request, 'negocio', None)
+    if not negocio:
+        return Response({
+            'success': False,
+            'message': 'No se pudo determinar el negocio. Asegúrese de enviar el X-Negocio-ID en los header'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if not (request.user.is_superuser or negocio.propietario_id == request.user.id):
+        return Response({
+            'success': False,
+            'message': 'Solo el dueño del negocio puede ver las analíticas'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    agrupar = request.GET.get('agrupar', 'profesional')
+    if agrupar not in AGRUPACIONES_ANALITICAS:
+        return Response({
+            'success': False,
+            'message': f"Agrupación inválida. Use: {', '.join(AGRUPACIONES_ANALITICAS)}"
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        desde = datetime.strptime(request.GET['desde'], '%Y-%m-%d').date()
+        hasta = datetime.strptime(request.GET['hasta'], '%Y-%m-%d').date()
+    except (KeyError, ValueError):
+        return Response({
+            'success': False,
+            'message': 'Los parámetros desde y hasta son requeridos (YYYY-MM-DD)'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if hasta < desde or (hasta - desde).days >= MAX_DIAS_ANALITICAS:
+        return Response({
+            'success': False,
+            'message': f'El rango debe ser de 1 a {MAX_DIAS_ANALITICAS} días'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'success': True,
+        'desde': desde.isoformat(),
+        'hasta': hasta.isoformat(),
+        'agrupar': agrupar,
+        **obtener_analiticas(negocio, desde, hasta, agrupar),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def mapa_ocupacion_negocio(request):
+    """
+    Mapa de calor de ocupación (día de la semana × franja horaria) para el dueño.
+
+    GET /api/v1/negocio/ocupacion/?desde=2025-01-01&hasta=2025-12-31&profesional_id=3&resolucion=30
+
+    Query Parameters:
+    - desde / hasta (str, requeridos): rango de días, YYYY-MM-DD, inclusive (máx. 731 días)
+    - profesional_id (int, opcional): limitar a un profesional del negocio
+    - resolucion (int, opcional): minutos por franja, 15, 30 (default) o 60
+
+    `ocupacion` = minutos ocupados / minutos de agenda de cada celda (null si no
+    hay agenda). Cuentan los turnos pendientes, confirmados y completados.
+    """
+    negocio = getattr(request, 'negocio', None)
+    if not negocio:
+        return Response({
+            'success': False,
+            'message': 'No se pudo determinar el negocio. Asegúrese de enviar el X-Negocio-ID en los header'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if not (request.user.is_superuser or negocio.propietario_id == request.user.id):
+        return Response({
+            'success': False,
+            'message': 'Solo el dueño del negocio puede ver la ocupación'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    try:
+        desde = datetime.strptime(request.GET['desde'], '%Y-%m-%d').date()
+        hasta = datetime.strptime(request.GET['hasta'], '%Y-%m-%d').date()
+    except (KeyError, ValueError):
+        return Response({
+            'success': False,
+            'message': 'Los parámetros desde y hasta son requeridos (YYYY-MM-DD)'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if hasta < desde or (hasta - desde).days >= MAX_DIAS_MAPA:
+        return Response({
+            'success': False,
+            'message': f'El rango debe ser de 1 a {MAX_DIAS_MAPA} días'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        resolucion = int(request.GET.get('resolucion', 30))
+    except ValueError:
+        resolucion = None
+    if resolucion not in RESOLUCIONES_MAPA:
+        return Response({
+            'success': False,
+            'message': f"Resolución inválida. Use: {', '.join(str(r) for r in RESOLUCIONES_MAPA)}"
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    profesional = None
+    if request.GET.get('profesional_id'):
+        try:
+            profesional = Profesional.objects.get(id=int(request.GET['profesional_id']), negocio=negocio)
+        except (ValueError, Profesional.DoesNotExist):
+            return Response({
+                'success': False,
+                'message': 'Profesional no encontrado en este negocio'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+    return Response({
+        'success': True,
+        'desde': desde.isoformat(),
+        'hasta': hasta.isoformat(),
+        'profesional_id': profesional.id if profesional else None,
+        **mapa_ocupacion(negocio, desde, hasta, profesional=profesional, resolucion=resolucion),
+    })
+
+
+# =============================================================================
+# EVENTOS DE AGENDA EN TIEMPO REAL (SSE, REQUIERE SERVIDOR ASGI)
+# =============================================================================
+
+def _profesional_de_request(request):
+    if not request.user.is_authenticated:
+        return None, status.HTTP_401_UNAUTHORIZED
+    if not is_profesional(request.user, request.negocio):
+        return None, status.HTTP_403_FORBIDDEN
+    profesional = get_profesional_profile(request.user, request.negocio)
+    return profesional, (status.HTTP_200_OK if profesional else status.HTTP_404_NOT_FOUND)
+
+
+async def eventos_agenda_profesional(request):
+    """
+    Stream Server-Sent Events con los cambios de la agenda del profesional.
+
+    GET /api/v1/reservas/agenda-profesional/eventos/
+    Headers: Authorization: Bearer <jwt>, X-Negocio-ID
+
+    Eventos: turno_creado, turno_cancelado, turno_completado, turno_reasignado
+    (data: JSON con turno_id, profesional_id, status, start_datetime, end_datetime)
+    y resincronizar (se perdieron eventos: volver a pedir la agenda). La conexión
+    se cierra a los AGENDA_EVENTOS_DURACION_MAXIMA segundos, cuando el cliente
+    corta o cuando el profesional abre más de MAX_CONEXIONES_POR_PROFESIONAL
+    (se cierra la más vieja); el cliente reconecta y lo ocurrido mientras estuvo
+    desconectado se trae con /reservas/sync/.
+
+    Solo funciona servido por ASGI (uvicorn / daphne): con WSGI el stream no se
+    puede mantener abierto y se responde 501.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({
+            'success': False,
+            'message': 'Los eventos en tiempo real requieren el servidor ASGI'
+        }, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+    profesional, codigo = await sync_to_async(_profesional_de_request)(request)
+    if profesional is None:
+        mensajes = {
+            status.HTTP_401_UNAUTHORIZED: 'Autenticación requerida',
+            status.HTTP_403_FORBIDDEN: 'Solo los profesionales pueden suscribirse a su agenda',
+            status.HTTP_404_NOT_FOUND: 'Usuario profesional no encontrado',
+        }
+        return JsonResponse({'success': False, 'message': mensajes[codigo]}, status=codigo)
+
+    suscripcion = await obtener_broker().suscribir(profesional.id)
+    # Sin DetectorDesconexionASGI (ver asgi.py) el stream solo termina por duración o reemplazo
+    desconexion = request.scope.get(CLAVE_SCOPE_DESCONEXION)
+    response = StreamingHttpResponse(
+        mensajes_sse(
+            suscripcion, settings.AGENDA_EVENTOS_DURACION_MAXIMA,
+            desconexion=desconexion() if desconexion else None,
+        ),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # nginx: no bufferizar el stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# =============================================================================
+# APIs PÚBLICAS ASYNC (SERVIDOR ASGI)
+# =============================================================================
+# Mismas respuestas que servicios_publicos, profesionales_disponibles,
+# consultar_disponibilidad y ProximosDiasDisponiblesView, con el ORM async.
+# core/urls.py las usa en las mismas URLs cuando VISTAS_PUBLICAS_ASYNC=True
+# (solo tiene sentido servido por uvicorn / daphne). Las consultas del bot
+# esperan la base sin ocupar un worker por conversación.
+
+def _respuesta_publica(data, status_code=status.HTTP_200_OK):
+    return JsonResponse(data, status=status_code, json_dumps_params={'ensure_ascii': False})
+
+
+async def servicios_publicos_async(request):
+    """Versión async de servicios_publicos (GET /api/v1/servicios-publicos/)."""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    negocio = getattr(request, 'negocio', None)
+    if not negocio:
+        return _respuesta_publica({
+            'success': False,
+            'message': 'No se pudo determinar el negocio. Asegúrese de enviar X-Negocio-ID.'
+        }, status.HTTP_400_BAD_REQUEST)
+
+    servicios = [s async for s in Servicio.objects.filter(is_active=True, negocio=negocio)]
+    return _respuesta_publica({
+        'success': True,
+        'servicios': ServicioSerializer(servicios, many=True).data
+    })
+
+
+async def profesionales_disponibles_async(request):
+    """Versión async de profesionales_disponibles (GET /api/v1/profesionales-disponibles/)."""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    negocio = getattr(request, 'negocio', None)
+    if not negocio:
+        return _respuesta_publica({
+            'success': False,
+            'message': 'No se pudo determinar el negocio.'
+        }, status.HTTP_400_BAD_REQUEST)
+
+    # select_related: el serializer no puede ir a buscar el usuario con el ORM sync
+    profesionales = [
+        p async for p in Profesional.objects.filter(is_available=True, negocio=negocio).select_related('user')
+    ]
+    return _respuesta_publica({
+        'success': True,
+        'profesionales': ProfesionalSerializer(profesionales, many=True).data
+    })
+
+
+async def consultar_disponibilidad_async(request):
+    """Versión async de consultar_disponibilidad (GET /api/v1/reservas/disponibilidad/)."""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    serializer = DisponibilidadConsultaSerializer(data=request.GET)
+    if not serializer.is_valid():
+        return _respuesta_publica({
+            'success': False,
+            'message': 'Parámetros inválidos',
+            'errors': serializer.errors
+        }, status.HTTP_400_BAD_REQUEST)
+
+    fecha = serializer.validated_data['fecha']
+    negocio = getattr(request, 'negocio', None)
+    if not negocio:
+        return _respuesta_publica({
+            'success': False,
+            'message': 'No se pudo determinar el negocio'
+        }, status.HTTP_400_BAD_REQUEST)
+
+    try:
+        profesional = await Profesional.objects.select_related('user').aget(
+            pk=serializer.validated_data['profesional_id'], negocio_id=negocio.id
+        )
+        servicio = await Servicio.objects.aget(id=serializer.validated_data['servicio_id'], negocio_id=negocio.id)
+    except (Profesional.DoesNotExist, Servicio.DoesNotExist):
+        return _respuesta_publica({
+            'success': False,
+            'message': 'Profesional o servicio no encontrado en este negocio'
+        }, status.HTTP_404_NOT_FOUND)
+
+    horarios_trabajo = [h async for h in HorarioDisponibilidad.objects.filter(
+        profesional=profesional,
+        day_of_week=fecha.weekday(),
+        negocio_id=negocio.id
+    ).values_list('start_time', 'end_time')]
+
+    if not horarios_trabajo:
+        return _respuesta_publica({
+            'success': True,
+            'horarios_disponibles': [],
+            'message': 'El profesional no trabaja este día'
+        })
+
+    ocupados = [t async for t in Turno.objects.filter(
+        profesional=profesional,
+        start_datetime__date=fecha,
+        status__in=['pendiente', 'confirmado'],
+        negocio_id=negocio.id
+    ).values_list('start_datetime', 'end_datetime')]
+    ocupados += [b async for b in BloqueoHorario.objects.filter(
+        profesional=profesional,
+        start_datetime__date=fecha,
+        negocio_id=negocio.id
+    ).values_list('start_datetime', 'end_datetime')]
+
+    horarios_disponibles = slots_disponibles(
+        fecha, horarios_trabajo, ocupados, servicio.duration_minutes, timezone.now()
+    )
+    return _respuesta_publica({
+        'success': True,
+        'fecha': fecha.strftime('%Y-%m-%d'),
+        'profesional': ProfesionalSerializer(profesional).data,
+        'servicio': ServicioSerializer(servicio).data,
+        'horarios_disponibles': horarios_disponibles,
+        'total_disponibles': len(horarios_disponibles)
+    })
+
+
+async def proximos_dias_disponibles_async(request):
+    """Versión async de ProximosDiasDisponiblesView (GET /api/v1/reservas/disponibilidad/proximos-dias/)."""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    parametros, error = _parametros_proximos_dias(request.GET)
+    if error:
+        return _respuesta_publica(error, status.HTTP_400_BAD_REQUEST)
+    profesional_id, servicio_id, fecha_desde, limite = parametros
+
+    try:
+        profesional = await Profesional.objects.aget(id=profesional_id)
+    except Profesional.DoesNotExist:
+        return _respuesta_publica({
+            'success': False,
+            'error': 'Profesional no encontrado'
+        }, status.HTTP_404_NOT_FOUND)
+    try:
+        servicio = await Servicio.objects.aget(id=servicio_id)
+    except Servicio.DoesNotExist:
+        return _respuesta_publica({
+            'success': False,
+            'error': 'Servicio no encontrado'
+        }, status.HTTP_404_NOT_FOUND)
+
+    fechas_disponibles = await aproximos_dias_disponibles(profesional, servicio, fecha_desde, limite)
+    return _respuesta_publica({
+        'success': True,
+        'cantidad': len(fechas_disponibles),
+        'profesional_id': profesional_id,
+        'servicio_id': servicio_id,
+        'fecha_desde': fecha_desde.strftime('%Y-%m-%d'),
+        'fechas': fechas_disponibles
+    })